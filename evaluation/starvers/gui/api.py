@@ -1316,6 +1316,9 @@ def _detail_visualize(run_dir: Path) -> dict:
         update_rows = []
         with open(update_csv, newline="") as f:
             for row in csv.DictReader(f, delimiter=";"):
+                # Only the sequential chunk submission is plotted
+                if (row.get("max_concurrency") or "1").strip() not in ["1", "1.0"]:
+                    continue
                 try:
                     exec_time = float(row.get("execution_time", -1) or -1)
                 except (ValueError, TypeError):
@@ -1,14 +1,13 @@
 from pathlib import Path
 import os
 import sys
-import time
 from datetime import datetime, timezone, timedelta
 import shutil
 import logging
 import re
 import tomli
 
-from starvers.starvers import timestamp_query, split_prefixes_query
+from starvers.starvers import timestamp_query_many, split_prefixes_query
 from scripts.logging import setup_logging
 
 # ---------------------------------------------------------------------------
@@ -35,6 +34,8 @@ query_rewriting_measurements_path=f"{os.environ['RUN_DIR']}/output/measurements/
 
 policies = os.environ.get("policies").split(" ")
 datasets = os.environ.get("datasets").split(" ")
+# Number of processes that rewrite the queries of the timestamp-based policies
+rewriting_workers = int(os.environ.get("rewriting_workers", os.cpu_count() or 1))
 
 LOCAL_TIMEZONE = datetime.now(timezone.utc).astimezone().tzinfo
 
@@ -122,6 +123,9 @@ def main():
 
                 LOG.info(f"Generating queries for {query_set_versions} dataset versions of {dataset}, query set {query_set_name}, and policy {policy}")
 
+                # Queries of the timestamp-based policies are rewritten as one batch after all versions were generated:
+                # (output file path, query set version, output query file name, query, version timestamp)
+                queries_to_timestamp = []
 
                 for query_set_version in range(query_set_versions):
                     LOG.info(f"Generating queries for dataset: {dataset}, query set {query_set_name}, policy {policy}, and query set version {query_set_version}")
@@ -176,35 +180,31 @@ def main():
                                                                        modifiers)
                                 
                                 
-                                # Write query string to file. For tb_sr_rs transform it to a timestamp-based rdfstar query first
+                                # Write query string to file. For tb_sr_rs and tb_sr_re transform it to a timestamp-based rdfstar query first
                                 output_query_file_name = raw_query_name.split('.')[0] + "_q" + str(queryCounter) + "_v" + str(query_set_version) + ".txt"
-                                with open(output_queries_dir_path / output_query_file_name, 'w') as output_file:
-                                    if policy in ["tb_sr_rs"]:
-                                        start = time.time()
-                                        timestamped_output_query = timestamp_query(output_query, vers_ts)
-                                        end = time.time()
-                                        rewriting_time = end - start
-                                        
-                                        with open(query_rewriting_measurements_path, 'a') as measure_file:
-                                            measure_file.write("{0},{1},{2},{3},{4},{5}\n".format(policy, dataset, 
-                                                query_set_name, str(query_set_version), output_query_file_name, rewriting_time))
-                                        output_file.write(timestamped_output_query[0])
-                                    elif policy in ["tb_sr_re"]:
-                                        start = time.time()
-                                        timestamped_output_query = timestamp_query(output_query, vers_ts, mode="reification")
-                                        end = time.time()
-                                        rewriting_time = end - start
-                                        
-                                        with open(query_rewriting_measurements_path, 'a') as measure_file:
-                                            measure_file.write("{0},{1},{2},{3},{4},{5}\n".format(policy, dataset, 
-                                                query_set_name, str(query_set_version), output_query_file_name, rewriting_time))
-                                        output_file.write(timestamped_output_query[0])
-                                    else:
+                                if policy in ["tb_sr_rs", "tb_sr_re"]:
+                                    queries_to_timestamp.append((output_queries_dir_path / output_query_file_name, str(query_set_version),
+                                                                 output_query_file_name, output_query, vers_ts))
+                                else:
+                                    with open(output_queries_dir_path / output_query_file_name, 'w') as output_file:
                                         output_file.write(output_query) 
                     # Only for tb_sr_rs policy
                     vers_ts = vers_ts + timedelta(seconds=1)
                 vers_ts = init_version_timestamp      
 
+                if queries_to_timestamp:
+                    LOG.info(f"Rewriting {len(queries_to_timestamp)} queries into timestamp-based rdfstar queries with {rewriting_workers} processes")
+                    mode = "reification" if policy == "tb_sr_re" else "decorator"
+                    timestamped_queries = timestamp_query_many([query for _, _, _, query, _ in queries_to_timestamp],
+                                                               [ts for _, _, _, _, ts in queries_to_timestamp],
+                                                               mode=mode, workers=rewriting_workers)
+                    with open(query_rewriting_measurements_path, 'a') as measure_file:
+                        for (output_path, version, output_query_file_name, _, _), timestamped_query in zip(queries_to_timestamp, timestamped_queries):
+                            with open(output_path, 'w') as output_file:
+                                output_file.write(timestamped_query.query)
+                            measure_file.write("{0},{1},{2},{3},{4},{5}\n".format(policy, dataset, 
+                                query_set_name, version, output_query_file_name, timestamped_query.rewriting_time))
+
     LOG.info("Finished generating queries.")
 
     # Count generated queries
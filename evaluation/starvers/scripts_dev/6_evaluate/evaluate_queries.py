@@ -2,6 +2,7 @@ import os
 import sys
 import time
 import csv
+import json
 import socket
 import logging
 import subprocess
@@ -17,6 +18,7 @@ import psutil
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 import socket
 
+from starvers.instrumentation import PercentileCollector, phase
 from scripts.logging import setup_logging
 
 # ---------------------------------------------------------------------------
@@ -41,6 +43,7 @@ CONFIG_DIR: str = f"{os.environ['RUN_DIR']}/configs/ingest"
 RESULT_DIR = f"{os.environ['RUN_DIR']}/output/result_sets"
 TIME_FILE = f"{os.environ['RUN_DIR']}/output/measurements/queries_time.csv"
 MEM_FILE = f"{os.environ['RUN_DIR']}/output/measurements/memory_consumption.csv"
+PHASE_FILE = f"{os.environ['RUN_DIR']}/output/measurements/queries_phases.csv"
 databases_dir = f"{os.environ['RUN_DIR']}/databases"
 
 triple_stores = os.environ.get("triple_stores").split(" ")
@@ -149,7 +152,7 @@ def print_mem_file_tail(mem_file, lines=20):
         LOG.info(f"--------------- Memory tail end --------------- ")
 
 
-def run_queries(triple_store, policy, dataset) -> list:
+def run_queries(triple_store, policy, dataset) -> tuple[list, list]:
     LOCAL_TIMEZONE = datetime.now(timezone.utc).astimezone().tzinfo
     init_ts = datetime(2022, 10, 1, 12, 0, 0, tzinfo=LOCAL_TIMEZONE)
 
@@ -163,10 +166,13 @@ def run_queries(triple_store, policy, dataset) -> list:
     versions = dataset_cfg['query_sets'][first_qs]['policies'][policy]['versions']
 
     all_rows = []
+    all_phase_rows = []
 
     for query_set in query_sets:
         LOG.info(f"Evaluating {triple_store} {policy} {dataset} for query set: {query_set}")
         rows = []
+        # Time per phase of each query: waiting for the response headers, downloading and decoding the response
+        collector = PercentileCollector()
 
         # Startup database
         mgmt_script = static_eval_params["rdf_stores"][triple_store]["mgmt_script"]
@@ -231,9 +237,15 @@ def run_queries(triple_store, policy, dataset) -> list:
                 executor = ThreadPoolExecutor(max_workers=1)
 
                 result = {}
-                def run(eng=engine):
+                def run(eng=engine, query=query):
                     result['start'] = time.time()
-                    result['response'] = eng.query().convert()
+                    with phase(collector, "http_wait", request_bytes=len(query.encode("utf-8"))):
+                        raw_result = eng.query()
+                    with phase(collector, "download") as event:
+                        content = raw_result.response.read()
+                        event["response_bytes"] = len(content)
+                    with phase(collector, "decode"):
+                        result['response'] = json.loads(content.decode("utf-8"))
                     result['end'] = time.time()
 
                 try:
@@ -302,6 +314,8 @@ def run_queries(triple_store, policy, dataset) -> list:
 
         LOG.info(f"Add all measurements for {triple_store}, {policy}, {dataset}, {query_set} to a list.")
         all_rows.extend(rows)
+        for phase_row in collector.summary().itertuples(index=False):
+            all_phase_rows.append([triple_store, dataset, policy, query_set.split('/')[2], *phase_row])
 
         LOG.info("Shutdown")
         subprocess.run([mgmt_script, "shutdown"], check=True)
@@ -309,20 +323,20 @@ def run_queries(triple_store, policy, dataset) -> list:
         LOG.info("Stopping memory tracker")
         tracker.join(timeout=1)
 
-    return all_rows
+    return all_rows, all_phase_rows
 
 
-def load_or_init_time_df(header):
-    if os.path.exists(TIME_FILE) and os.path.getsize(TIME_FILE) > 0:
-        LOG.info(f"Loading existing measurement file {TIME_FILE}")
-        df = pd.read_csv(TIME_FILE, sep=";")
+def load_or_init_time_df(header, time_file=TIME_FILE):
+    if os.path.exists(time_file) and os.path.getsize(time_file) > 0:
+        LOG.info(f"Loading existing measurement file {time_file}")
+        df = pd.read_csv(time_file, sep=";")
         # Ensure all expected columns exist (e.g. if header changed between runs)
         for col in header:
             if col not in df.columns:
                 df[col] = None
         df = df[header]
     else:
-        LOG.info(f"No existing measurement file found, creating new one at {TIME_FILE}")
+        LOG.info(f"No existing measurement file found, creating new one at {time_file}")
         df = pd.DataFrame(columns=header)
     return df
 
@@ -366,8 +380,14 @@ def main():
         'execution_time', 'snapshot_creation_time', 'yn_timeout'
     ]
 
+    phase_header = [
+        'triplestore', 'dataset', 'policy', 'query_set', 'phase', 'count', 'total', 'mean',
+        'p50', 'p90', 'p95', 'p99', 'request_bytes', 'response_bytes', 'rows'
+    ]
+
     # Load existing measurements (if any) instead of overwriting
     time_df = load_or_init_time_df(header)
+    phase_df = load_or_init_time_df(phase_header, PHASE_FILE)
 
     combinations = product(triple_stores, policies, datasets)
 
@@ -380,12 +400,14 @@ def main():
             LOG.info(f"The combination {triple_store}, {dataset}, and {policy} is not supported and will be skipped")
             continue
 
-        new_rows = run_queries(triple_store, policy, dataset)
+        new_rows, new_phase_rows = run_queries(triple_store, policy, dataset)
         time_df = upsert_rows(time_df, new_rows, header)
+        phase_df = upsert_rows(phase_df, new_phase_rows, phase_header)
 
         # Write back after each combination so progress isn't lost on crash
-        LOG.info(f"Writing results to {TIME_FILE}")
+        LOG.info(f"Writing results to {TIME_FILE} and {PHASE_FILE}")
         time_df.to_csv(TIME_FILE, sep=";", index=False, mode='w', header=True)
+        phase_df.to_csv(PHASE_FILE, sep=";", index=False, mode='w', header=True)
 
 
 if __name__ == "__main__":
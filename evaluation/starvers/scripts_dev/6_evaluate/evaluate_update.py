@@ -5,6 +5,7 @@ import shlex
 import logging
 import subprocess
 from pathlib import Path
+from typing import Union
 from datetime import datetime, timedelta, timezone
 import tomli
 import pandas as pd
@@ -12,6 +13,7 @@ from urllib.error import HTTPError
 import psutil
 
 from starvers.starvers import TripleStoreEngine
+from starvers.exceptions import ChunkSubmissionError
 
 from scripts.logging import setup_logging
 
@@ -46,12 +48,19 @@ databases_dir = f"{os.environ['RUN_DIR']}/databases/updates"
 update_time_path = f"{os.environ['RUN_DIR']}/output/measurements/update_time.csv"
 update_time_header = [
     'runs', 'triplestore', 'dataset', 'policy',
-    'batch', 'cnt_batch_trpls', 'chunk_size', 'execution_time',
+    'batch', 'cnt_batch_trpls', 'chunk_size', 'max_concurrency', 'execution_time',
 ]
 
+# Throughput (triples per second) per concurrency level, aggregated over all batches
+update_throughput_path = f"{os.environ['RUN_DIR']}/output/measurements/update_throughput.csv"
+
 triple_stores = os.environ.get("triple_stores").split(" ")
 policies = os.environ.get("policies").split(" ")
 datasets = os.environ.get("datasets").split(" ")
+# Numbers of chunks that are sent to the triple store in parallel, e.g. "1 2 4 8"
+concurrency_levels = [int(level) for level in os.environ.get("update_concurrency_levels", "1").split(" ")]
+# Number of triples per update chunk or "auto" to let the engine adapt the chunk size to the triple store
+update_chunk_size = os.environ.get("update_chunk_size", "7000")
 
 # For update evaluation
 in_frm = "nt"
@@ -106,7 +115,8 @@ def load_or_init_update_df() -> pd.DataFrame:
         # Ensure all expected columns exist (e.g. if header changed between runs)
         for col in update_time_header:
             if col not in df.columns:
-                df[col] = None
+                # Measurements from before concurrent chunk submission were sequential
+                df[col] = 1 if col == 'max_concurrency' else None
         df = df[update_time_header]
     else:
         LOG.info(f"No existing update measurements file found, creating new one at {update_time_path}")
@@ -114,7 +124,7 @@ def load_or_init_update_df() -> pd.DataFrame:
     return df
 
 
-def upsert_rows(df, new_rows, key_cols=('runs', 'triplestore', 'dataset', 'policy', 'batch', 'chunk_size')):
+def upsert_rows(df, new_rows, key_cols=('runs', 'triplestore', 'dataset', 'policy', 'batch', 'chunk_size', 'max_concurrency')):
     """
     Insert/update rows in df based on key_cols (a primary key).
     Rows whose key_cols combination already exists are replaced;
@@ -143,15 +153,18 @@ def upsert_rows(df, new_rows, key_cols=('runs', 'triplestore', 'dataset', 'polic
     return df
 
 
-def measure_updates(triple_store: str, dataset: str, policy: str, chunk_size: int, runs: int, source_ic0: str, source_cs: str, last_version: int, init_timestamp: datetime):
-    LOG.info(f"Measuring update times for {triple_store}/{policy}/{dataset} with chunk size {chunk_size} over {runs} runs.")
+def measure_updates(triple_store: str, dataset: str, policy: str, chunk_size: Union[int, str], runs: int, source_ic0: str, source_cs: str, last_version: int, init_timestamp: datetime,
+                    max_concurrency: int = 1):
+    LOG.info(f"Measuring update times for {triple_store}/{policy}/{dataset} with chunk size {chunk_size} "
+             f"and {max_concurrency} concurrent chunks over {runs} runs.")
 
     run_measurements: list[pd.DataFrame] = []
     for run_idx in range(runs):
         LOG.info(f"Run {run_idx + 1}/{runs} ...")
         result = insert_ic0_and_cbs(triple_store, chunk_size, dataset=dataset, policy=policy,
                                     source_ic0=source_ic0, source_cs=source_cs,
-                                    last_version=last_version, init_timestamp=init_timestamp)
+                                    last_version=last_version, init_timestamp=init_timestamp,
+                                    max_concurrency=max_concurrency)
         if result is False:
             # Stop iteration if HTTPError occurred
             LOG.info("HTTPError occurred, stopping update evaluation for this combination.")
@@ -181,8 +194,15 @@ def measure_updates(triple_store: str, dataset: str, policy: str, chunk_size: in
     update_df.to_csv(update_time_path, sep=";", index=False, mode='w', header=True)
 
 
-def insert_ic0_and_cbs(triple_store: str, chunk_size: int, dataset: str, policy: str,
-                        source_ic0: str, source_cs: str, last_version: int, init_timestamp: datetime):
+def count_triples(nt_file: str) -> int:
+    """Counts the triples of an N-Triples file without reading it into memory."""
+    with open(nt_file, "r") as f:
+        return sum(1 for line in f if line.strip() and not line.startswith("#"))
+
+
+def insert_ic0_and_cbs(triple_store: str, chunk_size: Union[int, str], dataset: str, policy: str,
+                        source_ic0: str, source_cs: str, last_version: int, init_timestamp: datetime,
+                        max_concurrency: int = 1):
     triple_store_name = triple_store.lower()
     LOG.info(f"Constructing timestamped RDF-star dataset from ICs and changesets triple store {triple_store} and chunk size {chunk_size}.")
 
@@ -200,10 +220,8 @@ def insert_ic0_and_cbs(triple_store: str, chunk_size: int, dataset: str, policy:
     LOG.info(f"Startup {triple_store} engine")
     subprocess.call(shlex.split(f"{mgmt_script} --log-file {LOG_FILE} startup {database_dir} {policy} {dataset} {CONFIG_DIR}"))
 
-    LOG.info("Read initial snapshot {0} into memory.".format(source_ic0))
-    added_triples_raw = open(source_ic0, "r").read().splitlines()
-    added_triples_raw = list(filter(None, added_triples_raw))
-    added_triples_raw = list(filter(lambda x: not x.startswith("# "), added_triples_raw))
+    # The engine reads the files chunk by chunk. Empty lines and comments are skipped.
+    cnt_trpls = count_triples(source_ic0)
 
     LOG.info("Add triples from initial snapshot {0} as nested triples into the RDF-star dataset.".format(source_ic0))
 
@@ -212,15 +230,16 @@ def insert_ic0_and_cbs(triple_store: str, chunk_size: int, dataset: str, policy:
     rdf_star_engine = TripleStoreEngine(query_endpoint, update_endpoint)
     try:
         start = time.time()
-        rdf_star_engine.insert(triples=added_triples_raw, timestamp=init_timestamp, chunk_size=chunk_size)
+        rdf_star_engine.insert(triples=Path(source_ic0), timestamp=init_timestamp, chunk_size=chunk_size,
+                               max_concurrency=max_concurrency)
         end = time.time()
-    except HTTPError:
-        LOG.info("Too many triples transfered over HTTP. No measures for this chunk size setting will be recorded")
+    except (HTTPError, ChunkSubmissionError) as e:
+        LOG.info(f"Too many triples transfered over HTTP. No measures for this chunk size setting will be recorded: {e}")
         return False
     execution_time_insert = end - start
 
-    df = pd.DataFrame(columns=['triplestore', 'dataset', 'policy', 'batch', 'cnt_batch_trpls', 'chunk_size', 'execution_time'],
-                        data=[[triple_store, dataset, policy, 'snapshot_0', len(added_triples_raw), chunk_size, execution_time_insert]])
+    df = pd.DataFrame(columns=['triplestore', 'dataset', 'policy', 'batch', 'cnt_batch_trpls', 'chunk_size', 'max_concurrency', 'execution_time'],
+                        data=[[triple_store, dataset, policy, 'snapshot_0', cnt_trpls, chunk_size, max_concurrency, execution_time_insert]])
 
     # Map versions to files in chronological orders
     change_sets = {}
@@ -242,31 +261,25 @@ def insert_ic0_and_cbs(triple_store: str, chunk_size: int, dataset: str, policy:
             subprocess.call(shlex.split(f"{mgmt_script} --log-file {LOG_FILE} startup {database_dir} {policy} {dataset} {CONFIG_DIR}"))
 
         if filename.startswith("data-added"):
-            LOG.info("Read positive changeset {0} into memory.".format(filename))
-            added_triples_raw = open(source_cs + "/" + filename, "r").read().splitlines()
-            added_triples_raw = list(filter(None, added_triples_raw))
-            cnt_trpls = len(added_triples_raw)
+            cnt_trpls = count_triples(source_cs + "/" + filename)
 
             LOG.info(f"Add {cnt_trpls} triples from changeset {filename} as nested triples into the RDF-star dataset.")
             start = time.time()
-            rdf_star_engine.insert(triples=added_triples_raw, timestamp=vers_ts, chunk_size=chunk_size)
+            rdf_star_engine.insert(triples=Path(source_cs + "/" + filename), timestamp=vers_ts, chunk_size=chunk_size, max_concurrency=max_concurrency)
             end = time.time()
             execution_time_insert = end - start
-            new_row = pd.DataFrame([[triple_store, dataset, policy, 'positive_change_set_' + str(version), len(added_triples_raw), chunk_size, execution_time_insert]], columns=df.columns)
+            new_row = pd.DataFrame([[triple_store, dataset, policy, 'positive_change_set_' + str(version), cnt_trpls, chunk_size, max_concurrency, execution_time_insert]], columns=df.columns)
             df = pd.concat([df, new_row], ignore_index=True)
 
         if filename.startswith("data-deleted"):
-            LOG.info("Read negative changeset {0} into memory.".format(filename))
-            deleted_triples_raw = open(source_cs + "/" + filename, "r").read().splitlines()
-            deleted_triples_raw = list(filter(None, deleted_triples_raw))
-            cnt_trpls = len(deleted_triples_raw)
+            cnt_trpls = count_triples(source_cs + "/" + filename)
 
             LOG.info(f"Oudate {cnt_trpls} triples in the RDF-star dataset which match the triples in {filename}.")
             start = time.time()
-            rdf_star_engine.outdate(triples=deleted_triples_raw, timestamp=vers_ts, chunk_size=chunk_size)
+            rdf_star_engine.outdate(triples=Path(source_cs + "/" + filename), timestamp=vers_ts, chunk_size=chunk_size, max_concurrency=max_concurrency)
             end = time.time()
             execution_time_outdate = end - start
-            new_row = pd.DataFrame([[triple_store, dataset, policy, 'negative_change_set_' + str(version), len(deleted_triples_raw), chunk_size, execution_time_outdate]], columns=df.columns)
+            new_row = pd.DataFrame([[triple_store, dataset, policy, 'negative_change_set_' + str(version), cnt_trpls, chunk_size, max_concurrency, execution_time_outdate]], columns=df.columns)
             df = pd.concat([df, new_row], ignore_index=True)
 
     # Shutdown engine
@@ -275,6 +288,35 @@ def insert_ic0_and_cbs(triple_store: str, chunk_size: int, dataset: str, policy:
     return df
 
 
+def report_throughput():
+    """
+    Aggregates the update measurements per concurrency level into triples per second and
+    the throughput gain relative to the sequential submission (max_concurrency = 1).
+    """
+    update_df = load_or_init_update_df()
+    if update_df.empty:
+        return
+
+    group_cols = ['triplestore', 'dataset', 'policy', 'chunk_size']
+    throughput_df = update_df.groupby(group_cols + ['max_concurrency'], as_index=False) \
+        .agg(cnt_trpls=('cnt_batch_trpls', 'sum'), execution_time=('execution_time', 'sum'))
+    throughput_df['trpls_per_second'] = throughput_df['cnt_trpls'] / throughput_df['execution_time']
+
+    sequential_df = throughput_df[throughput_df['max_concurrency'] == 1][group_cols + ['trpls_per_second']] \
+        .rename(columns={'trpls_per_second': 'sequential_trpls_per_second'})
+    throughput_df = throughput_df.merge(sequential_df, on=group_cols, how='left')
+    throughput_df['throughput_gain'] = throughput_df['trpls_per_second'] / throughput_df['sequential_trpls_per_second']
+    throughput_df = throughput_df.drop(columns=['sequential_trpls_per_second'])
+
+    for _, row in throughput_df.iterrows():
+        LOG.info(f"{row['triplestore']}/{row['policy']}/{row['dataset']} chunk size {row['chunk_size']}, "
+                 f"{row['max_concurrency']} concurrent chunks: {row['trpls_per_second']:.0f} triples/s "
+                 f"(gain: {row['throughput_gain']:.2f}x)")
+
+    LOG.info(f"Writing update throughput per concurrency level to {update_throughput_path}")
+    throughput_df.to_csv(update_throughput_path, sep=";", index=False, mode='w', header=True)
+
+
 # ---------------------------------------------------------------------------
 # Execution
 # ---------------------------------------------------------------------------
@@ -283,7 +325,7 @@ def main():
     # running the update evaluation never overwrites ingest-created repositories.
     os.makedirs(databases_dir, exist_ok=True)
 
-    chunk_size = 7000
+    chunk_size = update_chunk_size if update_chunk_size == "auto" else int(update_chunk_size)
     runs = 1
     for dataset in datasets:
         for policy in policies:
@@ -291,15 +333,19 @@ def main():
                 data_dir = f"{os.environ['RUN_DIR']}/rawdata/{dataset}"
                 total_versions = dataset_versions[dataset]
 
-                measure_updates(triple_store=triple_store,
-                        dataset=dataset,
-                        policy=policy,
-                        chunk_size=chunk_size,
-                        runs=runs,
-                        source_ic0=f"{data_dir}/{snapshot_dir}/" + "1".zfill(ic_basename_lengths[dataset])  + ".nt",
-                        source_cs=f"{data_dir}/{change_sets_dir}.{in_frm}",
-                        last_version=total_versions,
-                        init_timestamp=init_version_timestamp)
+                for max_concurrency in concurrency_levels:
+                    measure_updates(triple_store=triple_store,
+                            dataset=dataset,
+                            policy=policy,
+                            chunk_size=chunk_size,
+                            runs=runs,
+                            source_ic0=f"{data_dir}/{snapshot_dir}/" + "1".zfill(ic_basename_lengths[dataset])  + ".nt",
+                            source_cs=f"{data_dir}/{change_sets_dir}.{in_frm}",
+                            last_version=total_versions,
+                            init_timestamp=init_version_timestamp,
+                            max_concurrency=max_concurrency)
+
+    report_throughput()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""
+apply_delta_benchmark.py – compares two ways of applying a delta (insertions and deletions) to a
+timestamp-based RDF-star dataset:
+
+    two_calls   : TripleStoreEngine.insert(...) followed by TripleStoreEngine.outdate(...),
+                  i.e. one request stream per operation
+    apply_delta : TripleStoreEngine.apply_delta(...), i.e. one multi-operation SPARQL update
+                  (outdate ; insert) per chunk
+
+The benchmark runs against a running RDF-star store (e.g. GraphDB) and writes synthetic triples with
+the namespace http://example.com/apply_delta_benchmark/<run id>/ into it. For every delta size, a fresh
+set of base triples is inserted first so that each method outdates triples that are currently valid.
+
+The measurements are written to
+    <out>/apply_delta.csv
+
+Usage:
+    python apply_delta_benchmark.py --query-endpoint http://localhost:7200/repositories/<repo> \
+        --update-endpoint http://localhost:7200/repositories/<repo>/statements \
+        --out <output dir> [--delta-sizes 1000 10000 100000] [--chunk-size 1000] [--repetitions 3] \
+        [--mode decorator|reification]
+"""
+
+import argparse
+import csv
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from starvers.starvers import TripleStoreEngine
+
+
+def generate_triples(namespace: str, name: str, cnt: int) -> list[str]:
+    return [f"<{namespace}{name}/s{i}> <{namespace}p> <{namespace}{name}/o{i}> ." for i in range(cnt)]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--query-endpoint", required=True)
+    ap.add_argument("--update-endpoint", required=True)
+    ap.add_argument("--out", required=True, help="output dir for the measurement file")
+    ap.add_argument("--delta-sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                    help="number of insertions and number of deletions per delta")
+    ap.add_argument("--chunk-size", type=int, default=1000)
+    ap.add_argument("--repetitions", type=int, default=3)
+    ap.add_argument("--mode", default="decorator", choices=["decorator", "reification"])
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = out_dir / "apply_delta.csv"
+
+    engine = TripleStoreEngine(args.query_endpoint, args.update_endpoint, mode=args.mode)
+    namespace = f"http://example.com/apply_delta_benchmark/{uuid.uuid4().hex}/"
+    base_timestamp = datetime(2022, 10, 1, 12, 0, 0, 0, timezone.utc)
+
+    with open(out_file, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["delta_size", "chunk_size", "method", "repetition", "cnt_requests", "execution_time"])
+
+        for delta_size in args.delta_sizes:
+            for repetition in range(args.repetitions):
+                for method in ["two_calls", "apply_delta"]:
+                    name = f"{method}_{delta_size}_{repetition}"
+                    deletions = generate_triples(namespace, name + "/base", delta_size)
+                    insertions = generate_triples(namespace, name + "/delta", delta_size)
+                    engine.insert(deletions, timestamp=base_timestamp, chunk_size=args.chunk_size)
+                    version_timestamp = base_timestamp + timedelta(days=repetition + 1)
+
+                    start = time.perf_counter()
+                    if method == "two_calls":
+                        engine.insert(insertions, timestamp=version_timestamp, chunk_size=args.chunk_size)
+                        engine.outdate(deletions, timestamp=version_timestamp, chunk_size=args.chunk_size)
+                        cnt_requests = 2 * -(-delta_size // args.chunk_size)
+                    else:
+                        engine.apply_delta(insertions, deletions, timestamp=version_timestamp, chunk_size=args.chunk_size)
+                        cnt_requests = -(-delta_size // args.chunk_size)
+                    execution_time = time.perf_counter() - start
+
+                    writer.writerow([delta_size, args.chunk_size, method, repetition, cnt_requests, execution_time])
+                    print(f"{delta_size:>8} triples  {method:<12} {execution_time:8.3f}s", flush=True)
+            f.flush()
+
+    print(f"[ok] {out_file}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+latest_version_retrieval.py – compares the two forms of querying the current version
+of a timestamp-based RDF-star dataset:
+
+    range  : filter(?valid_from <= ?ts && ?ts < ?valid_until) with ?ts = execution timestamp
+    latest : vers:valid_until bound to the artificial end date "9999-12-31T00:00:00.000+02:00"
+             inside the quoted triple pattern (timestamp_query(..., latest=True))
+
+Executed INSIDE the starvers_eval container. It starts / stops the triple store with the
+existing management scripts, rewrites every raw query of a query set with both forms
+and measures the execution time of each form.
+
+The measurements are written to
+    <out>/latest_vs_range_<triple_store>_<dataset>.csv
+
+Usage (inside the container):
+    python /starvers_eval/scripts/analysis/latest_version_retrieval.py \
+        --run-dir /starvers_eval/data/<TIMESTAMP> \
+        --out /starvers_eval/data/<TIMESTAMP>/output/measurements \
+        [--triple-store graphdb] [--dataset bearb_hour] [--query-set lookup] \
+        [--model tb_sr_rs|tb_sr_re] [--repetitions 5]
+"""
+
+import argparse
+import csv
+import logging
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import tomli
+
+from starvers.starvers import TripleStoreEngine, split_prefixes_query
+
+CONFIG_PATH = Path("/starvers_eval/configs/eval_setup.toml")
+
+MODES = {"tb_sr_rs": "decorator", "tb_sr_re": "reification"}
+
+
+def _load_config():
+    with open(CONFIG_PATH, "rb") as f:
+        return tomli.load(f)
+
+
+def load_queries(raw_queries_dir: Path) -> list[tuple[str, str]]:
+    """Return (query name, query) tuples. Lookup query files hold one triple pattern per line."""
+    queries = []
+    for file_name in sorted(os.listdir(raw_queries_dir)):
+        if not file_name.endswith(".txt"):
+            continue
+        with open(raw_queries_dir / file_name, "r", encoding="utf-8", errors="ignore") as f:
+            lines = [l for l in f.read().splitlines() if l.strip()]
+        for i, line in enumerate(lines):
+            prefixes, pattern = split_prefixes_query(line)
+            queries.append((f"{file_name.split('.')[0]}_q{i}", f"{prefixes}\nSelect * {{\n    {pattern}\n}}"))
+    return queries
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--run-dir", required=True,
+                    help="in-container run dir, e.g. /starvers_eval/data/<TIMESTAMP>")
+    ap.add_argument("--out", required=True, help="output dir for the measurement file")
+    ap.add_argument("--triple-store", default="graphdb")
+    ap.add_argument("--dataset", default="bearb_hour")
+    ap.add_argument("--query-set", default="lookup")
+    ap.add_argument("--model", default=None,
+                    help="tb_sr_rs or tb_sr_re (default: run both)")
+    ap.add_argument("--repetitions", type=int, default=5)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    static = _load_config()
+    store_params = static["rdf_stores"][args.triple_store]
+    mgmt_script = store_params["mgmt_script"]
+    databases_dir = f"{args.run_dir}/databases"
+    config_dir = f"{args.run_dir}/configs/ingest"
+    superset = static["datasets"][args.dataset]["superset"]
+    raw_queries_dir = Path(f"{args.run_dir}/queries/raw_queries/{superset}/{args.query_set}")
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    models = [args.model] if args.model else ["tb_sr_rs", "tb_sr_re"]
+    queries = load_queries(raw_queries_dir)
+    logging.info("Loaded %d queries from %s", len(queries), raw_queries_dir)
+
+    out_file = out_dir / f"latest_vs_range_{args.triple_store}_{args.dataset}.csv"
+    with open(out_file, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["triplestore", "dataset", "policy", "query_set", "query",
+                         "form", "repetition", "execution_time", "cnt_rows"])
+
+        for model in models:
+            repo = f"{model}_{args.dataset}"
+            db_dir = f"{databases_dir}/{args.triple_store}/{repo}"
+
+            logging.info("Startup %s for %s, %s", args.triple_store, model, args.dataset)
+            subprocess.run([mgmt_script, "startup", db_dir, model, args.dataset, config_dir], check=True)
+
+            pid_file = f"/tmp/{args.triple_store}_{model}_{args.dataset}.pid"
+            for _ in range(3):
+                time.sleep(3)
+                if os.path.exists(pid_file):
+                    break
+            if not os.path.exists(pid_file):
+                raise RuntimeError("PID not found")
+
+            engine = TripleStoreEngine(store_params["get"].format(repo=repo),
+                                       store_params["post"].format(repo=repo),
+                                       skip_connection_test=True, mode=MODES[model])
+
+            for query_name, query in queries:
+                for repetition in range(args.repetitions):
+                    for form, latest in [("range", False), ("latest", True)]:
+                        start = time.time()
+                        df = engine.query(query, latest=latest)
+                        execution_time = time.time() - start
+                        writer.writerow([args.triple_store, args.dataset, model, args.query_set, query_name,
+                                         form, repetition, execution_time, len(df.index)])
+                f.flush()
+
+            subprocess.run([mgmt_script, "shutdown"], check=True)
+            logging.info("%s %s stopped", args.triple_store, repo)
+            time.sleep(3)
+
+    print(f"[ok] {out_file}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
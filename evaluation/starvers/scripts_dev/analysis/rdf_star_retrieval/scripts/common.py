@@ -14,10 +14,20 @@ A "scenario" is a dict:
     }
 
 The predicate is configurable so the same scenario can run on any dataset.
+
+The "rewrite scenarios" (build_rewrite_scenarios) compare the plans of a
+multi-join query as timestamped by starvers' timestamp_query with and without the
+optimization stage of the rewrite (optimize=True: one grouped validity filter per
+BGP, the timestamp as a constant instead of a BIND per BGP, duplicate triple
+patterns versioned once).
 """
 
+import re
+from datetime import datetime, timezone
 from pathlib import Path
 
+from starvers.starvers import timestamp_query
+
 VERS = "https://github.com/GreenfishK/DataCitation/versioning/"
 RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
 
@@ -69,3 +79,39 @@ def build_scenarios(predicate: str) -> list[dict]:
 def pick_predicate(dataset: str) -> str:
     """A predicate that exists in every dataset (rdfs:label)."""
     return "http://www.w3.org/2000/01/rdf-schema#label"
+
+
+# A snapshot timestamp that lies within every dataset's versioning range
+REWRITE_TIMESTAMP = datetime(2022, 10, 1, 12, 0, 0, 0, timezone.utc)
+
+
+def _graphdb_explain(query: str) -> str:
+    """Add GraphDB's onto:explain pseudo-graph to the outermost select clause."""
+    query = re.sub(r"(\bSELECT\b[^{]*?)(\s*(WHERE\s*)?\{)", r"\1 FROM onto:explain\2", query, count=1)
+    return "PREFIX onto: <http://www.ontotext.com/>\n" + query
+
+
+def build_rewrite_scenarios(predicate: str) -> list[dict]:
+    # Labeled resources, their types and the types' labels. The label pattern is
+    # repeated as a query with a property path resolved into triple patterns would.
+    raw_query = (
+        f"PREFIX rdf: <{RDF}>\n"
+        f"SELECT ?s ?label ?type ?typeLabel WHERE {{\n"
+        f"  ?s <{predicate}> ?label .\n"
+        f"  ?s rdf:type ?type .\n"
+        f"  ?type <{predicate}> ?typeLabel .\n"
+        f"  ?s <{predicate}> ?label .\n"
+        f"}}"
+    )
+    scenarios = []
+    for model, mode in [("tb_sr_rs", "decorator"), ("tb_sr_re", "reification")]:
+        for optimize in [False, True]:
+            query, _ = timestamp_query(raw_query, REWRITE_TIMESTAMP, mode=mode, optimize=optimize)
+            scenarios.append({
+                "id": "join_rewrite_optimized" if optimize else "join_rewrite",
+                "model": model,
+                "graphdb_query": _graphdb_explain(query),
+                "jena_query": query,
+            })
+    return scenarios
+
@@ -30,7 +30,7 @@ from pathlib import Path
 
 import tomli
 
-from common import build_scenarios
+from common import build_scenarios, build_rewrite_scenarios
 
 CONFIG_PATH = Path("/starvers_eval/configs/eval_setup.toml")
 
@@ -104,7 +104,7 @@ def main():
     out_dir.mkdir(parents=True, exist_ok=True)
 
     models = [args.model] if args.model else ["tb_sr_rs", "tb_sr_re"]
-    scenarios = build_scenarios(PREDICATE)
+    scenarios = build_scenarios(PREDICATE) + build_rewrite_scenarios(PREDICATE)
 
     for model in models:
         policy = model
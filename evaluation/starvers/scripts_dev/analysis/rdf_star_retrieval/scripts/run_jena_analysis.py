@@ -27,7 +27,7 @@ import os
 import subprocess
 from pathlib import Path
 
-from common import build_scenarios
+from common import build_scenarios, build_rewrite_scenarios
 
 JENA_JAR = "/jena-fuseki/fuseki-server.jar"
 JAVA_HOME = "/opt/java/java17/openjdk"          # Jena needs Java 17
@@ -60,7 +60,7 @@ def main():
         return
 
     models = [args.model] if args.model else ["tb_sr_rs", "tb_sr_re"]
-    scenarios = build_scenarios(PREDICATE)
+    scenarios = build_scenarios(PREDICATE) + build_rewrite_scenarios(PREDICATE)
 
     for model in models:
         repo = f"{model}_{args.dataset}"
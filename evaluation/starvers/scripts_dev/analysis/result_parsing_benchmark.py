@@ -0,0 +1,104 @@
+"""
+result_parsing_benchmark.py – compares the conversion of SPARQL select results into pandas dataframes:
+
+    to_df          : SPARQL JSON response, formatted cell by cell (TripleStoreEngine.query(..., result_format="json"))
+    to_df_columnar : SPARQL TSV response, parsed and formatted column-wise (TripleStoreEngine.query(..., result_format="arrow"))
+
+The responses are generated synthetically so that only the parsing is measured and no triple store is needed.
+Every row binds an IRI, a language-tagged literal, a typed literal, an integer and a plain literal
+containing double quotes. Every tenth row leaves the last variable unbound.
+
+The measurements are written to
+    <out>/result_parsing.csv
+
+Usage:
+    python result_parsing_benchmark.py --out <output dir> [--rows 10000 100000 1000000] [--repetitions 3]
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import time
+from pathlib import Path
+
+from starvers._helper import to_df, to_df_columnar
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+class SyntheticResult:
+    """Stands in for SPARQLWrapper's QueryResult with a response that is already in memory."""
+    def __init__(self, body: bytes, response_format: str):
+        self.response = io.BufferedReader(io.BytesIO(body))
+        self.response_format = response_format
+
+    def _get_responseFormat(self):
+        return self.response_format
+
+    def convert(self):
+        return json.loads(self.response.read())
+
+
+def generate_responses(rows: int) -> tuple[bytes, bytes]:
+    variables = ["s", "label", "created", "cnt", "comment"]
+    bindings = []
+    tsv_lines = ["\t".join("?" + v for v in variables)]
+    for i in range(rows):
+        binding = {
+            "s": {"type": "uri", "value": f"http://example.com/resource/{i}"},
+            "label": {"type": "literal", "value": f"label {i}", "xml:lang": "en"},
+            "created": {"type": "literal", "value": "2022-10-10T09:54:57.161+02:00", "datatype": XSD + "dateTime"},
+            "cnt": {"type": "literal", "value": str(i), "datatype": XSD + "integer"},
+        }
+        tsv_line = [f"<http://example.com/resource/{i}>", f'"label {i}"@en',
+                    f'"2022-10-10T09:54:57.161+02:00"^^<{XSD}dateTime>', str(i)]
+        if i % 10 != 0:
+            binding["comment"] = {"type": "literal", "value": f'a "quoted" comment {i}'}
+            tsv_line.append(f'"a \\"quoted\\" comment {i}"')
+        else:
+            tsv_line.append("")
+        bindings.append(binding)
+        tsv_lines.append("\t".join(tsv_line))
+
+    json_body = json.dumps({"head": {"vars": variables}, "results": {"bindings": bindings}}).encode("utf-8")
+    tsv_body = ("\n".join(tsv_lines) + "\n").encode("utf-8")
+    return json_body, tsv_body
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", required=True, help="output dir for the measurement file")
+    ap.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    ap.add_argument("--repetitions", type=int, default=3)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = out_dir / "result_parsing.csv"
+
+    with open(out_file, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["rows", "method", "repetition", "response_bytes", "parsing_time"])
+
+        for rows in args.rows:
+            json_body, tsv_body = generate_responses(rows)
+            for repetition in range(args.repetitions):
+                for method, body, response_format, parse in [("to_df", json_body, "json", to_df),
+                                                             ("to_df_columnar", tsv_body, "tsv", to_df_columnar)]:
+                    result = SyntheticResult(body, response_format)
+                    start = time.perf_counter()
+                    df = parse(result)
+                    parsing_time = time.perf_counter() - start
+                    assert len(df.index) == rows
+                    writer.writerow([rows, method, repetition, len(body), parsing_time])
+                    print(f"{rows:>8} rows  {method:<15} {parsing_time:8.3f}s", flush=True)
+            f.flush()
+
+    print(f"[ok] {out_file}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
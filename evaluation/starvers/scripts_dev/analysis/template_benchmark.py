@@ -0,0 +1,111 @@
+"""
+template_benchmark.py – compares filling the starvers templates by reading the template file and calling str.format
+on every use (file_format, how the templates were used before the template registry) with the preloaded and
+pre-split templates of starvers.template_registry (registry) in the two hot loops that use them:
+
+    rewrite : building the versioning block of a basic graph pattern with one filled template per triple
+              (starvers._versioning_block, which timestamp_query calls once per BGP)
+    update  : filling the insert statement for chunks of 10 triples each
+              (as in starvers._insert_rows, which TripleStoreEngine.insert calls once per insert)
+
+No triple store is needed. The rewrite cache of timestamp_query is not involved.
+
+The measurements are written to
+    <out>/template_filling.csv
+
+Usage:
+    python template_benchmark.py --out <output dir> [--triples 10 100 1000] [--repetitions 5] [--mode decorator]
+"""
+
+import argparse
+import csv
+import logging
+import os
+import time
+from pathlib import Path
+
+import rdflib
+
+from starvers.starvers import _versioning_block, _sparql_prefixes, _TIMESTAMP_PLACEHOLDER
+from starvers.template_registry import TEMPLATES_DIR, get_templates
+
+
+def file_format_versioning_block(triples: list, bgp_identifier: str, mode: str, templates_dir: str) -> str:
+    # _versioning_block as it was before the template registry
+    ver_block_template = open(os.path.join(templates_dir, "versioning_query_extensions.txt"), "r").read()
+    ver_block = ""
+    for i, triple in enumerate(triples):
+        cnt = i + 1
+        triple_n3 = triple[0].n3() + " " + triple[1].n3() + " " + triple[2].n3()
+        ver_block += ver_block_template.format(triple_n3, "?valid_from_{0}".format(str(cnt)),
+                                               "?valid_until_{0}".format(str(cnt)), bgp_identifier, str(cnt))
+    ver_block += 'bind("{0}"^^xsd:dateTime as ?ts{1})'.format(_TIMESTAMP_PLACEHOLDER, bgp_identifier)
+    return ver_block
+
+
+def registry_versioning_block(triples: list, bgp_identifier: str, mode: str, templates_dir: str) -> str:
+    return _versioning_block(triples, bgp_identifier, 0, mode, templates_dir)[0]
+
+
+def file_format_insert_statements(chunks: list[str], prefixes: str, templates_dir: str) -> list[str]:
+    # The template was read on every insert and each chunk was filled with str.format.
+    statement = open(templates_dir + "/insert_triples.txt", "r").read()
+    return [statement.format(prefixes, chunk, "NOW()") for chunk in chunks]
+
+
+def registry_insert_statements(chunks: list[str], prefixes: str, templates_dir: str) -> list[str]:
+    # as in _insert_rows
+    statement = get_templates(templates_dir)["insert_triples"]
+    return [statement.format(prefixes, chunk, "NOW()") for chunk in chunks]
+
+
+def generate_triples(n: int) -> list:
+    return [(rdflib.Variable(f"s{i}"), rdflib.URIRef(f"http://example.com/p{i}"), rdflib.Variable(f"o{i}")) for i in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", required=True, help="output dir for the measurement file")
+    ap.add_argument("--triples", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--repetitions", type=int, default=5)
+    ap.add_argument("--mode", default="decorator", choices=["decorator", "reification"])
+    ap.add_argument("--loops", type=int, default=1000, help="number of versioning blocks or inserts built per measurement")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = out_dir / "template_filling.csv"
+    templates_dir = os.path.join(TEMPLATES_DIR, args.mode)
+
+    with open(out_file, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["loop", "triples", "method", "repetition", "loops", "time"])
+
+        for n in args.triples:
+            bgp = generate_triples(n)
+            rows = [f"(<http://example.com/s{i}> <http://example.com/p> \"o{i}\")" for i in range(n)]
+            chunks = ["\n".join(rows[i:i + 10]) for i in range(0, n, 10)]
+            prefixes = _sparql_prefixes(None, args.mode)
+            assert file_format_versioning_block(bgp, "BGP_0", args.mode, templates_dir) \
+                == registry_versioning_block(bgp, "BGP_0", args.mode, templates_dir)
+
+            benchmarks = [("rewrite", "file_format", lambda: file_format_versioning_block(bgp, "BGP_0", args.mode, templates_dir)),
+                          ("rewrite", "registry", lambda: registry_versioning_block(bgp, "BGP_0", args.mode, templates_dir)),
+                          ("update", "file_format", lambda: file_format_insert_statements(chunks, prefixes, templates_dir)),
+                          ("update", "registry", lambda: registry_insert_statements(chunks, prefixes, templates_dir))]
+            for repetition in range(args.repetitions):
+                for loop, method, build in benchmarks:
+                    start = time.perf_counter()
+                    for _ in range(args.loops):
+                        build()
+                    duration = time.perf_counter() - start
+                    writer.writerow([loop, n, method, repetition, args.loops, duration])
+                    print(f"{loop:<8} {n:>6} triples  {method:<12} {duration:8.3f}s", flush=True)
+            f.flush()
+
+    print(f"[ok] {out_file}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,8 @@ setup(
     author_email='filip.kovacevic@tuwien.ac.at',
     license='Apache License 2.0',
     install_requires=['pandas==2.3.3','pytest==7.1.3','rdflib==7.6.0', 'setuptools==65.4.0',
-    'SPARQLWrapper==2.0.0','tzlocal==4.2'],
+    'SPARQLWrapper==2.0.0','tzlocal==4.2', 'requests==2.32.3'],
+    extras_require={'arrow': ['pyarrow>=14.0.0'], 'async': ['httpx>=0.27.0']},
 
     classifiers=[
         'Development Status :: 4 - Beta',
@@ -0,0 +1,201 @@
+import re
+from typing import NamedTuple, Optional
+from rdflib.namespace import RDF, XSD
+from rdflib.term import Literal, URIRef, Variable, Identifier
+
+
+class BGPSelectQuery(NamedTuple):
+    """
+    A SELECT query whose WHERE clause consists of a single basic graph pattern.
+    """
+    modifier: str
+    projection: list[Variable]
+    triples: list[tuple[Identifier, Identifier, Identifier]]
+    limit: Optional[int]
+    offset: Optional[int]
+
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<ws>\s+)
+    |(?P<comment>\#[^\n]*)
+    |(?P<iri><[^<>"{}|^`\\\s]*>)
+    |(?P<string>"[^"\\\n]*"|'[^'\\\n]*')
+    |(?P<langtag>@[a-zA-Z]+(?:-[a-zA-Z0-9]+)*)
+    |(?P<datatype>\^\^)
+    |(?P<var>[?$]\w+)
+    |(?P<pname>(?:[A-Za-z][\w.-]*)?:(?:[\w-](?:[\w.-]*[\w-])?)?)
+    |(?P<double>[+-]?(?:\d+\.\d*|\.\d+|\d+)[eE][+-]?\d+)
+    |(?P<decimal>[+-]?\d*\.\d+)
+    |(?P<integer>[+-]?\d+)
+    |(?P<keyword>[A-Za-z]+)
+    |(?P<punct>[{}.;,*])
+    """, re.VERBOSE)
+
+
+class _NotABGPQuery(Exception):
+    pass
+
+
+def _tokenize(query: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    while pos < len(query):
+        match = _TOKEN_PATTERN.match(query, pos)
+        if match is None:
+            raise _NotABGPQuery()
+        if match.lastgroup not in ["ws", "comment"]:
+            tokens.append((match.lastgroup, match.group()))
+        pos = match.end()
+    return tokens
+
+
+def parse_bgp_select(query: str) -> Optional[BGPSelectQuery]:
+    """
+    Parses queries of the form
+        PREFIX ... SELECT [DISTINCT|REDUCED] (*|?var ...) [WHERE] { <triple patterns> } [LIMIT n] [OFFSET n]
+    without the rdflib SPARQL parser. The terms are created the same way as in the rdflib parser.
+
+    :param query: A SPARQL query string.
+    :return: The parsed query or None if the query contains anything else than the constructs above,
+    e.g. paths, blank nodes, filters, subqueries, (NOT) EXISTS or solution modifiers other than LIMIT and OFFSET.
+    """
+
+    try:
+        tokens = _tokenize(query)
+    except _NotABGPQuery:
+        return None
+
+    pos = 0
+    def peek() -> tuple[str, str]:
+        return tokens[pos] if pos < len(tokens) else ("eof", "")
+
+    def next_token() -> tuple[str, str]:
+        nonlocal pos
+        token = peek()
+        pos += 1
+        return token
+
+    def is_keyword(token: tuple[str, str], *keywords: str) -> bool:
+        return token[0] == "keyword" and token[1].upper() in keywords
+
+    namespaces: dict[str, str] = {}
+
+    def iri(token: tuple[str, str]) -> URIRef:
+        kind, value = token
+        if kind == "iri":
+            if ":" not in value:
+                # Relative IRIs would need to be resolved against a base IRI.
+                raise _NotABGPQuery()
+            return URIRef(value[1:-1])
+        if kind == "pname":
+            prefix, local = value.split(":", 1)
+            if prefix not in namespaces or local.endswith("."):
+                raise _NotABGPQuery()
+            return URIRef(namespaces[prefix] + local)
+        raise _NotABGPQuery()
+
+    def term(position: str) -> Identifier:
+        kind, value = next_token()
+        if kind == "var":
+            return Variable(value[1:])
+        if kind in ["iri", "pname"]:
+            return iri((kind, value))
+        if position == "predicate" and kind == "keyword" and value == "a":
+            return RDF.type
+        if position != "object":
+            raise _NotABGPQuery()
+        if kind == "string":
+            if peek()[0] == "langtag":
+                return Literal(value[1:-1], lang=next_token()[1][1:])
+            if peek()[0] == "datatype":
+                next_token()
+                return Literal(value[1:-1], datatype=iri(next_token()))
+            return Literal(value[1:-1])
+        if kind in ["integer", "decimal", "double"]:
+            return Literal(value, datatype=XSD[kind])
+        if kind == "keyword" and value in ["true", "false"]:
+            return Literal(value, datatype=XSD.boolean)
+        raise _NotABGPQuery()
+
+    try:
+        # Prologue
+        while is_keyword(peek(), "PREFIX"):
+            next_token()
+            kind, prefix = next_token()
+            if kind != "pname" or not prefix.endswith(":") or prefix.count(":") != 1:
+                raise _NotABGPQuery()
+            kind, namespace = next_token()
+            if kind != "iri":
+                raise _NotABGPQuery()
+            namespaces[prefix[:-1]] = namespace[1:-1]
+
+        # Select clause
+        if not is_keyword(next_token(), "SELECT"):
+            raise _NotABGPQuery()
+        modifier = ""
+        if is_keyword(peek(), "DISTINCT", "REDUCED"):
+            modifier = next_token()[1].upper()
+        projection: list[Variable] = []
+        if peek() == ("punct", "*"):
+            next_token()
+        else:
+            while peek()[0] == "var":
+                projection.append(Variable(next_token()[1][1:]))
+            if len(projection) == 0:
+                raise _NotABGPQuery()
+
+        # Where clause
+        if is_keyword(peek(), "WHERE"):
+            next_token()
+        if next_token() != ("punct", "{"):
+            raise _NotABGPQuery()
+        triples: list[tuple[Identifier, Identifier, Identifier]] = []
+        while peek() != ("punct", "}"):
+            subject = term("subject")
+            while True:
+                predicate = term("predicate")
+                while True:
+                    triples.append((subject, predicate, term("object")))
+                    if peek() != ("punct", ","):
+                        break
+                    next_token()
+                if peek() != ("punct", ";"):
+                    break
+                while peek() == ("punct", ";"):
+                    next_token()
+                if peek() in [("punct", "."), ("punct", "}")]:
+                    break
+            if peek() == ("punct", "."):
+                next_token()
+            elif peek() != ("punct", "}"):
+                raise _NotABGPQuery()
+        next_token()
+        if len(triples) == 0:
+            raise _NotABGPQuery()
+
+        # Solution modifiers
+        limit: Optional[int] = None
+        offset: Optional[int] = None
+        while peek()[0] != "eof":
+            keyword = next_token()
+            kind, value = next_token()
+            if kind != "integer" or value.startswith(("+", "-")):
+                raise _NotABGPQuery()
+            if is_keyword(keyword, "LIMIT") and limit is None:
+                limit = int(value)
+            elif is_keyword(keyword, "OFFSET") and offset is None:
+                offset = int(value)
+            else:
+                raise _NotABGPQuery()
+    except _NotABGPQuery:
+        return None
+
+    if len(projection) == 0:
+        for triple in triples:
+            for t in triple:
+                if isinstance(t, Variable) and t not in projection:
+                    projection.append(t)
+        if len(projection) == 0:
+            return None
+
+    return BGPSelectQuery(modifier, projection, triples, limit, offset)
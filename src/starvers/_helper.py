@@ -1,13 +1,23 @@
 import os
+import re
+import json
+import csv
+import codecs
 from datetime import datetime
 import pandas as pd
 import io
-from typing import Optional
+from typing import Iterator, Optional
 from SPARQLWrapper import Wrapper
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import pyarrow  # noqa: F401
+    _ARROW_AVAILABLE = True
+except ImportError:
+    _ARROW_AVAILABLE = False
+
 
 def versioning_timestamp_format(version_timestamp: datetime) -> str:
     """
@@ -21,6 +31,45 @@ def versioning_timestamp_format(version_timestamp: datetime) -> str:
         return version_timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
 
 
+def format_value(res_value: dict[str, str]) -> str:
+    """
+    Formats a SPARQL result value while handling proper escaping and selecting suitable quotes.
+    
+    :param res_value: The value to format, including optional language or datatype information.
+    :return: A properly formatted and escaped query result.
+    """
+
+    def escape_string(value: str):
+        """
+        Escapes special characters and selects the appropriate quotes.
+        TODO handle escaping
+        """
+        if '\n' in value or '\r' in value or ('"' in value and "'" in value):
+            # Multi-line or contains both single and double quotes
+            return f'"""{value}"""'
+        elif '"' in value:
+            # Contains double quotes, use single quotes
+            return f"'{value}'"
+        else:
+            # Default to double quotes
+            return f'"{value}"'
+    
+    value = res_value["value"]
+    lang = res_value.get("xml:lang")
+    datatype = res_value.get("datatype")
+
+
+    if lang:  # Language-tagged literal
+        return f"\"{value}\"@{lang}"
+    elif datatype:  # Typed literal
+        return f"\"{value}\"^^<{datatype}>"
+    else:  # Plain string literal or URI
+        if res_value["type"] == "uri":
+            return f"<{value}>"
+        else:
+            return escape_string(value)
+
+
 def to_df(result: Wrapper.QueryResult) -> pd.DataFrame:
     """
     :param result:
@@ -28,66 +77,13 @@ def to_df(result: Wrapper.QueryResult) -> pd.DataFrame:
     """
     pd.set_option('display.max_columns', None)
     pd.set_option('display.max_colwidth', None)
-    
-    def format_value(res_value: dict[str, str]) -> str:
-        """
-        Formats a SPARQL result value while handling proper escaping and selecting suitable quotes.
-        
-        :param res_value: The value to format, including optional language or datatype information.
-        :return: A properly formatted and escaped query result.
-        """
-    
-        def escape_string(value: str):
-            """
-            Escapes special characters and selects the appropriate quotes.
-            TODO handle escaping
-            """
-            if '\n' in value or '\r' in value or ('"' in value and "'" in value):
-                # Multi-line or contains both single and double quotes
-                return f'"""{value}"""'
-            elif '"' in value:
-                # Contains double quotes, use single quotes
-                return f"'{value}'"
-            else:
-                # Default to double quotes
-                return f'"{value}"'
-        
-        value = res_value["value"]
-        lang = res_value.get("xml:lang")
-        datatype = res_value.get("datatype")
-
-
-        if lang:  # Language-tagged literal
-            return f"\"{value}\"@{lang}"
-        elif datatype:  # Typed literal
-            return f"\"{value}\"^^<{datatype}>"
-        else:  # Plain string literal or URI
-            if res_value["type"] == "uri":
-                return f"<{value}>"
-            else:
-                return escape_string(value)
         
     results = result.convert()
     response_format = result._get_responseFormat()
 
     logger.info(f"Parsing {result._get_responseFormat()} into DataFrame")
     if response_format == "json" and isinstance(results, dict):
-        column_names: list[str] = []
-        for var in results["head"]["vars"]:
-            column_names.append(var)
-        df = pd.DataFrame(columns=column_names)
-    
-        values: list[list[Optional[str]]] = []
-        for r in results["results"]["bindings"]:
-            row: list[Optional[str]] = []
-            for col in results["head"]["vars"]:
-                if col in r:
-                    result_value = format_value(r[col])
-                else:
-                    result_value = None
-                row.append(result_value)
-            values.append(row)
-        df = pd.concat([df, pd.DataFrame(values, columns=df.columns)], ignore_index=True)
+        return json_to_df(results)
     elif response_format == "csv":
         # Convert bytes to str if needed
         if isinstance(results, bytes):
@@ -96,8 +92,214 @@ def to_df(result: Wrapper.QueryResult) -> pd.DataFrame:
     else:
         raise ValueError(f"Unsupported response format: {response_format}")
 
+
+def json_to_df(results: dict) -> pd.DataFrame:
+    """
+    :param results: A decoded SPARQL JSON result (see to_df).
+    :return: Dataframe
+    """
+    column_names: list[str] = []
+    for var in results["head"]["vars"]:
+        column_names.append(var)
+    df = pd.DataFrame(columns=column_names)
+
+    values: list[list[Optional[str]]] = []
+    for r in results["results"]["bindings"]:
+        row: list[Optional[str]] = []
+        for col in results["head"]["vars"]:
+            if col in r:
+                result_value = format_value(r[col])
+            else:
+                result_value = None
+            row.append(result_value)
+        values.append(row)
+    return pd.concat([df, pd.DataFrame(values, columns=df.columns)], ignore_index=True)
+
+def to_df_columnar(result: Wrapper.QueryResult) -> pd.DataFrame:
+    """
+    Parses a SPARQL TSV response with pandas' vectorized CSV reader and formats the values column-wise 
+    the same way as to_df does it cell by cell. If pyarrow is installed, the columns are Arrow strings and 
+    the string operations run in Arrow's compute kernels. Otherwise, NumPy object columns are used.
+    Unbound values are missing values (NA) instead of None. Blank nodes keep their N-Triples label (_:b0).
+
+    :param result: A result of a select query that was requested as TSV.
+    :return: Dataframe
+    """
+
+    response_format = result._get_responseFormat()
+    if response_format != "tsv":
+        raise ValueError(f"Unsupported response format for the columnar result: {response_format}")
+
+    logger.info(f"Parsing {response_format} into columnar DataFrame")
+    return format_tsv_df(read_tsv(result.response))
+
+
+def read_tsv(response: io.IOBase) -> pd.DataFrame:
+    """
+    Parses a SPARQL TSV response into a dataframe whose values are still in the TSV encoding (see to_df_columnar).
+    """
+    df = pd.read_csv(response, sep="\t", quoting=csv.QUOTE_NONE, 
+                     dtype="string[pyarrow]" if _ARROW_AVAILABLE else str,
+                     keep_default_na=False, na_values=[""], skip_blank_lines=False, engine="c")
+    df.columns = [col[1:] if col.startswith(("?", "$")) else col for col in df.columns]
+    return df
+
+
+def format_tsv_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Formats the TSV encoded values of the dataframe of read_tsv in place (see to_df_columnar).
+    """
+    for col in df.columns:
+        df[col] = _format_tsv_column(df[col])
     return df
 
+
+_XSD = "http://www.w3.org/2001/XMLSchema#"
+_TSV_ABBREVIATIONS = [
+    (r"[+-]?\d+", _XSD + "integer"),
+    (r"[+-]?\d*\.\d+", _XSD + "decimal"),
+    (r"[+-]?(?:\d+\.\d*|\.\d+|\d+)[eE][+-]?\d+", _XSD + "double"),
+    (r"true|false", _XSD + "boolean"),
+]
+_TSV_ESCAPES = [("\\t", "\t"), ("\\n", "\n"), ("\\r", "\r"), ("\\b", "\b"), ("\\f", "\f"), 
+                ('\\"', '"'), ("\\'", "'")]
+
+
+def _format_tsv_column(column: pd.Series) -> pd.Series:
+    """
+    Converts a column of values in the SPARQL TSV encoding (N-Triples syntax with abbreviated numbers and booleans)
+    into the representation of format_value. Only literal string operations are used, 
+    which are vectorized for Arrow strings.
+    """
+
+    formatted = column.copy()
+
+    # Abbreviated numeric and boolean literals. IRIs, quoted literals and blank nodes are never abbreviated.
+    candidates = column[column.notna() & ~column.str[0].isin(["<", '"', "_"])]
+    for pattern, datatype in _TSV_ABBREVIATIONS:
+        if candidates.empty:
+            break
+        matches = candidates.str.fullmatch(pattern, na=False)
+        formatted[matches[matches].index] = '"' + candidates[matches] + '"^^<' + datatype + '>'
+        candidates = candidates[~matches]
+
+    # Quoted literals
+    literals = column[column.str.startswith('"', na=False)]
+    if literals.empty:
+        return formatted
+
+    escaped = literals.str.contains("\\", regex=False)
+    if escaped.any():
+        # Escaped backslashes are restored last so that they cannot start another escape sequence.
+        unescaped = literals[escaped].str.replace("\\\\", "\x00", regex=False)
+        for sequence, char in _TSV_ESCAPES:
+            unescaped = unescaped.str.replace(sequence, char, regex=False)
+        literals = literals.copy()
+        literals[escaped] = unescaped.str.replace("\x00", "\\", regex=False)
+        formatted[literals.index] = literals
+
+    # Literals without language tag or datatype get the quotes that format_value selects.
+    plain = literals[literals.str.endswith('"')]
+    if not plain.empty:
+        value = plain.str.slice(1, -1)
+        double_quotes = value.str.contains('"', regex=False)
+        triple_quotes = value.str.contains("\n", regex=False) | value.str.contains("\r", regex=False) \
+            | (double_quotes & value.str.contains("'", regex=False))
+        formatted[plain.index] = plain \
+            .mask(double_quotes, "'" + value + "'") \
+            .mask(triple_quotes, '"""' + value + '"""')
+
+    return formatted
+
+
+def iter_results(result: Wrapper.QueryResult, chunk_size: int = 65536) -> Iterator[dict[str, Optional[str]]]:
+    """
+    Parses a SPARQL JSON or TSV response incrementally while it is read from the socket and yields one row 
+    after another. Only :chunk_size bytes of the response and the row that is currently parsed are held in memory. 
+    JSON values are formatted the same way as in to_df. TSV values are returned as they are encoded by the RDF-star 
+    store, i.e. in N-Triples syntax.
+
+    :param result: A result whose response has not been read yet.
+    :param chunk_size: The number of bytes that are read from the socket at once.
+    :return: An iterator over the rows. Each row maps the variable names to their values or None if a variable is unbound.
+    """
+
+    response_format = result._get_responseFormat()
+    response = result.response
+
+    try:
+        if response_format == "json":
+            yield from _iter_json_results(response, chunk_size)
+        elif response_format == "tsv":
+            yield from _iter_tsv_results(response)
+        else:
+            raise ValueError(f"Unsupported response format for streaming: {response_format}")
+    finally:
+        response.close()
+
+
+def _iter_json_results(response, chunk_size: int) -> Iterator[dict[str, Optional[str]]]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    json_decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+
+    def read_chunk() -> bool:
+        nonlocal buffer, eof
+        chunk = response.read(chunk_size)
+        eof = not chunk
+        buffer += decoder.decode(chunk, final=eof)
+        return not eof
+
+    # Header: the variables must precede the bindings.
+    while True:
+        vars_match = re.search(r'"vars"\s*:\s*(\[[^\]]*\])', buffer)
+        bindings_match = re.search(r'"bindings"\s*:\s*\[', buffer)
+        if vars_match and bindings_match:
+            break
+        if bindings_match and not vars_match:
+            raise ValueError("The SPARQL JSON response lists the bindings before the variables and cannot be streamed.")
+        if not read_chunk():
+            raise ValueError("The SPARQL JSON response does not contain any bindings.")
+    variables = json.loads(vars_match.group(1))
+    buffer = buffer[bindings_match.end():]
+
+    # Bindings: decode one binding object after another.
+    pos = 0
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer):
+                if buffer[pos] == "]":
+                    return
+                try:
+                    binding, pos = json_decoder.raw_decode(buffer, pos)
+                    break
+                except json.JSONDecodeError:
+                    pass
+            if eof:
+                raise ValueError("The SPARQL JSON response ended unexpectedly.")
+            buffer = buffer[pos:]
+            pos = 0
+            read_chunk()
+
+        yield {var: format_value(binding[var]) if var in binding else None for var in variables}
+
+
+def _iter_tsv_results(response) -> Iterator[dict[str, Optional[str]]]:
+    lines = io.TextIOWrapper(response, encoding="utf-8", newline="\n")
+    header = lines.readline().rstrip("\r\n")
+    if not header:
+        return
+    variables = [var[1:] for var in header.split("\t")]
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        values = line.split("\t")
+        yield {var: value if value != "" else None for var, value in zip(variables, values)}
+
+
 # For debugging purposes
 """
 def __pprintAlgebra(q):
@@ -0,0 +1,346 @@
+import os
+import logging
+import asyncio
+import threading
+import weakref
+from contextlib import contextmanager
+import urllib.error
+from datetime import datetime
+from typing import Iterable, Optional, Union
+import httpx
+import pandas as pd
+from SPARQLWrapper import Wrapper, JSON, TSV
+
+from ._prefixes import add_versioning_prefixes
+from .exceptions import RDFStarNotSupported, NoConnectionToRDFStore, WrongInputFormatException
+from .starvers import TripleStoreEngine, timestamp_query, timestamp_query_interval, _version_all_triples_statement, _snapshot_construct_query, \
+    _insert_statements, _update_statements, _outdate_statements, _delta_rows, _buffered_result, \
+    _probe_key, _is_probed, _remember_probe, _result_to_df
+from .instrumentation import Instrument, phase
+from .template_registry import get_templates
+from .cache import ResultCache, is_historical
+from .transport import BufferedResponse, raise_for_status, DEFAULT_POOL_SIZE, DEFAULT_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+_ACCEPT_HEADERS = {
+    JSON: "application/sparql-results+json",
+    TSV: "text/tab-separated-values",
+    "n3": "application/n-triples",
+}
+
+
+class AsyncHTTPTransport:
+    """
+    An httpx client with a keep-alive connection pool for the AsyncTripleStoreEngine.
+    Failed connection attempts are retried; responses are not.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES):
+        """
+        :param pool_size: The maximum number of open connections.
+        :param retries: The maximum number of retries if a connection cannot be established.
+        """
+
+        self.pool_size = pool_size
+        self.retries = retries
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.client = httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(limits=limits, retries=retries))
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+_async_transports: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPTransport] = weakref.WeakKeyDictionary()
+_async_transports_lock = threading.Lock()
+
+
+def get_async_transport() -> AsyncHTTPTransport:
+    """
+    :return: The shared transport of the running event loop. httpx clients cannot be shared across event loops.
+    """
+
+    loop = asyncio.get_running_loop()
+    with _async_transports_lock:
+        if loop not in _async_transports:
+            _async_transports[loop] = AsyncHTTPTransport()
+        return _async_transports[loop]
+
+
+async def configure_async_transport(pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES) -> AsyncHTTPTransport:
+    """
+    Replaces the shared transport of the running event loop by one with the given settings.
+    The connections of the previous transport are closed.
+    """
+
+    loop = asyncio.get_running_loop()
+    with _async_transports_lock:
+        previous = _async_transports.get(loop)
+        _async_transports[loop] = AsyncHTTPTransport(pool_size, retries)
+    if previous is not None:
+        await previous.aclose()
+    logger.info(f"Async HTTP transport configured with pool size {pool_size} and {retries} retries.")
+    return _async_transports[loop]
+
+
+class AsyncTripleStoreEngine:
+    """
+    The asyncio counterpart of TripleStoreEngine. Queries and updates are rewritten with the same functions
+    and templates as in TripleStoreEngine but sent with an async HTTP client, so that the event loop is not
+    blocked while the RDF-star store evaluates them.
+    """
+
+    def __init__(self, query_endpoint: str, update_endpoint: str, credentials: Optional[TripleStoreEngine.Credentials] = None,
+                 timeout: Optional[int] = None, mode: str = "decorator", transport: Optional[AsyncHTTPTransport] = None,
+                 result_cache: Optional[ResultCache] = None, instrument: Optional[Instrument] = None):
+        """
+        Unlike TripleStoreEngine, no connection test is executed during initialization. Await test_connection() instead.
+
+        :param query_endpoint: URL for executing read/select statements on the RDF-star store.
+        :param update_endpoint: URL for executing write statements on the RDF-star store.
+        :param credentials: The user name and password for the remote RDF-star store
+        :param timeout: The timeout of each HTTP request in seconds.
+        :param mode: 'decorator' or 'reification'
+        :param transport: The HTTP transport whose connection pool is used for all requests.
+        If None, the shared transport of the running event loop (see get_async_transport) is used.
+        :param result_cache: If given, the results of queries at timestamps in the past are cached (see starvers.cache.ResultCache). 
+        Writes through this engine invalidate the affected results.
+        :param instrument: See TripleStoreEngine. As responses are always read completely, 
+        the phase http_wait includes the download and reports the response bytes.
+        """
+
+        if mode == "decorator":
+            self._templates_dir = os.path.join(os.path.dirname(__file__), "templates") + "/decorator"
+        elif mode == "reification":
+            self._templates_dir = os.path.join(os.path.dirname(__file__), "templates") + "/reification"
+        else:
+            raise WrongInputFormatException("The provided mode {0} is not supported. Use 'decorator' or 'reification'.".format(mode))
+
+        self.query_endpoint = query_endpoint
+        self.update_endpoint = update_endpoint
+        self.credentials = credentials
+        self.timeout = timeout
+        self.mode = mode
+        self.transport = transport
+        self.result_cache = result_cache
+        self.instrument = instrument
+
+
+    @contextmanager
+    def _invalidates_result_cache(self, timestamp: Optional[datetime] = None):
+        """
+        See TripleStoreEngine._invalidates_result_cache.
+        """
+
+        since = timestamp or datetime.now().astimezone()
+        try:
+            yield
+        finally:
+            if self.result_cache is not None:
+                self.result_cache.invalidate(self.query_endpoint, since)
+
+
+    async def _post(self, url: str, data: dict[str, str], return_format: Optional[str] = None) -> BufferedResponse:
+        headers = {"Accept": _ACCEPT_HEADERS[return_format]} if return_format else {}
+        auth = httpx.DigestAuth(self.credentials.user_name, self.credentials.pw) if self.credentials else None
+        client = (self.transport or get_async_transport()).client
+
+        try:
+            response = await client.post(url, data=data, headers=headers, auth=auth, timeout=self.timeout)
+        except httpx.TimeoutException as e:
+            logger.error(f"A timeout error occurred during query execution. The timeout was {self.timeout}: {e}")
+            raise TimeoutError(str(e)) from e
+        except httpx.TransportError as e:
+            raise urllib.error.URLError(e) from e
+
+        raise_for_status(url, response.status_code, response.reason_phrase, response.headers, response.content)
+        return BufferedResponse(response.content, response.headers)
+
+
+    async def _execute_query(self, query: str, return_format: str) -> Wrapper.QueryResult:
+        with phase(self.instrument, "http_wait", request_bytes=len(query.encode("utf-8"))) as event:
+            response = await self._post(self.query_endpoint, {"query": query}, return_format)
+            event["response_bytes"] = len(response.getvalue())
+        return Wrapper.QueryResult((response, return_format))
+
+
+    async def _execute_update(self, update_statement: str, chunk_index: Optional[int] = None, rows: Optional[int] = None):
+        with phase(self.instrument, "update", request_bytes=len(update_statement.encode("utf-8")), 
+                   rows=rows, chunk_index=chunk_index):
+            await self._post(self.update_endpoint, {"update": update_statement})
+
+
+    async def test_connection(self):
+        """
+        Executes the same read and write statements as TripleStoreEngine does during its initialization.
+        Like there, the test is skipped if it has already succeeded for the same endpoints and mode (see configure_probe_cache).
+        """
+
+        probe_key = _probe_key(self.query_endpoint, self.update_endpoint, self.mode)
+        if _is_probed(probe_key):
+            logger.info("Connection to RDF-star query and update endpoints "
+                        "{0} and {1} has already been tested".format(self.query_endpoint, self.update_endpoint))
+            return
+
+        templates = get_templates(self._templates_dir)
+        try:
+            await self._execute_query(templates["test_connection/test_connection_select"].text, JSON)
+            await self._execute_update(templates["test_connection/test_connection_insert"].text)
+            await self._execute_update(templates["test_connection/test_connection_delete"].text)
+        except urllib.error.URLError:
+            raise NoConnectionToRDFStore("No connection to the RDF-star store could be established. "
+                                         "Check whether your RDF-star store is running.")
+
+        try:
+            test_prefixes = add_versioning_prefixes("", self.mode)
+            await self._execute_query(templates["test_connection/test_connection_timestamped_select"].format(test_prefixes), JSON)
+            await self._execute_update(templates["test_connection/test_connection_timestamped_insert"].format(test_prefixes))
+            await self._execute_update(templates["test_connection/test_connection_timestamped_delete"].format(test_prefixes))
+        except Exception:
+            raise RDFStarNotSupported("Your RDF-star store might not support the 'star' extension. "
+                                      "Make sure that it is a RDF* store.")
+
+        _remember_probe(probe_key)
+        logger.info("Connection to RDF-star query and update endpoints "
+                    "{0} and {1} established".format(self.query_endpoint, self.update_endpoint))
+
+
+    async def version_all_triples(self, initial_timestamp: Optional[datetime] = None):
+        """
+        See TripleStoreEngine.version_all_triples.
+        """
+
+        update_statement, version_timestamp = _version_all_triples_statement(self._templates_dir, self.mode, initial_timestamp)
+        with self._invalidates_result_cache(initial_timestamp):
+            await self._execute_update(update_statement)
+        logger.info("All rows have been annotated with start date {0} " \
+                    "and an artificial end date 9999-12-31T00:00:00.000+02:00".format(version_timestamp))
+
+
+    async def query(self, select_statement: str, timestamp: Optional[datetime] = None, yn_timestamp_query: bool = True,
+                    as_df: bool = True, latest: bool = False, result_format: str = "json", return_query: bool = False,
+                    optimize: bool = False, interval: Optional[tuple[datetime, datetime]] = None, 
+                    semantics: str = "overlaps", max_path_length: Optional[int] = None) -> Union[pd.DataFrame, Wrapper.QueryResult, tuple[Union[pd.DataFrame, Wrapper.QueryResult], str]]:
+        """
+        See TripleStoreEngine.query. The response is read completely before it is converted.
+        """
+
+        if result_format not in ["json", "arrow"]:
+            raise WrongInputFormatException("The provided result format {0} is not supported. Use 'json' or 'arrow'.".format(result_format))
+
+        cache_key, cached = None, None
+        if yn_timestamp_query and interval is not None:
+            if timestamp is not None or latest:
+                raise WrongInputFormatException("An interval cannot be combined with a timestamp or the latest version of the data.")
+            # The rewrite is CPU-bound and runs in a worker thread to keep the event loop responsive.
+            with phase(self.instrument, "rewrite"):
+                select_statement, start, end = await asyncio.to_thread(timestamp_query_interval, select_statement, interval[0],
+                                                                       interval[1], self.mode, semantics, optimize=optimize,
+                                                                       max_path_length=max_path_length)
+            logger.info("Timestamped query with interval {0} - {1} being executed:"
+                        " \n {2}".format(start, end, select_statement))
+            if self.result_cache is not None and is_historical(interval[1]):
+                cache_key = (self.query_endpoint, select_statement, interval[1], result_format)
+                cached = self.result_cache.get(*cache_key)
+        elif yn_timestamp_query:
+            select_statement, version_timestamp = await asyncio.to_thread(timestamp_query, query=select_statement,
+                                                                          version_timestamp=timestamp, mode=self.mode,
+                                                                          latest=latest, instrument=self.instrument,
+                                                                          optimize=optimize, max_path_length=max_path_length)
+            logger.info("Timestamped query with timestamp {0} being executed:"
+                        " \n {1}".format(version_timestamp, select_statement))
+            if self.result_cache is not None and is_historical(timestamp):
+                cache_key = (self.query_endpoint, select_statement, timestamp, result_format)
+                cached = self.result_cache.get(*cache_key)
+        else:
+            logger.info("Query being executed: \n {0}".format(select_statement))
+
+        return_format = TSV if result_format == "arrow" else JSON
+        if cached is not None:
+            logger.info("Retrieving results from the result cache ...")
+            result = _buffered_result(*cached, return_format)
+        else:
+            logger.info("Retrieving results ...")
+            try:
+                result = await self._execute_query(select_statement, return_format)
+                logger.info("Query executed successfully!")
+            except Exception as e:
+                logger.error(f"An error of type {type(e).__name__} occurred during query execution: {e}")
+                raise e
+            if cache_key is not None:
+                self.result_cache.put(*cache_key, result.response.getvalue(), result.info()["content-type"])
+
+        # The conversion is CPU-bound and runs in a worker thread to keep the event loop responsive.
+        if not as_df:
+            logger.info("Returning raw result ...")
+        elif result_format == "arrow":
+            logger.info("Converting results to columnar pandas dataframe ...")
+            result = await asyncio.to_thread(_result_to_df, result, result_format, self.instrument)
+        else:
+            logger.info("Converting results to pandas dataframe ...")
+            result = await asyncio.to_thread(_result_to_df, result, result_format, self.instrument)
+        return (result, select_statement) if return_query else result
+
+
+    async def retrieve_snapshot(self, timestamp: Optional[datetime] = None) -> str:
+        """
+        See TripleStoreEngine.retrieve_snapshot.
+        """
+
+        snapshot_construct_query = _snapshot_construct_query(self._templates_dir, timestamp)
+        logger.info("Snapshot construct query being executed: \n {0}".format(snapshot_construct_query))
+
+        logger.info("Retrieving results ...")
+        response = await self._post(self.query_endpoint, {"query": snapshot_construct_query}, "n3")
+        return response.getvalue().decode("utf-8")
+
+
+    async def insert(self, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str, str]] = None,
+                     timestamp: Optional[datetime] = None, chunk_size: int = 1000):
+        """
+        See TripleStoreEngine.insert. The chunks are inserted one after another.
+        """
+
+        with self._invalidates_result_cache(timestamp):
+            for i, chunk in enumerate(_insert_statements(self._templates_dir, self.mode, triples, prefixes, timestamp, chunk_size)):
+                await self._execute_update(chunk.statement, i, len(chunk.triples))
+        logger.info("Triples inserted.")
+
+
+    async def update(self, old_triples: list[list[str]], new_triples: list[list[str]], prefixes: Optional[dict[str,str]] = None,
+                     chunk_size: int = 1000):
+        """
+        See TripleStoreEngine.update. The chunks are updated one after another.
+        """
+
+        with self._invalidates_result_cache():
+            for i, chunk in enumerate(_update_statements(self._templates_dir, self.mode, old_triples, new_triples, prefixes, chunk_size)):
+                await self._execute_update(chunk.statement, i, len(chunk.triples))
+        logger.info("Triples updated.")
+
+
+    async def outdate(self, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str,str]] = None,
+                      timestamp: Optional[datetime] = None, chunk_size: int = 1000):
+        """
+        See TripleStoreEngine.outdate. The chunks are outdated one after another.
+        """
+
+        with self._invalidates_result_cache(timestamp):
+            for i, chunk in enumerate(_outdate_statements(self._templates_dir, self.mode, triples, prefixes, timestamp, chunk_size)):
+                await self._execute_update(chunk.statement, i, len(chunk.triples))
+        logger.info("Triples outdated.")
+
+
+    async def apply_delta(self, insertions: Union[Iterable[str], str, os.PathLike], deletions: Union[Iterable[str], str, os.PathLike], timestamp: Optional[datetime] = None,
+                          prefixes: Optional[dict[str, str]] = None, chunk_size: int = 1000):
+        """
+        See TripleStoreEngine.apply_delta. The chunks are applied one after another.
+        """
+
+        rows = _delta_rows(self._templates_dir, self.mode, insertions, deletions, prefixes, timestamp)
+        if rows is not None:
+            with self._invalidates_result_cache(timestamp):
+                for i, chunk in enumerate(rows.chunks(chunk_size)):
+                    await self._execute_update(chunk.statement, i, len(chunk.triples))
+        logger.info("Delta applied.")
@@ -0,0 +1,207 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+DEFAULT_MAX_SPILL_BYTES = 2**30
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+    spilled_entries: int
+    spilled_bytes: int
+
+
+class _Entry(NamedTuple):
+    endpoint: str
+    timestamp: datetime
+    content_type: str
+    size: int
+
+
+def _aware(timestamp: datetime) -> datetime:
+    # Naive timestamps are interpreted as local time like in versioning_timestamp_format.
+    return timestamp if timestamp.tzinfo is not None else timestamp.astimezone()
+
+
+def is_historical(timestamp: Optional[datetime]) -> bool:
+    """
+    :return: True if :timestamp lies in the past. Results of queries at the current time are never cached.
+    """
+
+    return timestamp is not None and _aware(timestamp) < datetime.now(timezone.utc)
+
+
+class ResultCache:
+    """
+    A cache for the raw responses of timestamped queries. The versioning only appends new valid_from values and closes
+    open intervals with the time of the write. A query that is evaluated at a timestamp in the past, therefore,
+    always returns the same result unless a later write uses an earlier timestamp.
+    Entries are keyed by the query endpoint, the rewritten query, the resolved timestamp and the result format.
+
+    Entries are kept in memory and evicted in least-recently-used order once they take more than :max_bytes.
+    If :spill_dir is given, evicted entries are moved into this directory instead, which holds up to :max_spill_bytes
+    and is evicted in least-recently-used order as well.
+
+    TripleStoreEngine and AsyncTripleStoreEngine invalidate all entries of their endpoint with a timestamp at or after
+    the timestamp of each write (see invalidate). Entries with timestamps before the last write are, therefore, permanent.
+    Writes by other processes are not noticed.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, spill_dir: Optional[str] = None,
+                 max_spill_bytes: int = DEFAULT_MAX_SPILL_BYTES):
+        """
+        :param max_bytes: The maximum size of all responses in memory.
+        :param spill_dir: A directory into which entries that are evicted from memory are written.
+        If None, evicted entries are dropped.
+        :param max_spill_bytes: The maximum size of all responses in :spill_dir.
+        """
+
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        self._memory: OrderedDict[str, tuple[_Entry, bytes]] = OrderedDict()
+        self._disk: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._spilled_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+
+    @staticmethod
+    def _key(endpoint: str, query: str, timestamp: datetime, result_format: str) -> str:
+        key = "\x00".join([endpoint, query, _aware(timestamp).isoformat(), result_format])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, key + ".bin")
+
+
+    def get(self, endpoint: str, query: str, timestamp: datetime, result_format: str) -> Optional[tuple[bytes, str]]:
+        """
+        :return: The response body and its content type or None if the query is not cached.
+        """
+
+        key = self._key(endpoint, query, timestamp, result_format)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                entry, content = self._memory[key]
+                return content, entry.content_type
+
+            if key not in self._disk:
+                self._misses += 1
+                return None
+
+            # Spilled entries are moved back into memory.
+            entry = self._disk.pop(key)
+            self._spilled_bytes -= entry.size
+            path = self._spill_path(key)
+            try:
+                with open(path, "rb") as f:
+                    content = f.read()
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"The spilled cache entry {path} could not be read: {e}")
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._store(key, entry, content)
+            return content, entry.content_type
+
+
+    def put(self, endpoint: str, query: str, timestamp: datetime, result_format: str, content: bytes, content_type: str):
+        """
+        Caches the response body :content of :query evaluated at :timestamp. Responses that are larger than
+        the whole cache are not cached.
+        """
+
+        if len(content) > max(self.max_bytes, self.max_spill_bytes if self.spill_dir else 0):
+            return
+
+        key = self._key(endpoint, query, timestamp, result_format)
+        entry = _Entry(endpoint, _aware(timestamp), content_type, len(content))
+        with self._lock:
+            self._remove(key)
+            self._store(key, entry, content)
+
+
+    def invalidate(self, endpoint: str, since: datetime):
+        """
+        Removes all entries of :endpoint whose timestamp is at or after :since,
+        i.e. all results that a write with the timestamp :since might have changed.
+        """
+
+        since = _aware(since)
+        with self._lock:
+            keys = [key for key, (entry, _) in self._memory.items() if entry.endpoint == endpoint and entry.timestamp >= since]
+            keys += [key for key, entry in self._disk.items() if entry.endpoint == endpoint and entry.timestamp >= since]
+            for key in keys:
+                self._remove(key)
+        if keys:
+            logger.info("{0} cached results of {1} invalidated.".format(len(keys), endpoint))
+
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._memory) + list(self._disk):
+                self._remove(key)
+            self._hits = 0
+            self._misses = 0
+
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._memory), self._bytes, len(self._disk), self._spilled_bytes)
+
+
+    def _store(self, key: str, entry: _Entry, content: bytes):
+        self._memory[key] = (entry, content)
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes:
+            evicted_key, (evicted, evicted_content) = self._memory.popitem(last=False)
+            self._bytes -= evicted.size
+            if self.spill_dir is not None and evicted.size <= self.max_spill_bytes:
+                self._spill(evicted_key, evicted, evicted_content)
+
+
+    def _spill(self, key: str, entry: _Entry, content: bytes):
+        while self._disk and self._spilled_bytes + entry.size > self.max_spill_bytes:
+            self._remove(next(iter(self._disk)))
+        try:
+            with open(self._spill_path(key), "wb") as f:
+                f.write(content)
+        except OSError as e:
+            logger.warning(f"The cache entry could not be spilled to {self.spill_dir}: {e}")
+            return
+        self._disk[key] = entry
+        self._spilled_bytes += entry.size
+
+
+    def _remove(self, key: str):
+        if key in self._memory:
+            entry, _ = self._memory.pop(key)
+            self._bytes -= entry.size
+        if key in self._disk:
+            entry = self._disk.pop(key)
+            self._spilled_bytes -= entry.size
+            try:
+                os.remove(self._spill_path(key))
+            except OSError:
+                pass
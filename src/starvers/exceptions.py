@@ -17,4 +17,19 @@ class InputMissing(Exception):
     pass
 
 class ReservedPrefixError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class ChunkSubmissionError(Exception):
+    def __init__(self, failed_chunks: dict[int, Exception]):
+        """
+        Raised after a concurrent chunk submission if at least one chunk failed.
+
+        :param failed_chunks: The index of each failed chunk mapped to its exception.
+        """
+
+        self.failed_chunks = failed_chunks
+        super().__init__("{0} chunk(s) failed: {1}".format(
+            len(failed_chunks), ", ".join(f"chunk {i}: {e}" for i, e in sorted(failed_chunks.items()))))
+
+class BulkImportFailed(Exception):
+    pass
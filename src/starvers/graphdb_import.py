@@ -0,0 +1,72 @@
+import time
+import logging
+from typing import Optional
+import requests
+from requests.auth import AuthBase
+
+from .exceptions import BulkImportFailed
+from .transport import get_transport
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds that an import may take from its start until GraphDB reports it as done
+DEFAULT_IMPORT_TIMEOUT = 3600
+
+
+def start_server_file_import(rest_url: str, repository: str, file_name: str, context: str = "", replace_graphs: Optional[list[str]] = None,
+                             session: Optional[requests.Session] = None, auth: Optional[AuthBase] = None, timeout: Optional[float] = None):
+    """
+    Starts the import of a file from GraphDB's server import directory (graphdb.workbench.importDirectory).
+
+    :param rest_url: The URL of GraphDB's REST API, e.g. http://localhost:7200/rest.
+    :param repository: The name of the repository.
+    :param file_name: The name of the file within the server import directory.
+    :param context: The named graph into which the file is imported. The default graph if empty.
+    :param replace_graphs: The graphs that are cleared before the import.
+    :param session: The session that sends the request. The shared transport of starvers by default.
+    :param auth: The authentication of the request.
+    :param timeout: The timeout of the request in seconds.
+    :raises BulkImportFailed: If GraphDB rejects the import.
+    """
+
+    session = session or get_transport().session
+    payload = {"fileNames": [file_name], "importSettings": {"name": file_name, "context": context, "replaceGraphs": replace_graphs or []}}
+
+    logger.info("Importing server file {0} into the repository {1}.".format(file_name, repository))
+    response = session.post(f"{rest_url}/repositories/{repository}/import/server", json=payload, auth=auth, timeout=timeout)
+    if response.status_code != 202:
+        raise BulkImportFailed("GraphDB rejected the import of {0}: {1}".format(file_name, response.text))
+
+
+def await_server_file_import(rest_url: str, repository: str, file_name: str, session: Optional[requests.Session] = None,
+                             auth: Optional[AuthBase] = None, timeout: Optional[float] = None, poll_interval: float = 1.0,
+                             import_timeout: Optional[float] = DEFAULT_IMPORT_TIMEOUT):
+    """
+    Polls the status of an import that was started with start_server_file_import until GraphDB reports it as done.
+
+    :param poll_interval: The number of seconds between two requests for the status of the import.
+    :param import_timeout: The number of seconds after which the import is given up. None to wait without a deadline.
+    For the other parameters, see start_server_file_import.
+    :raises BulkImportFailed: If the import is not found, GraphDB reports an error or the import is not done
+    within :import_timeout seconds.
+    """
+
+    session = session or get_transport().session
+    deadline = None if import_timeout is None else time.monotonic() + import_timeout
+
+    while True:
+        response = session.get(f"{rest_url}/repositories/{repository}/import/server", auth=auth, timeout=timeout)
+        response.raise_for_status()
+        task = next((t for t in response.json() if t["name"] == file_name), None)
+        if task is None:
+            raise BulkImportFailed("The import of {0} was not found.".format(file_name))
+        if task["status"] == "DONE":
+            logger.info("The import of {0} is done.".format(file_name))
+            return
+        if task["status"] == "ERROR":
+            raise BulkImportFailed("The import of {0} failed: {1}".format(file_name, task.get("message")))
+        if deadline is not None and time.monotonic() + poll_interval > deadline:
+            raise BulkImportFailed("The import of {0} was not done after {1} seconds. Its last status was {2}.".format(
+                file_name, import_timeout, task["status"]))
+        time.sleep(poll_interval)
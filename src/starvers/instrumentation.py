@@ -0,0 +1,99 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# The phases that TripleStoreEngine, AsyncTripleStoreEngine and timestamp_query report:
+#   rewrite   : rewriting a query into a timestamped query (timestamp_query, timestamp_query_at, timestamp_query_delta)
+#   http_wait : sending a request until the response headers arrived (the whole response for AsyncTripleStoreEngine)
+#   download  : reading the response body of a query
+#   decode    : parsing the JSON or TSV response
+#   to_df     : formatting the parsed response into a dataframe
+#   update    : sending one update chunk and waiting for its response
+PHASES = ("rewrite", "http_wait", "download", "decode", "to_df", "update")
+
+
+class PhaseEvent(NamedTuple):
+    phase: str
+    duration: float
+    request_bytes: Optional[int] = None
+    response_bytes: Optional[int] = None
+    rows: Optional[int] = None
+    chunk_index: Optional[int] = None
+
+
+Instrument = Callable[[PhaseEvent], None]
+
+
+@contextmanager
+def phase(instrument: Optional[Instrument], name: str, **fields) -> Iterator[dict]:
+    """
+    Times the enclosed block and reports it as the phase :name to :instrument. Fields of PhaseEvent
+    that are only known at the end of the block can be set in the yielded dictionary.
+    If :instrument is None, nothing is timed or reported.
+
+    Example:
+        with phase(collector, "download") as event:
+            content = response.read()
+            event["response_bytes"] = len(content)
+    """
+
+    if instrument is None:
+        yield fields
+        return
+    start = time.perf_counter()
+    yield fields
+    instrument(PhaseEvent(name, time.perf_counter() - start, **fields))
+
+
+class PercentileCollector:
+    """
+    An instrument that keeps all reported phase events and aggregates them per phase.
+    It can be passed to any number of engines and is safe to use from several threads.
+    """
+
+    def __init__(self):
+        self._events: list[PhaseEvent] = []
+        self._lock = threading.Lock()
+
+
+    def __call__(self, event: PhaseEvent):
+        with self._lock:
+            self._events.append(event)
+
+
+    def events(self) -> list[PhaseEvent]:
+        with self._lock:
+            return list(self._events)
+
+
+    def reset(self):
+        with self._lock:
+            self._events.clear()
+
+
+    def summary(self, percentiles: Sequence[float] = (50, 90, 95, 99)) -> pd.DataFrame:
+        """
+        :param percentiles: The percentiles of the durations that are computed per phase.
+        :return: A dataframe with one row per phase and the columns count, total, mean, p<percentile> (in seconds)
+        and the sums of the request bytes, response bytes and rows.
+        """
+
+        events = self.events()
+        columns = ["phase", "count", "total", "mean"] + ["p{0:g}".format(p) for p in percentiles] \
+            + ["request_bytes", "response_bytes", "rows"]
+        if not events:
+            return pd.DataFrame(columns=columns)
+
+        df = pd.DataFrame(events, columns=PhaseEvent._fields)
+        records = []
+        for name, group in df.groupby("phase", sort=False):
+            durations = group["duration"].to_numpy()
+            records.append([name, len(durations), durations.sum(), durations.mean()]
+                           + list(np.percentile(durations, percentiles))
+                           + [group[col].sum(min_count=1) for col in ["request_bytes", "response_bytes", "rows"]])
+        return pd.DataFrame(records, columns=columns)
@@ -1,18 +1,38 @@
-from ._helper import versioning_timestamp_format, to_df
+from ._helper import versioning_timestamp_format, to_df, to_df_columnar, iter_results, json_to_df, read_tsv, format_tsv_df
 from ._prefixes import add_versioning_prefixes, split_prefixes_query
+from ._bgp_parser import BGPSelectQuery, parse_bgp_select
+from .transport import HTTPTransport, PooledSPARQLWrapper, BufferedResponse, get_transport
+from .cache import ResultCache, is_historical
+from .instrumentation import Instrument, phase
+from .template_registry import get_templates
+from .graphdb_import import start_server_file_import, await_server_file_import, DEFAULT_IMPORT_TIMEOUT
 from .exceptions import RDFStarNotSupported, NoConnectionToRDFStore, \
-WrongInputFormatException, ExpressionNotCoveredException
+WrongInputFormatException, ExpressionNotCoveredException, InputMissing, ChunkSubmissionError, BulkImportFailed
     
-from urllib.error import URLError
-from SPARQLWrapper import Wrapper, SPARQLWrapper, POST, DIGEST, GET, JSON
+from urllib.error import URLError, HTTPError
+import uuid
+import json
+from requests.auth import HTTPDigestAuth
+from SPARQLWrapper import Wrapper, POST, DIGEST, GET, JSON, TSV
 import pandas as pd
 import os
+import re
+import io
+import gzip
+import shutil
+from functools import lru_cache
+from contextlib import contextmanager
 from datetime import datetime
 import logging
 import time
+import threading
 from zoneinfo import ZoneInfo
 from typing import Optional
 from typing import Union
+from typing import Iterator, Iterable, NamedTuple, Callable, BinaryIO, Sequence
+from itertools import islice, chain
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
 import rdflib
 from rdflib.term import Variable, Identifier, URIRef
 from rdflib.plugins.sparql.parserutils import CompValue
@@ -24,18 +44,600 @@ logger = logging.getLogger(__name__)
 
 
 
-def timestamp_query(query: str, version_timestamp: Optional[datetime] = None, mode: str = "decorator") -> Union[str, str]:
+# Placeholder for the timestamp in cached query templates. It is substituted with the
+# formatted version timestamp on every call of timestamp_query.
+_TIMESTAMP_PLACEHOLDER = "__STARVERS_VERSION_TIMESTAMP__"
+_REWRITE_CACHE_SIZE = 256
+
+
+def _normalize_query(query: str) -> str:
+    """
+    Collapses whitespace outside of IRIs and string literals so that queries which only differ
+    in their formatting share the same cache entry. Line breaks are kept because they terminate comments.
+
+    :param query: A SPARQL query string.
+    :return: The normalized query string.
+    """
+
+    pattern = r'("""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|<[^<>\s]*>)|\s+'
+
+    def collapse(match: re.Match) -> str:
+        if match.group(1):
+            return match.group(1)
+        return "\n" if "\n" in match.group(0) else " "
+
+    return re.sub(pattern, collapse, query).strip()
+
+
+def timestamp_query(query: str, version_timestamp: Optional[datetime] = None, mode: str = "decorator", fast_path: bool = True,
+                    latest: bool = False, instrument: Optional[Instrument] = None, optimize: bool = False,
+                    max_path_length: Optional[int] = None) -> Union[str, str]:
     """
     Binds a q_handler timestamp to the variable ?TimeOfExecution and wraps it around the query. Also extends
     the query with a code snippet that ensures that a snapshot of the data as of q_handler
     time gets returned when the query is executed. Optionally, but recommended, the order by clause
     is attached to the query to ensure a unique sort of the data.
 
+    The rewritten query is cached with a placeholder for the timestamp (see rewrite_cache_info and 
+    clear_rewrite_cache). Repeated calls with the same query and mode only substitute the timestamp.
+
     :param query:
     :param version_timestamp:
+    :param fast_path: If true, select queries that consist of a single basic graph pattern and no other graph patterns,
+    paths, subqueries or (NOT) EXISTS are rewritten without the round trip through the rdflib query algebra. 
+    All other queries are rewritten via the query algebra.
+    :param latest: If true, the query retrieves the current version of the data by matching the valid_until timestamp 
+    with the artificial end date 9999-12-31T00:00:00.000+02:00 of currently valid triples instead of filtering 
+    the valid_from and valid_until timestamps with the execution timestamp. :version_timestamp must not be provided.
+    :param instrument: If given, the duration of the rewrite is reported to it as the phase 'rewrite' (see starvers.instrumentation).
+    :param optimize: If true, the versioned triple statements of each basic graph pattern are optimized (see _versioning_block): 
+    identical triple statements are versioned once, the timestamp is inserted as a constant instead of being bound 
+    in every basic graph pattern and the validity filters are grouped into one filter after the triple statements.
+    :param max_path_length: The maximum number of steps of the property paths p+ and p*. The paths p*, p+, p?, 
+    alternative paths and negated property sets are rewritten into unions of versioned triple statements (see _PathExpander). 
+    p+ and p* are unrolled up to :max_path_length steps, so matches that need more steps are NOT returned. 
+    Queries with p+ or p* are only rewritten if :max_path_length is provided; otherwise ExpressionNotCoveredException is raised.
     :return: A query string extended with the given timestamp
     """
 
+    if mode not in ["decorator", "reification"]:
+        raise WrongInputFormatException("The provided mode {0} is not supported. Use 'decorator' or 'reification'.".format(mode))
+    if latest and version_timestamp is not None:
+        raise WrongInputFormatException("A version timestamp cannot be provided for the latest version of the data.")
+    if max_path_length is not None and max_path_length < 1:
+        raise WrongInputFormatException("The maximum path length must be at least 1.")
+
+    if version_timestamp is None:
+        timestamp = _execution_timestamp()
+    else:
+        timestamp = versioning_timestamp_format(version_timestamp)  
+
+    logger.info("Creating timestamped query ...")
+    if instrument is None:
+        query_template = _timestamp_query_template(_normalize_query(query), mode, fast_path, latest, optimize, max_path_length)
+        return query_template.replace(_TIMESTAMP_PLACEHOLDER, timestamp), timestamp
+    with phase(instrument, "rewrite"):
+        query_template = _timestamp_query_template(_normalize_query(query), mode, fast_path, latest, optimize, max_path_length)
+        timestamped_query = query_template.replace(_TIMESTAMP_PLACEHOLDER, timestamp)
+
+    return timestamped_query, timestamp
+
+
+def _execution_timestamp() -> str:
+    tz_name = time.tzname[time.localtime().tm_isdst]  # standard or DST name
+    local_tz = ZoneInfo(tz_name)
+    return versioning_timestamp_format(datetime.now(local_tz))
+
+
+class TimestampedQuery(NamedTuple):
+    query: str
+    timestamp: str
+    # Seconds spent on this query: the rewrite of its query text (only for the first query with this text) 
+    # plus binding the timestamp
+    rewriting_time: float
+    # True if the query text was already rewritten for an earlier query of the batch
+    reused: bool
+
+
+def _rewrite_query_template(args: tuple[str, str, bool, bool, Optional[int]]) -> tuple[str, float]:
+    # Runs in the worker processes of timestamp_query_many.
+    query, mode, fast_path, optimize, max_path_length = args
+    start = time.perf_counter()
+    query_template = _timestamp_query_template(query, mode, fast_path, False, optimize, max_path_length)
+    return query_template, time.perf_counter() - start
+
+
+def timestamp_query_many(queries: Sequence[str], timestamps: Union[datetime, Sequence[Optional[datetime]], None] = None, 
+                         mode: str = "decorator", workers: Optional[int] = None, fast_path: bool = True, 
+                         optimize: bool = False, max_path_length: Optional[int] = None) -> list[TimestampedQuery]:
+    """
+    Rewrites a batch of queries like timestamp_query. Each distinct query text (after normalizing its whitespace) 
+    is rewritten once, the rewrites of different texts are spread over :workers processes, 
+    and each query is then bound to its timestamp.
+
+    :param queries: The SPARQL select queries.
+    :param timestamps: One timestamp per query or a single timestamp for all queries. If None or for queries 
+    whose timestamp is None, the current time is used like in timestamp_query.
+    :param workers: The number of processes. If None, the number of CPUs is used. With one worker or a single distinct
+    query text, the queries are rewritten in the calling process.
+    :param max_path_length: See timestamp_query.
+    :return: One TimestampedQuery per query in the order of :queries.
+    """
+
+    if mode not in ["decorator", "reification"]:
+        raise WrongInputFormatException("The provided mode {0} is not supported. Use 'decorator' or 'reification'.".format(mode))
+    if timestamps is None or isinstance(timestamps, datetime):
+        timestamps = [timestamps] * len(queries)
+    elif len(timestamps) != len(queries):
+        raise WrongInputFormatException("One timestamp per query or a single timestamp must be provided "
+                                        "but there are {0} queries and {1} timestamps.".format(len(queries), len(timestamps)))
+
+    normalized_queries = [_normalize_query(query) for query in queries]
+    distinct_queries = list(dict.fromkeys(normalized_queries))
+    workers = min(workers or os.cpu_count() or 1, len(distinct_queries))
+
+    logger.info("Rewriting {0} queries with {1} distinct query texts in {2} processes ...".format(
+        len(queries), len(distinct_queries), max(workers, 1)))
+    jobs = [(query, mode, fast_path, optimize, max_path_length) for query in distinct_queries]
+    if workers <= 1:
+        rewrites = [_rewrite_query_template(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rewrites = list(executor.map(_rewrite_query_template, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    query_templates = dict(zip(distinct_queries, rewrites))
+
+    current_timestamp = None
+    rewritten = set()
+    timestamped_queries = []
+    for query, version_timestamp in zip(normalized_queries, timestamps):
+        start = time.perf_counter()
+        if version_timestamp is not None:
+            timestamp = versioning_timestamp_format(version_timestamp)
+        else:
+            current_timestamp = current_timestamp or _execution_timestamp()
+            timestamp = current_timestamp
+        query_template, rewriting_time = query_templates[query]
+        timestamped_query = query_template.replace(_TIMESTAMP_PLACEHOLDER, timestamp)
+        reused = query in rewritten
+        rewritten.add(query)
+        rewriting_time = (0.0 if reused else rewriting_time) + time.perf_counter() - start
+        timestamped_queries.append(TimestampedQuery(timestamped_query, timestamp, rewriting_time, reused))
+
+    return timestamped_queries
+
+
+def timestamp_query_at(query: str, version_timestamps: list[datetime], mode: str = "decorator", fast_path: bool = True) -> tuple[str, list[str]]:
+    """
+    Creates one timestamped query that evaluates :query at every timestamp in :version_timestamps. Instead of 
+    binding one timestamp per basic graph pattern, all timestamps are bound to the variable ?ts 
+    via a VALUES block and ?ts is added to the projection. The result set therefore contains the snapshot results 
+    of all timestamps, each row labeled with its timestamp. ORDER BY applies to the combined result set.
+
+    Queries with subqueries or aggregates are not supported because ?ts would need to be projected
+    and grouped in each of them. Queries with LIMIT or OFFSET are not supported because they would
+    limit the combined result set instead of the results at each timestamp.
+
+    :param query: A SPARQL select query. It must not use the variable ?ts.
+    :param version_timestamps: The timestamps at which the query should be evaluated.
+    :return: A tuple with the timestamped query as the first element and the formatted timestamps as the second element.
+    """
+
+    if len(version_timestamps) == 0:
+        raise InputMissing("At least one timestamp must be provided.")
+    if re.search(r"[?$]ts\b", query):
+        raise WrongInputFormatException("The variable ?ts is reserved for the version timestamps. Please choose another one.")
+
+    timestamped_query = _timestamp_query_template(_normalize_query(query), mode, fast_path)
+
+    select_clauses = re.findall(r"\bSELECT\b", timestamped_query)
+    aggregates = re.search(r"\b(COUNT|SUM|MIN|MAX|AVG|SAMPLE|GROUP_CONCAT)\s*\(|\bGROUP BY\b", timestamped_query)
+    if len(select_clauses) != 1 or aggregates:
+        raise ExpressionNotCoveredException("Queries with subqueries or aggregates cannot be evaluated "
+                                            "at multiple timestamps in one query.")
+    # LIMIT and OFFSET are the last solution modifiers of the query. With OFFSET only, rdflib writes LIMIT None.
+    if re.search(r"\b(LIMIT|OFFSET)\s+(\d+|None)\s*$", timestamped_query):
+        raise ExpressionNotCoveredException("Queries with LIMIT or OFFSET cannot be evaluated "
+                                            "at multiple timestamps in one query.")
+
+    timestamps = [versioning_timestamp_format(ts) for ts in version_timestamps]
+    values_block = 'values ?ts {{ {0} }}'.format(" ".join('"{0}"^^xsd:dateTime'.format(ts) for ts in timestamps))
+    timestamped_query = re.sub(r'bind\("{0}"\^\^xsd:dateTime as \?tsBGP_\d+\)'.format(_TIMESTAMP_PLACEHOLDER),
+                               lambda _: values_block, timestamped_query)
+    timestamped_query = re.sub(r"\?tsBGP_\d+\b", "?ts", timestamped_query)
+    timestamped_query = re.sub(r"\bSELECT( DISTINCT| REDUCED)? ", r"SELECT\1 ?ts ", timestamped_query, count=1)
+
+    return timestamped_query, timestamps
+
+
+def timestamp_query_delta(query: str, version_timestamp_1: datetime, version_timestamp_2: datetime, mode: str = "decorator",
+                          fast_path: bool = True) -> tuple[str, str, str]:
+    """
+    Creates one query that returns only those solutions of :query which differ between the snapshots 
+    as of :version_timestamp_1 and :version_timestamp_2. The query is timestamped with both timestamps and 
+    each of the two timestamped queries is embedded as a subquery. The solutions of both subqueries are grouped 
+    by the projected variables and only groups that stem from one of the subqueries are returned. 
+    The variable ?change marks each solution as 'added' (only in the snapshot as of :version_timestamp_2) or 
+    'removed' (only in the snapshot as of :version_timestamp_1). Solutions are compared as a set, i.e. 
+    duplicates are not taken into account.
+
+    :param query: A SPARQL select query. It must not use the variables ?change and ?delta_change.
+    :return: A tuple with the delta query as the first element and the two formatted timestamps as the second and third element.
+    """
+
+    if re.search(r"[?$](change|delta_change)\b", query):
+        raise WrongInputFormatException("The variables ?change and ?delta_change are reserved for the delta query. "
+                                        "Please choose other ones.")
+
+    query_template = _timestamp_query_template(_normalize_query(query), mode, fast_path)
+    prefixes, query_template = split_prefixes_query(query_template)
+    projection = _projection_variables(query_template)
+
+    timestamp_1 = versioning_timestamp_format(version_timestamp_1)
+    timestamp_2 = versioning_timestamp_format(version_timestamp_2)
+    subquery_1 = query_template.replace(_TIMESTAMP_PLACEHOLDER, timestamp_1)
+    # The same blank node label must not be used in two basic graph patterns of one query.
+    subquery_2 = re.sub(r"(_:b\d+)\b", r"\1_2", query_template).replace(_TIMESTAMP_PLACEHOLDER, timestamp_2)
+
+    projection_n3 = " ".join(projection)
+    delta_query = prefixes + "\n" \
+        + "SELECT {0} (SAMPLE(?delta_change) AS ?change) WHERE {{\n".format(projection_n3) \
+        + "{{ {{ {0} }} BIND(\"removed\" AS ?delta_change) }}\n".format(subquery_1) \
+        + "UNION\n" \
+        + "{{ {{ {0} }} BIND(\"added\" AS ?delta_change) }}\n".format(subquery_2) \
+        + "}}\nGROUP BY {0}\nHAVING (COUNT(DISTINCT ?delta_change) = 1)".format(projection_n3)
+
+    return delta_query, timestamp_1, timestamp_2
+
+
+def timestamp_query_interval(query: str, start: datetime, end: datetime, mode: str = "decorator", semantics: str = "overlaps",
+                             fast_path: bool = True, optimize: bool = False, max_path_length: Optional[int] = None) -> tuple[str, str, str]:
+    """
+    Creates one timestamped query that evaluates :query over all versions of the data between :start and :end 
+    instead of a single snapshot. The point-in-time filters of the timestamped query are replaced by 
+    interval filters on the valid_from and valid_until timestamps of each triple statement:
+
+    - 'overlaps': The triple was valid at any point in time between :start and :end, 
+      i.e. valid_from <= :end and :start < valid_until. This includes short-lived triples that were inserted 
+      and outdated between two snapshots.
+    - 'during': The triple was inserted and outdated between :start and :end, 
+      i.e. :start <= valid_from and valid_until <= :end. Triples that are still valid are not returned.
+
+    The triple statements of one solution are filtered independently, so they need not have been valid 
+    at the same point in time.
+
+    :param query: A SPARQL select query.
+    :param start: The start of the time range.
+    :param end: The end of the time range. It must not be earlier than :start.
+    :param semantics: 'overlaps' or 'during'.
+    :param optimize: See timestamp_query.
+    :param max_path_length: See timestamp_query.
+    :return: A tuple with the timestamped query as the first element and the two formatted timestamps as the second and third element.
+    """
+
+    if semantics not in ["overlaps", "during"]:
+        raise WrongInputFormatException("The provided interval semantics {0} is not supported. Use 'overlaps' or 'during'.".format(semantics))
+    if end < start:
+        raise WrongInputFormatException("The end of the interval must not be earlier than its start.")
+
+    query_template = _timestamp_query_template(_normalize_query(query), mode, fast_path, False, optimize, max_path_length)
+
+    timestamp_start = versioning_timestamp_format(start)
+    timestamp_end = versioning_timestamp_format(end)
+    start_n3 = '"{0}"^^xsd:dateTime'.format(timestamp_start)
+    end_n3 = '"{0}"^^xsd:dateTime'.format(timestamp_end)
+    if semantics == "overlaps":
+        condition = r"\1 <= {0} && {1} < \3".format(end_n3, start_n3)
+    else:
+        condition = r"{0} <= \1 && \3 <= {1}".format(start_n3, end_n3)
+
+    # The point-in-time filter of each triple statement (see _versioning_block) compares the timestamp 
+    # bound to ?tsBGP_<n> or, if optimized, the timestamp constant with valid_from and valid_until.
+    timestamp = r'(?:\?tsBGP_\d+|"{0}"\^\^xsd:dateTime)'.format(_TIMESTAMP_PLACEHOLDER)
+    interval_query = re.sub(r"(\?valid_from_\d+) <= ({0}) && \2 < (\?valid_until_\d+)".format(timestamp),
+                            lambda m: m.expand(condition), query_template)
+    interval_query = re.sub(r'bind\("{0}"\^\^xsd:dateTime as \?tsBGP_\d+\)'.format(_TIMESTAMP_PLACEHOLDER), "", interval_query)
+
+    return interval_query, timestamp_start, timestamp_end
+
+
+def _projection_variables(query: str) -> list[str]:
+    """
+    Extracts the names of the projected variables from the outermost select clause of a query
+    that was created by algebra.translateAlgebra or _timestamp_bgp_query_template, e.g.
+    'SELECT DISTINCT ?a (COUNT(?b) as ?c){' yields ['?a', '?c'].
+    """
+
+    select_clause = re.search(r"\bSELECT\b(.*?)\{", query, re.DOTALL)
+    if select_clause is None:
+        raise WrongInputFormatException("Only select queries are supported.")
+
+    variables = []
+    depth = 0
+    tokens = re.findall(r"\(|\)|[?$]\w+|\w+", select_clause.group(1))
+    for i, token in enumerate(tokens):
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif token[0] in "?$":
+            if depth == 0 or (depth == 1 and tokens[i - 1].upper() == "AS"):
+                variables.append("?" + token[1:])
+    return variables
+
+
+def rewrite_cache_info():
+    """
+    :return: Hits, misses, maximum and current size of the cache used by timestamp_query.
+    """
+
+    return _timestamp_query_template.cache_info()
+
+
+def clear_rewrite_cache():
+    """
+    Removes all cached query templates and resets the hit and miss counters.
+    """
+
+    _timestamp_query_template.cache_clear()
+
+
+def _versioning_block(triples: list, bgp_identifier: str, triple_stmts_cnt: int, mode: str, templates_dir: str,
+                      latest: bool = False, optimize: bool = False) -> tuple[str, int]:
+    """
+    Creates the block of timestamped triple statements for the triples of one basic graph pattern.
+    If :latest is true, the triple statements match the artificial end date of currently valid triples
+    and no timestamp is bound.
+
+    If :optimize is true, the block is built by the optimization stage of the rewrite: identical triples are 
+    versioned only once, all triple statements come first and their validity filters are grouped 
+    into one filter after them, which compares the valid_from and valid_until timestamps with 
+    the timestamp constant instead of the variable ?tsBGP_<n>. Each timestamped query therefore contains 
+    the timestamp once per triple statement but binds no variable to it.
+
+    :param triples: The triples of the basic graph pattern.
+    :param bgp_identifier: The identifier of the basic graph pattern, e.g. BGP_0.
+    :param triple_stmts_cnt: The number of triple statements that were already versioned in this query.
+    :return: A tuple with the versioning block as the first element and the updated triple statement count as the second element.
+    """
+
+    if optimize:
+        return _optimized_versioning_block(triples, triple_stmts_cnt, templates_dir, latest)
+
+    if latest:
+        ver_block_template = get_templates(templates_dir)["versioning_query_extensions_latest"]
+    else:
+        ver_block_template = get_templates(templates_dir)["versioning_query_extensions"]
+
+    ver_block = []
+    for triple in triples:
+        triple_stmts_cnt = triple_stmts_cnt + 1
+        cnt = str(triple_stmts_cnt)
+        triple_n3 = triple[0].n3() + " " + triple[1].n3() + " " + triple[2].n3()
+        # The decorator templates have no placeholder {4} for the blank node of the reification.
+        ver_block.append(ver_block_template.format(triple_n3, "?valid_from_" + cnt, "?valid_until_" + cnt, bgp_identifier, cnt))
+    if not latest:
+        ver_block.append('bind("{0}"^^xsd:dateTime as ?ts{1})'.format(_TIMESTAMP_PLACEHOLDER, bgp_identifier))
+
+    return "".join(ver_block), triple_stmts_cnt
+
+
+def _optimized_versioning_block(triples: list, triple_stmts_cnt: int, templates_dir: str, latest: bool = False) -> tuple[str, int]:
+    """
+    See _versioning_block with :optimize set to true.
+    """
+
+    if latest:
+        ver_block_template = get_templates(templates_dir)["versioning_query_extensions_latest"]
+    else:
+        ver_block_template = get_templates(templates_dir)["versioning_query_pattern"]
+    timestamp = '"{0}"^^xsd:dateTime'.format(_TIMESTAMP_PLACEHOLDER)
+
+    ver_block = []
+    validity_filters = []
+    # The same triple matches the same versioned triple statement. Its versioning timestamps 
+    # are shared, so it only needs to be matched once.
+    for triple_n3 in dict.fromkeys(triple[0].n3() + " " + triple[1].n3() + " " + triple[2].n3() for triple in triples):
+        triple_stmts_cnt = triple_stmts_cnt + 1
+        cnt = str(triple_stmts_cnt)
+        ver_block.append(ver_block_template.format(triple_n3, "?valid_from_" + cnt, "?valid_until_" + cnt, "", cnt))
+        validity_filters.append("?valid_from_{0} <= {1} && {1} < ?valid_until_{0}".format(cnt, timestamp))
+    if validity_filters and not latest:
+        ver_block.append("filter({0})\n".format(" && ".join(validity_filters)))
+
+    return "".join(ver_block), triple_stmts_cnt
+
+
+def _timestamp_bgp_query_template(bgp_query: BGPSelectQuery, mode: str, templates_dir: str, latest: bool = False,
+                                  optimize: bool = False) -> str:
+    """
+    Creates the timestamped query template for a plain basic graph pattern select query 
+    without the round trip through the rdflib query algebra. The output has the same form 
+    as the one created by algebra.translateAlgebra.
+    """
+
+    # Same triple order as after algebra.translateQuery and resolve_paths
+    triples = algebra.reorderTriples(algebra.reorderTriples(bgp_query.triples))
+    ver_block, _ = _versioning_block(triples, "BGP_0", 0, mode, templates_dir, latest, optimize)
+
+    select_clause = "SELECT "
+    if bgp_query.modifier:
+        select_clause += bgp_query.modifier + " "
+    select_clause += " ".join(var.n3() for var in bgp_query.projection)
+
+    solution_modifiers = ""
+    if bgp_query.offset is not None:
+        solution_modifiers += "OFFSET {0} ".format(bgp_query.offset)
+    if bgp_query.limit is not None:
+        solution_modifiers += "LIMIT {0} ".format(bgp_query.limit)
+
+    query_vers_out = select_clause + "{" + ver_block + "}" + solution_modifiers.strip()
+    return add_versioning_prefixes("", mode) + "\n" + query_vers_out
+
+
+def _is_complex_path(path: Path) -> bool:
+    """
+    :return: True if :path contains a path that cannot be resolved into a sequence of triple statements,
+    i.e. an alternative path, a negated property set or a path with the modifier *, + or ?.
+    """
+
+    if isinstance(path, (MulPath, AlternativePath, NegatedPath)):
+        return True
+    if isinstance(path, SequencePath):
+        return any(_is_complex_path(arg) for arg in path.args)
+    if isinstance(path, InvPath):
+        return _is_complex_path(path.arg)
+    return False
+
+
+class _PathExpander:
+    """
+    Translates complex property paths (see _is_complex_path) into group graph patterns over versioned triple 
+    statements. The versioned triples are only stored as quoted triples, so a path operator cannot be applied to them 
+    directly. Instead:
+
+    - p1|p2 becomes { p1 } UNION { p2 }
+    - !(p1|^p2) becomes { ?s ?p ?o FILTER(?p != p1) } UNION { ?o ?p ?s FILTER(?p != p2) }
+    - p? becomes the union of the zero-length path and p, p+ the union of the sequences p, p/p, ... 
+      up to :max_path_length steps and p* the union of both. Like the path operators, they return distinct solutions
+      via a SELECT DISTINCT subquery over the subject and object variables (or FILTER EXISTS if there are none).
+      Longer paths than :max_path_length are not found. Therefore, p+ and p* are only expanded if 
+      :max_path_length is given explicitly.
+
+    Every group is versioned with _versioning_block and binds the timestamp on its own, because subqueries and 
+    the branches of a union do not see the bindings of the enclosing group.
+    """
+
+    def __init__(self, mode: str, templates_dir: str, latest: bool, optimize: bool, max_path_length: Optional[int], 
+                 bgp_cnt: int, triple_stmts_cnt: int):
+        self.mode = mode
+        self.templates_dir = templates_dir
+        self.latest = latest
+        self.optimize = optimize
+        self.max_path_length = max_path_length
+        self.bgp_cnt = bgp_cnt
+        self.triple_stmts_cnt = triple_stmts_cnt
+        self.var_cnt = 0
+
+
+    def _variable(self) -> Variable:
+        self.var_cnt += 1
+        return Variable("_path{0}".format(self.var_cnt))
+
+
+    def expand(self, path: Path, subj: Identifier, obj: Identifier) -> tuple[list, list[str]]:
+        """
+        :return: The triples that :path resolves into and that are versioned in the enclosing group, 
+        and the group graph patterns of its complex parts.
+        """
+
+        if isinstance(path, URIRef):
+            return [(subj, path, obj)], []
+        if isinstance(path, InvPath):
+            return self.expand(path.arg, obj, subj)
+        if isinstance(path, SequencePath):
+            triples, patterns = [], []
+            nodes = [subj] + [self._variable() for _ in path.args[1:]] + [obj]
+            for i, arg in enumerate(path.args):
+                arg_triples, arg_patterns = self.expand(arg, nodes[i], nodes[i + 1])
+                triples += arg_triples
+                patterns += arg_patterns
+            return triples, patterns
+        if isinstance(path, AlternativePath):
+            return [], [" UNION ".join("{" + self.group(*self.expand(arg, subj, obj)) + "}" for arg in path.args)]
+        if isinstance(path, NegatedPath):
+            return [], [self._negated_property_set(path, subj, obj)]
+        if isinstance(path, MulPath):
+            return [], [self._arbitrary_length_path(path, subj, obj)]
+        raise ExpressionNotCoveredException("Node inside Path is neither Path nor URIRef but: "
+                                            "{0}. This case has not been covered yet. "
+                                            "Path will not be resolved.".format(type(path)))
+
+
+    def group(self, triples: list, patterns: list[str]) -> str:
+        """
+        :return: The versioned triple statements of :triples followed by :patterns.
+        """
+
+        ver_block = ""
+        if triples:
+            ver_block, self.triple_stmts_cnt = _versioning_block(triples, "BGP_" + str(self.bgp_cnt), self.triple_stmts_cnt, 
+                                                                 self.mode, self.templates_dir, self.latest, self.optimize)
+            self.bgp_cnt += 1
+        return ver_block + "\n".join(patterns)
+
+
+    def _negated_property_set(self, path: NegatedPath, subj: Identifier, obj: Identifier) -> str:
+        if not all(isinstance(arg, (URIRef, InvPath)) for arg in path.args):
+            # rdflib's parser drops the IRI of ^iri inside a negated property set.
+            raise ExpressionNotCoveredException("Inverse IRIs in negated property sets, e.g. !(^p), are not supported "
+                                                "by the rdflib query parser. Rewrite them as ^!(p) instead.")
+        forward = [arg for arg in path.args if isinstance(arg, URIRef)]
+        inverse = [arg.arg for arg in path.args if isinstance(arg, InvPath)]
+        branches = []
+        # !(^p) only matches inverse triples, !(p|^q) forward and inverse triples.
+        for excluded, s, o in [(forward, subj, obj), (inverse, obj, subj)]:
+            if not excluded:
+                continue
+            p = self._variable()
+            condition = " && ".join("{0} != {1}".format(p.n3(), iri.n3()) for iri in excluded)
+            branches.append("{" + self.group([(s, p, o)], []) + "FILTER(" + condition + ")}")
+        return " UNION ".join(branches)
+
+
+    def _zero_length_path(self, subj: Identifier, obj: Identifier) -> str:
+        if subj == obj and isinstance(subj, Variable):
+            # Every subject and object of a triple that is valid at the timestamp
+            p, other = self._variable(), self._variable()
+            return "{{SELECT DISTINCT {0} WHERE {{{{{1}}} UNION {{{2}}}}}}}".format(
+                subj.n3(), self.group([(subj, p, other)], []), self.group([(other, p, subj)], []))
+        if isinstance(subj, Variable) and isinstance(obj, Variable):
+            return self._zero_length_path(subj, subj) + " BIND({0} AS {1})".format(subj.n3(), obj.n3())
+        if isinstance(subj, Variable):
+            return "BIND({0} AS {1})".format(obj.n3(), subj.n3())
+        if isinstance(obj, Variable):
+            return "BIND({0} AS {1})".format(subj.n3(), obj.n3())
+        return "FILTER(sameTerm({0}, {1}))".format(subj.n3(), obj.n3())
+
+
+    def _arbitrary_length_path(self, path: MulPath, subj: Identifier, obj: Identifier) -> str:
+        branches = []
+        if path.mod in ["+", "*"] and self.max_path_length is None:
+            raise ExpressionNotCoveredException("Paths with the modifiers + and * are unrolled into paths of up to max_path_length steps "
+                                                "and longer paths are not found. Provide max_path_length to rewrite the path {0}.".format(path.n3()))
+        if path.mod in ["?", "*"]:
+            branches.append(self._zero_length_path(subj, obj))
+        for length in range(1, 2 if path.mod == "?" else self.max_path_length + 1):
+            nodes = [subj] + [self._variable() for _ in range(length - 1)] + [obj]
+            triples, patterns = [], []
+            for i in range(length):
+                step_triples, step_patterns = self.expand(path.path, nodes[i], nodes[i + 1])
+                triples += step_triples
+                patterns += step_patterns
+            branches.append(self.group(triples, patterns))
+        union = " UNION ".join("{" + branch + "}" for branch in branches)
+
+        variables = list(dict.fromkeys(node.n3() for node in [subj, obj] if isinstance(node, Variable)))
+        if variables:
+            return "{{SELECT DISTINCT {0} WHERE {{{1}}}}}".format(" ".join(variables), union)
+        return "FILTER EXISTS {{{0}}}".format(union)
+
+
+@lru_cache(maxsize=_REWRITE_CACHE_SIZE)
+def _timestamp_query_template(query: str, mode: str, fast_path: bool = True, latest: bool = False, optimize: bool = False,
+                              max_path_length: Optional[int] = None) -> str:
+    """
+    Rewrites the query into a timestamped query where the timestamp is left as a placeholder.
+
+    :param query: A normalized query string.
+    :param mode: The RDF-star representation of the versioned triples: 'decorator' or 'reification'.
+    :param fast_path: If true, plain basic graph pattern select queries are rewritten without the rdflib query algebra.
+    :param latest: If true, the query is rewritten for the current version of the data. 
+    :param optimize: If true, the versioning blocks are built by the optimization stage (see _versioning_block).
+    :param max_path_length: The maximum number of steps of the paths p+ and p* (see _PathExpander). 
+    Queries with these paths raise ExpressionNotCoveredException if it is None.
+    :return: The timestamped query with _TIMESTAMP_PLACEHOLDER in place of the version timestamp.
+    """
+
     # Setting templates dir
     if mode == "decorator":
         _templates_dir = os.path.join(os.path.dirname(__file__), "templates") + "/decorator"
@@ -44,23 +646,23 @@ def timestamp_query(query: str, version_timestamp: Optional[datetime] = None, mo
     else:
         raise WrongInputFormatException("The provided mode {0} is not supported. Use 'decorator' or 'reification'.".format(mode))
 
+    if fast_path:
+        bgp_query = parse_bgp_select(query)
+        if bgp_query is not None:
+            logger.info("Rewriting basic graph pattern query into a timestamped query template ...")
+            return _timestamp_bgp_query_template(bgp_query, mode, _templates_dir, latest, optimize)
 
-    logger.info("Creating timestamped query ...")
+    logger.info("Rewriting query into a timestamped query template ...")
     prefixes, query = split_prefixes_query(query)
     query_vers = prefixes + "\n" + query
 
-    if version_timestamp is None:
-        tz_name = time.tzname[time.localtime().tm_isdst]  # standard or DST name
-        local_tz = ZoneInfo(tz_name)
-        execution_datetime = datetime.now(local_tz)
-        timestamp = versioning_timestamp_format(execution_datetime)
-    else:
-        timestamp = versioning_timestamp_format(version_timestamp)  
-
     query_tree = parser.parseQuery(query_vers)
     query_algebra = algebra.translateQuery(query_tree)
 
     bgp_triples = {} 
+    # Complex property paths (see _is_complex_path) are replaced by a dummy triple in their basic graph pattern
+    # and expanded by _PathExpander when the versioning block of the basic graph pattern is built.
+    path_triples = {}
     def inject_versioning_extensions(node: object):
         if not isinstance(node, CompValue):
             return  
@@ -111,16 +713,8 @@ def timestamp_query(query: str, version_timestamp: Optional[datetime] = None, mo
                                                                 "{0}. This case has not been covered yet. "
                                                                 "Path will not be resolved.".format(type(ref)))
 
-                if isinstance(path, NegatedPath):
-                    raise ExpressionNotCoveredException("NegatedPath has not be covered yet. Path will not be resolved")
-                if isinstance(path, AlternativePath):
-                    # TODO resolve path
-                    raise ExpressionNotCoveredException("AlternativePath has not be covered yet. "
-                                                        "Path will not be resolved. Instead of alternative paths "
-                                                        "try using the following expression: "
-                                                        "{ <triple statements> } "
-                                                        "UNION "
-                                                        "{ <triple statements> }")
+                # Alternative paths, negated property sets and paths with the modifiers *, + and ? 
+                # are expanded by _PathExpander (see _is_complex_path).
                 if isinstance(path, InvPath):
                     if isinstance(path.arg, URIRef):
                         t = (obj, path.arg, subj)
@@ -129,19 +723,20 @@ def timestamp_query(query: str, version_timestamp: Optional[datetime] = None, mo
                     else:
                         raise ExpressionNotCoveredException("An argument for inverted paths other than URIRef "
                                                             "was given. This case is not implemented yet.")  
-                
-                if isinstance(path, MulPath):
-                    if path.mod == "?":
-                        raise ExpressionNotCoveredException("ZeroOrOne path has not be covered yet. "
-                                                            "Path will not be resolved")
-                    if path.mod == "*": 
-                        raise ExpressionNotCoveredException("ZeroOrMore path has not be covered yet. "
-                                                            "Path will not be resolved")
-                    if path.mod == "+":
-                        raise ExpressionNotCoveredException("OneOrMore path has not be covered yet. "
-                                                            "Path will not be resolved")
+
 
             for k, triple in enumerate(node.triples):
+                if isinstance(triple[1], Path) and _is_complex_path(triple[1]):
+                    if not (isinstance(triple[0], (Variable, URIRef, rdflib.term.Literal)) 
+                            and isinstance(triple[2], (Variable, URIRef, rdflib.term.Literal))):
+                        raise ExpressionNotCoveredException("Blank nodes as subject or object of alternative paths, "
+                                                            "negated property sets and paths with the modifiers *, + and ? "
+                                                            "are not supported. Use variables instead.")
+                    path_id = '__PATH_{0}dummy__'.format(len(path_triples))
+                    path_triples[path_id] = triple
+                    dummy = rdflib.term.Literal(path_id)
+                    resolved_triples.append((dummy, dummy, dummy))
+                    continue
                 if isinstance(triple[0], Identifier) and isinstance(triple[2], Identifier):
                     if isinstance(triple[1], Path):
                         resolve(triple[1], triple[0], triple[2])
@@ -177,41 +772,465 @@ def timestamp_query(query: str, version_timestamp: Optional[datetime] = None, mo
     # Replace each block of triples (labeled as dummy block) 
     # with their corresponding block of timestamped triple statements.
     triple_stmts_cnt = 0
+    path_expander = _PathExpander(mode, _templates_dir, latest, optimize, max_path_length, len(bgp_triples), 0)
     for bgp_identifier, triples in bgp_triples.items():
-        
-        template_path = os.path.join(_templates_dir, "versioning_query_extensions.txt")
-        ver_block_template = \
-            open(template_path, "r").read()
+        path_patterns = []
+        if path_triples:
+            resolved_triples = []
+            for triple in triples:
+                if str(triple[0]) in path_triples:
+                    subj, path, obj = path_triples[str(triple[0])]
+                    path_expander.triple_stmts_cnt = triple_stmts_cnt
+                    expanded_triples, expanded_patterns = path_expander.expand(path, subj, obj)
+                    triple_stmts_cnt = path_expander.triple_stmts_cnt
+                    resolved_triples += expanded_triples
+                    path_patterns += expanded_patterns
+                else:
+                    resolved_triples.append(triple)
+            triples = resolved_triples
 
-        ver_block = ""
-        for i, triple in enumerate(triples):
-            triple_stmts_cnt = triple_stmts_cnt + 1
-            logger.debug(triple_stmts_cnt)
-            templ = ver_block_template
-            triple_n3 = triple[0].n3() + " " + triple[1].n3() + " " + triple[2].n3()
-            if mode == "decorator":
-                ver_block += templ.format(triple_n3,
-                                        "?valid_from_{0}".format(str(triple_stmts_cnt)),
-                                        "?valid_until_{0}".format(str(triple_stmts_cnt)),
-                                        bgp_identifier)
-            elif mode == "reification":
-                ver_block += templ.format(triple_n3,
-                        "?valid_from_{0}".format(str(triple_stmts_cnt)),
-                        "?valid_until_{0}".format(str(triple_stmts_cnt)),
-                        bgp_identifier,
-                        str(triple_stmts_cnt))
+        ver_block, triple_stmts_cnt = _versioning_block(triples, bgp_identifier, triple_stmts_cnt, mode, _templates_dir, latest, optimize)
+        ver_block += "".join(pattern + "\n" for pattern in path_patterns)
 
         # Replace dummy triple with versioned triple
         dummy_triple = rdflib.term.Literal('__{0}dummy_subject__'.format(bgp_identifier)).n3() + " "\
                         + rdflib.term.Literal('__{0}dummy_predicate__'.format(bgp_identifier)).n3() + " "\
                         + rdflib.term.Literal('__{0}dummy_object__'.format(bgp_identifier)).n3() + "."
-        ver_block += 'bind("{0}"^^xsd:dateTime as ?ts{1})'.format(timestamp, bgp_identifier)
         query_vers_out = query_vers_out.replace(dummy_triple, ver_block)
 
     # Add prefixes
     query_vers_out = add_versioning_prefixes("", mode) + "\n" + query_vers_out
     
-    return query_vers_out, timestamp
+    return query_vers_out
+
+
+def _buffered_result(content: bytes, content_type: str, return_format: str) -> Wrapper.QueryResult:
+    """
+    :return: A query result whose response is read from :content instead of the socket.
+    """
+
+    return Wrapper.QueryResult((BufferedResponse(content, {"content-type": content_type}), return_format))
+
+
+def _result_to_df(result: Wrapper.QueryResult, result_format: str = "json", instrument: Optional[Instrument] = None) -> pd.DataFrame:
+    """
+    Converts :result into a dataframe with to_df or, for result_format='arrow', to_df_columnar. 
+    If :instrument is given, decoding and formatting are reported as separate phases. 
+    The response must then be buffered (see TripleStoreEngine._download).
+    """
+
+    if instrument is None:
+        return to_df_columnar(result) if result_format == "arrow" else to_df(result)
+
+    if result_format == "arrow":
+        if result._get_responseFormat() != "tsv":
+            return to_df_columnar(result)
+        with phase(instrument, "decode"):
+            decoded = read_tsv(result.response)
+        with phase(instrument, "to_df") as event:
+            df = format_tsv_df(decoded)
+            event["rows"] = len(df)
+        return df
+
+    with phase(instrument, "decode"):
+        decoded = result.convert()
+    if result._get_responseFormat() != "json" or not isinstance(decoded, dict):
+        return to_df(_buffered_result(result.response.getvalue(), result.info()["content-type"], result.requestedFormat))
+    with phase(instrument, "to_df") as event:
+        df = json_to_df(decoded)
+        event["rows"] = len(df)
+    return df
+
+
+class _Chunk(NamedTuple):
+    """
+    A SPARQL update for one chunk and the triples it writes or matches, which are used to order dependent chunks.
+    """
+    statement: str
+    triples: frozenset[str]
+
+
+def _triple_key(row: str) -> str:
+    row = row.strip()
+    if row.startswith("(") and row.endswith(")"):
+        row = row[1:-1]
+    return " ".join(row.split())
+
+
+def _sparql_prefixes(prefixes: Optional[dict[str, str]], mode: str) -> str:
+    if prefixes:
+        return add_versioning_prefixes(prefixes, mode)
+    else:
+        return add_versioning_prefixes("", mode)
+
+
+def _n3_triples(triples: Union[Iterable[str], os.PathLike]) -> Iterator[str]:
+    """
+    Yields the triples in n3 syntax without the terminating dot. :triples is an iterable of triples in n3 syntax 
+    (including the dot) or the path of an N-Triples file, which is read line by line. 
+    Empty lines and comments are skipped.
+    """
+
+    if isinstance(triples, os.PathLike):
+        with open(triples, "r", encoding="utf-8") as f:
+            yield from _n3_triples(f)
+        return
+
+    for line in triples:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        yield line[:-1].rstrip() if line.endswith(".") else line
+
+
+def _values_block(triples: Union[Iterable[str], str, os.PathLike]) -> Iterator[str]:
+    """
+    Converts triples in n3 syntax (including the dot) into rows of a VALUES block lazily (see _n3_triples). 
+    A string is taken as VALUES block already. The input is not modified.
+    """
+
+    if isinstance(triples, str):
+        return iter(triples.splitlines())
+    else:
+        return ("( " + triple + " )" for triple in _n3_triples(triples))
+
+
+def _is_empty(triples: Union[Iterable, str, os.PathLike]) -> bool:
+    # Only inputs with a length can be checked without consuming them.
+    return hasattr(triples, "__len__") and len(triples) == 0
+
+
+def _version_all_triples_statement(templates_dir: str, mode: str, initial_timestamp: Optional[datetime] = None) -> tuple[str, str]:
+    final_prefixes = add_versioning_prefixes("", mode)
+
+    if initial_timestamp:
+        version_timestamp = versioning_timestamp_format(initial_timestamp)
+    else:
+        version_timestamp = versioning_timestamp_format(datetime.now().astimezone())
+
+    temp = get_templates(templates_dir)["version_all_triples"]
+    return temp.format(final_prefixes, version_timestamp), version_timestamp
+
+
+def _snapshot_construct_query(templates_dir: str, timestamp: Optional[datetime] = None) -> str:
+    snapshot_construct_query = get_templates(templates_dir)["snapshot_construct_query"]
+    if timestamp:
+        return snapshot_construct_query.format('"' + versioning_timestamp_format(timestamp) + '"')
+    else:
+        return snapshot_construct_query.format("NOW()")
+
+
+class _RowStream:
+    """
+    Reads the rows of a VALUES block together with the triples that each row writes or matches lazily from an iterator, 
+    so that only the rows of the current chunk are held in memory. Rows that are pushed back are read again first.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, tuple[str, ...]]]):
+        self._rows = iter(rows)
+        self._pending: deque[tuple[str, tuple[str, ...]]] = deque()
+
+    def take(self, n: int) -> list[tuple[str, tuple[str, ...]]]:
+        batch = [self._pending.popleft() for _ in range(min(n, len(self._pending)))]
+        batch.extend(islice(self._rows, n - len(batch)))
+        return batch
+
+    def push_back(self, batch: list[tuple[str, tuple[str, ...]]]):
+        self._pending.extendleft(reversed(batch))
+
+
+class _UpdateRows(NamedTuple):
+    """
+    The rows of the VALUES block of an insert, update or outdate statement. 
+    :statement turns a block of rows into the SPARQL update, so that the rows can be split into chunks of any size.
+    """
+    stream: _RowStream
+    statement: Callable[[str], str]
+
+    def take(self, n: int) -> list[tuple[str, tuple[str, ...]]]:
+        return self.stream.take(n)
+
+    def push_back(self, batch: list[tuple[str, tuple[str, ...]]]):
+        self.stream.push_back(batch)
+
+    @staticmethod
+    def size(batch: list[tuple[str, tuple[str, ...]]]) -> int:
+        return len(batch)
+
+    def chunk(self, batch: list[tuple[str, tuple[str, ...]]]) -> _Chunk:
+        return _Chunk(self.statement("\n".join(row for row, _ in batch)), 
+                      frozenset(key for _, keys in batch for key in keys))
+
+    def chunks(self, chunk_size: int) -> Iterator[_Chunk]:
+        while batch := self.take(chunk_size):
+            yield self.chunk(batch)
+
+
+class _DeltaRows(NamedTuple):
+    """
+    The rows of the outdate and insert statements of a delta. A chunk is a multi-operation SPARQL update 
+    that outdates the next rows of :deletions and then inserts the next rows of :insertions, 
+    so that both operations of a chunk are applied in the same transaction.
+    """
+    insertions: Optional[_UpdateRows]
+    deletions: Optional[_UpdateRows]
+
+    def take(self, n: int) -> tuple[list[tuple[str, tuple[str, ...]]], ...]:
+        return tuple(rows.take(n) if rows else [] for rows in (self.deletions, self.insertions))
+
+    def push_back(self, batch: tuple[list[tuple[str, tuple[str, ...]]], ...]):
+        for rows, rows_batch in zip((self.deletions, self.insertions), batch):
+            if rows:
+                rows.push_back(rows_batch)
+
+    @staticmethod
+    def size(batch: tuple[list[tuple[str, tuple[str, ...]]], ...]) -> int:
+        return max(len(rows_batch) for rows_batch in batch)
+
+    def chunk(self, batch: tuple[list[tuple[str, tuple[str, ...]]], ...]) -> _Chunk:
+        chunks = [rows.chunk(rows_batch) for rows, rows_batch in zip((self.deletions, self.insertions), batch) if rows_batch]
+        return _Chunk(" ;\n".join(chunk.statement for chunk in chunks), 
+                      frozenset(triple for chunk in chunks for triple in chunk.triples))
+
+    def chunks(self, chunk_size: int) -> Iterator[_Chunk]:
+        while self.size(batch := self.take(chunk_size)) > 0:
+            yield self.chunk(batch)
+
+
+def _timestamp_argument(timestamp: Optional[datetime] = None) -> str:
+    if timestamp:
+        return '"' + versioning_timestamp_format(timestamp) + '"'
+    else:
+        return "NOW()"
+
+
+def _insert_rows(templates_dir: str, mode: str, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str, str]] = None, 
+                 timestamp: Optional[datetime] = None) -> Optional[_UpdateRows]:
+    if _is_empty(triples):
+        logger.info("List is empty. No triples will be inserted.")
+        return None
+
+    sparql_prefixes = _sparql_prefixes(prefixes, mode)
+
+    logger.info("Creating insert statement.")
+    statement = get_templates(templates_dir)["insert_triples"]
+    version_timestamp = _timestamp_argument(timestamp)
+
+    logger.info("Creating insert statement: Build insert block.")
+    insert_block = _RowStream((row, (_triple_key(row),)) for row in _values_block(triples))
+
+    return _UpdateRows(insert_block, lambda insert_chunk: statement.format(sparql_prefixes, insert_chunk, version_timestamp))
+
+
+def _update_rows(templates_dir: str, mode: str, old_triples: list[list[str]], new_triples: list[list[str]], 
+                 prefixes: Optional[dict[str,str]] = None) -> Optional[_UpdateRows]:
+    if len(old_triples) == 0:
+        logger.info("List is empty. No triples will be updated.")
+        return None
+
+    if len(old_triples) != len(new_triples):
+        raise WrongInputFormatException("Both lists old_triples and new_triples must have the same dimensions.")
+
+    sparql_prefixes = _sparql_prefixes(prefixes, mode)
+
+    logger.info("Create update statement")
+    template = get_templates(templates_dir)["update_triples"]
+
+    update_block: list[str] = []
+    update_keys: list[tuple[str, ...]] = []
+    for old_triple, new_triple in zip(old_triples, new_triples):
+        if not (len(old_triple) == 3 and len(new_triple) == 3):
+            raise WrongInputFormatException("The old or new triple's length is not 3.")
+        newS, newP, newO = ["UNDEF" if v is None else v for v in new_triple]
+        update_block.append(f"({old_triple[0]} {old_triple[1]} {old_triple[2]} {newS} {newP} {newO})")
+        update_keys.append((_triple_key(" ".join(old_triple)), 
+                            _triple_key(" ".join(o if n is None else n for o, n in zip(old_triple, new_triple)))))
+
+    return _UpdateRows(_RowStream(zip(update_block, update_keys)), lambda update_chunk: template.format(sparql_prefixes, update_chunk))
+
+
+def _outdate_rows(templates_dir: str, mode: str, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str,str]] = None, 
+                  timestamp: Optional[datetime] = None) -> Optional[_UpdateRows]:
+    if _is_empty(triples):
+        logger.info("List is empty. No triples will be outdated.")
+        return None
+
+    sparql_prefixes = _sparql_prefixes(prefixes, mode)
+
+    logger.info("Creating outdate statement.")
+    statement = get_templates(templates_dir)["outdate_triples"]
+    version_timestamp = _timestamp_argument(timestamp)
+
+    logger.info("Creating outdate statement: Build outdate block.")
+    outdate_block = _RowStream((row, (_triple_key(row),)) for row in _values_block(triples))
+
+    return _UpdateRows(outdate_block, lambda outdate_chunk: statement.format(sparql_prefixes, outdate_chunk, version_timestamp))
+
+
+def _insert_statements(templates_dir: str, mode: str, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str, str]] = None, 
+                       timestamp: Optional[datetime] = None, chunk_size: int = 1000) -> Iterator[_Chunk]:
+    """
+    Builds the insert statements for the chunks of :triples. See TripleStoreEngine.insert.
+    """
+
+    rows = _insert_rows(templates_dir, mode, triples, prefixes, timestamp)
+    if rows is not None:
+        logger.info("Inserting triples as chunks of {0} triples.".format(chunk_size))
+        yield from rows.chunks(chunk_size)
+
+
+def _update_statements(templates_dir: str, mode: str, old_triples: list[list[str]], new_triples: list[list[str]], 
+                       prefixes: Optional[dict[str,str]] = None, chunk_size: int = 1000) -> Iterator[_Chunk]:
+    """
+    Builds the update statements for the chunks of :old_triples and :new_triples. See TripleStoreEngine.update.
+    """
+
+    rows = _update_rows(templates_dir, mode, old_triples, new_triples, prefixes)
+    if rows is not None:
+        logger.info("Updating triples as chunks of {0} triples.".format(chunk_size))
+        yield from rows.chunks(chunk_size)
+
+
+def _outdate_statements(templates_dir: str, mode: str, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str,str]] = None, 
+                        timestamp: Optional[datetime] = None, chunk_size: int = 1000) -> Iterator[_Chunk]:
+    """
+    Builds the outdate statements for the chunks of :triples. See TripleStoreEngine.outdate.
+    """
+
+    rows = _outdate_rows(templates_dir, mode, triples, prefixes, timestamp)
+    if rows is not None:
+        logger.info("Outdating triples as chunks of {0} triples.".format(chunk_size))
+        yield from rows.chunks(chunk_size)
+
+
+def _bulk_insert_lines(templates_dir: str, mode: str, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str, str]] = None, 
+                       timestamp: Optional[datetime] = None) -> Iterator[str]:
+    """
+    Builds the lines of a Turtle-star file with the versioned form of :triples, i.e. the prologue 
+    followed by one nested triple (decorator mode) or one reification (reification mode) per triple. 
+    See TripleStoreEngine.bulk_insert.
+    """
+
+    # SPARQL-style PREFIX declarations are valid Turtle.
+    yield _sparql_prefixes(prefixes, mode)
+
+    version_timestamp = versioning_timestamp_format(timestamp or datetime.now().astimezone())
+    template = get_templates(templates_dir)["bulk_insert_triple"]
+    for i, row in enumerate(_values_block(triples)):
+        if row.strip():
+            yield template.format(_triple_key(row), version_timestamp, i)
+
+
+def _graphdb_rest_url(query_endpoint: str) -> tuple[str, str]:
+    """
+    :return: The URL of GraphDB's REST API and the repository name for a GraphDB query endpoint 
+    of the form <base>/repositories/<repository>.
+    """
+
+    match = re.fullmatch(r"(.*)/repositories/([^/]+)/?", query_endpoint)
+    if match is None:
+        raise WrongInputFormatException("The query endpoint {0} is not a GraphDB repository endpoint. " \
+                                        "Bulk imports are only supported for GraphDB.".format(query_endpoint))
+    return match.group(1) + "/rest", match.group(2)
+
+
+def _delta_rows(templates_dir: str, mode: str, insertions: Union[Iterable[str], str, os.PathLike], deletions: Union[Iterable[str], str, os.PathLike], 
+                prefixes: Optional[dict[str, str]] = None, timestamp: Optional[datetime] = None) -> Optional[_DeltaRows]:
+    insertion_rows = _insert_rows(templates_dir, mode, insertions, prefixes, timestamp)
+    deletion_rows = _outdate_rows(templates_dir, mode, deletions, prefixes, timestamp)
+    if insertion_rows is None and deletion_rows is None:
+        return None
+    return _DeltaRows(insertion_rows, deletion_rows)
+
+
+# Number of triples above which bulk_insert(method="auto") imports a file instead of sending SPARQL updates
+_BULK_INSERT_THRESHOLD = 100000
+
+
+# Adaptive chunk sizes (chunk_size="auto"): the first chunk size, the upper bound and 
+# the best chunk size found so far for each update endpoint.
+_AUTO_CHUNK_SIZE_START = 100
+_AUTO_CHUNK_SIZE_MAX = 100000
+_auto_chunk_sizes: dict[str, int] = {}
+_auto_chunk_sizes_lock = threading.Lock()
+
+
+# Connection tests (capability probes) that succeeded in this process, keyed by (query endpoint, update endpoint, mode), 
+# and the optional file that shares them between processes for _probe_cache_ttl seconds.
+DEFAULT_PROBE_CACHE_TTL = 24 * 60 * 60
+_probed_endpoints: set[tuple[str, str, str]] = set()
+_probed_endpoints_lock = threading.Lock()
+_probe_cache_file: Optional[str] = None
+_probe_cache_ttl: float = DEFAULT_PROBE_CACHE_TTL
+
+
+def configure_probe_cache(cache_file: Optional[str] = None, ttl: float = DEFAULT_PROBE_CACHE_TTL):
+    """
+    The connection test of TripleStoreEngine and AsyncTripleStoreEngine runs once per query endpoint, update endpoint
+    and mode in each process. If :cache_file is given, successful tests are also written into this file and are
+    skipped by all processes that use the same file for :ttl seconds.
+
+    :param cache_file: A JSON file for the successful connection tests or None to keep them in memory only.
+    :param ttl: The number of seconds after which a connection test in :cache_file is repeated.
+    """
+
+    global _probe_cache_file, _probe_cache_ttl
+    with _probed_endpoints_lock:
+        _probe_cache_file = cache_file
+        _probe_cache_ttl = ttl
+
+
+def clear_probe_cache():
+    """
+    Forgets all successful connection tests of this process. The cache file, if any, is removed.
+    """
+
+    with _probed_endpoints_lock:
+        _probed_endpoints.clear()
+        if _probe_cache_file is not None and os.path.exists(_probe_cache_file):
+            os.remove(_probe_cache_file)
+
+
+def _probe_key(query_endpoint: str, update_endpoint: str, mode: str) -> tuple[str, str, str]:
+    return query_endpoint, update_endpoint, mode
+
+
+def _read_probe_cache_file() -> dict[str, float]:
+    try:
+        with open(_probe_cache_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_probed(key: tuple[str, str, str]) -> bool:
+    with _probed_endpoints_lock:
+        if key in _probed_endpoints:
+            return True
+        if _probe_cache_file is None:
+            return False
+        probed_at = _read_probe_cache_file().get(" ".join(key))
+        if probed_at is None or time.time() - probed_at > _probe_cache_ttl:
+            return False
+        _probed_endpoints.add(key)
+        return True
+
+
+def _remember_probe(key: tuple[str, str, str]):
+    with _probed_endpoints_lock:
+        _probed_endpoints.add(key)
+        if _probe_cache_file is None:
+            return
+        now = time.time()
+        probes = {k: t for k, t in _read_probe_cache_file().items() if now - t <= _probe_cache_ttl}
+        probes[" ".join(key)] = now
+        try:
+            tmp_file = "{0}.{1}.tmp".format(_probe_cache_file, uuid.uuid4().hex)
+            with open(tmp_file, "w") as f:
+                json.dump(probes, f)
+            os.replace(tmp_file, _probe_cache_file)
+        except OSError as e:
+            logger.warning(f"The connection test could not be written to {_probe_cache_file}: {e}")
 
 
 class TripleStoreEngine:
@@ -226,10 +1245,13 @@ class TripleStoreEngine:
             self.pw = pw
 
     def __init__(self, query_endpoint: str, update_endpoint: str, credentials: Optional[Credentials] = None,
-                 skip_connection_test: bool=False, timeout: Optional[int] = None, mode: str = "decorator"):
+                 skip_connection_test: bool=False, timeout: Optional[int] = None, mode: str = "decorator",
+                 transport: Optional[HTTPTransport] = None, result_cache: Optional[ResultCache] = None, 
+                 instrument: Optional[Instrument] = None):
         """
         During initialization a few queries are executed against the RDF-star store to test connection but also whether
-        the RDF-star store in fact supports the 'star' extension. During the execution a side effect may occur and
+        the RDF-star store in fact supports the 'star' extension. The test runs only once per query endpoint, update endpoint
+        and mode in each process (see configure_probe_cache). During the execution a side effect may occur and
         additional triples may be added by the RDF-star store. These triples are pure meta data triples and reflect
         classes and properties (like rdf:type and rdfs:subPropertyOf) of RDF itself. This happens due to a new prefix,
         namely, vers: <https://github.com/GreenfishK/DataCitation/versioning/>' which is used in the write statements.
@@ -241,9 +1263,19 @@ class TripleStoreEngine:
         :param update_endpoint: URL for executing write statements on the RDF-star store. Its URL is an extension of
         query_endpoint: "query_endpoint/statements"
         :param credentials: The user name and password for the remote RDF-star store
+        :param transport: The HTTP transport whose connection pool is used for all requests. 
+        If None, the shared transport (see starvers.transport.get_transport) is used.
+        :param result_cache: If given, the results of queries at timestamps in the past are cached (see starvers.cache.ResultCache). 
+        Writes through this engine invalidate the affected results.
+        :param instrument: If given, it is called with a PhaseEvent for each phase of each query and update, 
+        i.e. rewrite, http_wait, download, decode, to_df and update (see starvers.instrumentation). 
+        The response of a query is then read completely before it is decoded so that download and decode can be told apart.
         """
 
         self.credentials = credentials
+        self.timeout = timeout
+        self.result_cache = result_cache
+        self.instrument = instrument
 
         self.mode = mode
 
@@ -255,47 +1287,33 @@ class TripleStoreEngine:
         else:
             raise WrongInputFormatException("The provided mode {0} is not supported. Use 'decorator' or 'reification'.".format(mode))
 
-        self.sparql_get = SPARQLWrapper(query_endpoint)
-        self.sparql_get.setHTTPAuth(DIGEST)
-        self.sparql_get.setMethod(GET)
-        self.sparql_get.setReturnFormat(JSON)
-
-        self.sparql_get_with_post = SPARQLWrapper(query_endpoint)
-        self.sparql_get_with_post.setHTTPAuth(DIGEST)
-        self.sparql_get_with_post.setMethod(POST)
-        self.sparql_get_with_post.setReturnFormat(JSON)
-
-        self.sparql_post = SPARQLWrapper(update_endpoint)
-        self.sparql_post.setHTTPAuth(DIGEST)
-        self.sparql_post.setMethod(POST)
-
-        self.timestamped_query = None
+        self.query_endpoint = query_endpoint
+        self.update_endpoint = update_endpoint
+        self.transport = transport
 
-        if timeout is not None:
-            self.sparql_get.setTimeout(timeout)
-            self.sparql_get_with_post.setTimeout(timeout)
-            self.sparql_post.setTimeout(timeout)
-            self.timeout = timeout
+        # The engine's own requests build a new SPARQLWrapper each (see _query_wrapper and _update_wrapper), 
+        # so that one engine can be used by several threads at once. These wrappers are kept for callers 
+        # that use them directly. They are not thread-safe.
+        self.sparql_get = self._query_wrapper(method=GET)
+        self.sparql_get_with_post = self._query_wrapper()
+        self.sparql_post = self._update_wrapper()
 
-        if credentials:
-            self.sparql_post.setCredentials(credentials.user_name, credentials.pw)
-            self.sparql_get.setCredentials(credentials.user_name, credentials.pw)
+        # The rewritten query of the last query of each thread (see timestamped_query)
+        self._last_query = threading.local()
 
-        if not skip_connection_test:
+        probe_key = _probe_key(query_endpoint, update_endpoint, mode)
+        if skip_connection_test:
+            logger.info("Connection test has been skipped")
+        elif _is_probed(probe_key):
+            logger.info("Connection to RDF-star query and update endpoints "
+                        "{0} and {1} has already been tested".format(query_endpoint, update_endpoint))
+        else:
             # Test connection. Execute one read and one write statement
             try:
-                self.sparql_get.setQuery(open(self._templates_dir +
-                                              "/test_connection/test_connection_select.txt", "r").read())
-
-                insert_statement = open(self._templates_dir +
-                                        "/test_connection/test_connection_insert.txt", "r").read()
-                self.sparql_post.setQuery(insert_statement)
-                self.sparql_post.query()
-
-                delete_statement = open(self._templates_dir +
-                                        "/test_connection/test_connection_delete.txt", "r").read()
-                self.sparql_post.setQuery(delete_statement)
-                self.sparql_post.query()
+                templates = get_templates(self._templates_dir)
+                self._execute_query(templates["test_connection/test_connection_select"].text)
+                self._execute_update(templates["test_connection/test_connection_insert"].text)
+                self._execute_update(templates["test_connection/test_connection_delete"].text)
 
             except URLError:
                 raise NoConnectionToRDFStore("No connection to the RDF-star store could be established. "
@@ -303,65 +1321,282 @@ class TripleStoreEngine:
 
             try:
                 test_prefixes = add_versioning_prefixes("", mode)
-                template = open(self._templates_dir +
-                                "/test_connection/test_connection_timestamped_select.txt", "r").read()
-                select_statement = template.format(test_prefixes)
-                self.sparql_get.setQuery(select_statement)
-                self.sparql_get.query()
-
-                template = open(self._templates_dir +
-                                "/test_connection/test_connection_timestamped_insert.txt", "r").read()
-                insert_statement = template.format(test_prefixes)
-                self.sparql_post.setQuery(insert_statement)
-                self.sparql_post.query()
-
-                template = open(self._templates_dir +
-                                "/test_connection/test_connection_timestamped_delete.txt", "r").read()
-                delete_statement = template.format(test_prefixes)
-                self.sparql_post.setQuery(delete_statement)
-                self.sparql_post.query()
+                templates = get_templates(self._templates_dir)
+                self._execute_query(templates["test_connection/test_connection_timestamped_select"].format(test_prefixes))
+                self._execute_update(templates["test_connection/test_connection_timestamped_insert"].format(test_prefixes))
+                self._execute_update(templates["test_connection/test_connection_timestamped_delete"].format(test_prefixes))
 
             except Exception:
                 raise RDFStarNotSupported("Your RDF-star store might not support the 'star' extension. "
                                           "Make sure that it is a RDF* store.")
 
+            _remember_probe(probe_key)
             logger.info("Connection to RDF-star query and update endpoints "
                          "{0} and {1} established".format(query_endpoint, update_endpoint))
-        else:
-            logger.info("Connection test has been skipped")
 
 
-    def version_all_triples(self, initial_timestamp: Optional[datetime] = None):
+    @contextmanager
+    def _invalidates_result_cache(self, timestamp: Optional[datetime] = None):
+        """
+        Invalidates the cached results that a write with :timestamp might change once the write has finished or failed. 
+        Writes without timestamp use the execution timestamp of the RDF-star store, which is not before the start of the write.
         """
-        Versions all triples by wrapping every triple in the dataset with the execution timestamp as valid_from date 
-        and an end date that lies far in the future as valid_until date. 
 
-        :param initial_timestamp: A timestamp which should be used as the valid_from timestamp. If this parameter is None,
-        the current system timestamp will be used.
-        :return:
+        since = timestamp or datetime.now().astimezone()
+        try:
+            yield
+        finally:
+            if self.result_cache is not None:
+                self.result_cache.invalidate(self.query_endpoint, since)
+
+
+    @property
+    def timestamped_query(self) -> Optional[str]:
+        """
+        The query that was last sent by query, query_at or query_delta of the calling thread. 
+        Pass return_query=True to these methods to get it together with the result instead.
         """
 
-        final_prefixes = add_versioning_prefixes("", self.mode)
+        return getattr(self._last_query, "query", None)
 
-        if initial_timestamp:
-            version_timestamp = versioning_timestamp_format(initial_timestamp)
-        else:
-            version_timestamp = versioning_timestamp_format(datetime.now().astimezone())
 
-        temp = open(self._templates_dir + "/version_all_triples.txt", "r").read()
-        update_statement = temp.format(final_prefixes, version_timestamp)
+    def _query_wrapper(self, query: Optional[str] = None, return_format: str = JSON, accept: Optional[str] = None,
+                       method: str = POST) -> PooledSPARQLWrapper:
+        """
+        :return: A new SPARQLWrapper for the query endpoint. Wrappers are cheap to build and hold no connection, 
+        so every request gets its own and concurrent requests never see each other's query, return format or headers.
+        """
+
+        sparql = PooledSPARQLWrapper(self.query_endpoint, transport=self.transport)
+        sparql.setHTTPAuth(DIGEST)
+        sparql.setMethod(method)
+        sparql.setReturnFormat(return_format)
+        if accept is not None:
+            sparql.addCustomHttpHeader("Accept", accept)
+        if self.timeout is not None:
+            sparql.setTimeout(self.timeout)
+        if self.credentials:
+            sparql.setCredentials(self.credentials.user_name, self.credentials.pw)
+        if query is not None:
+            sparql.setQuery(query)
+        return sparql
+
+
+    def _update_wrapper(self, update_statement: Optional[str] = None) -> PooledSPARQLWrapper:
+        """
+        :return: A new SPARQLWrapper for the update endpoint (see _query_wrapper).
+        """
+
+        sparql_post = PooledSPARQLWrapper(self.update_endpoint, transport=self.transport)
+        sparql_post.setHTTPAuth(DIGEST)
+        sparql_post.setMethod(POST)
+        if self.timeout is not None:
+            sparql_post.setTimeout(self.timeout)
+        if self.credentials:
+            sparql_post.setCredentials(self.credentials.user_name, self.credentials.pw)
+        if update_statement is not None:
+            sparql_post.setQuery(update_statement)
+        return sparql_post
+
+
+    def _execute_query(self, query: str, return_format: str = JSON, accept: Optional[str] = None) -> Wrapper.QueryResult:
+        try:
+            if self.instrument is None:
+                return self._query_wrapper(query, return_format, accept).query()
+            with phase(self.instrument, "http_wait", request_bytes=len(query.encode("utf-8"))):
+                return self._query_wrapper(query, return_format, accept).query()
+        except TimeoutError as e:
+            logger.error(f"A timeout error occurred during query execution. The timeout was {self.timeout}: {e}")
+            raise e
+        except Exception as e:
+            logger.error(f"An error of type {type(e).__name__} occurred during query execution: {e}")
+            raise e
+
 
-        self.sparql_post.setQuery(update_statement)
+    def _execute_update(self, update_statement: str, chunk_index: Optional[int] = None, rows: Optional[int] = None):
         try:
-            self.sparql_post.query()
+            if self.instrument is None:
+                self._update_wrapper(update_statement).query()
+                return
+            with phase(self.instrument, "update", request_bytes=len(update_statement.encode("utf-8")), 
+                       rows=rows, chunk_index=chunk_index):
+                self._update_wrapper(update_statement).query()
         except TimeoutError as e:
             logger.error(f"A timeout error occurred during query execution. The timeout was {self.timeout}: {e}")
             raise e
+
+
+    def _download(self, result: Wrapper.QueryResult) -> Wrapper.QueryResult:
+        """
+        Reads the streamed response of :result completely if the engine is instrumented, 
+        so that the download is reported separately from the decoding.
+        """
+
+        if self.instrument is None or isinstance(result.response, BufferedResponse):
+            return result
+        with phase(self.instrument, "download") as event:
+            try:
+                content = result.response.read()
+            finally:
+                result.response.close()
+            event["response_bytes"] = len(content)
+        return _buffered_result(content, result.info()["content-type"], result.requestedFormat)
+
+
+    def _submit_chunks(self, chunks: Iterator[_Chunk], max_concurrency: int = 1):
+        """
+        Sends the chunk updates to the RDF-star store. With :max_concurrency > 1 up to :max_concurrency chunks are 
+        in flight at once, each with its own SPARQLWrapper. A chunk that shares triples with a chunk in flight 
+        is only sent after that chunk has finished and it is skipped if that chunk failed.
+
+        :raises ChunkSubmissionError: If :max_concurrency > 1 and at least one chunk failed.
+        """
+
+        if max_concurrency < 1:
+            raise WrongInputFormatException("max_concurrency must be greater than 0.")
+
+        if max_concurrency == 1:
+            for i, chunk in enumerate(chunks):
+                self._execute_update(chunk.statement, i, len(chunk.triples))
+            return
+
+        logger.info("Sending chunks with up to {0} concurrent requests.".format(max_concurrency))
+        in_flight: dict[Future, tuple[int, frozenset[str]]] = {}
+        failed_chunks: dict[int, Exception] = {}
+        failed_triples: dict[str, int] = {}
+
+        def collect(done: set[Future]):
+            for future in done:
+                i, triples = in_flight.pop(future)
+                exception = future.exception()
+                if exception is not None:
+                    logger.error(f"Chunk {i} failed with an error of type {type(exception).__name__}: {exception}")
+                    failed_chunks[i] = exception
+                    failed_triples.update(dict.fromkeys(triples, i))
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for i, chunk in enumerate(chunks):
+                dependencies = [future for future, (_, triples) in in_flight.items() if not triples.isdisjoint(chunk.triples)]
+                if dependencies:
+                    collect(wait(dependencies).done)
+                failed_dependency = next((failed_triples[t] for t in chunk.triples if t in failed_triples), None)
+                if failed_dependency is not None:
+                    failed_chunks[i] = ChunkSubmissionError({failed_dependency: failed_chunks[failed_dependency]})
+                    failed_triples.update(dict.fromkeys(chunk.triples, i))
+                    continue
+                if len(in_flight) >= max_concurrency:
+                    collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+                future = executor.submit(self._execute_update, chunk.statement, i, len(chunk.triples))
+                in_flight[future] = (i, chunk.triples)
+            collect(wait(in_flight).done)
+
+        if failed_chunks:
+            raise ChunkSubmissionError(failed_chunks)
+
+
+    def _submit_rows(self, rows: Optional[Union[_UpdateRows, _DeltaRows]], chunk_size: Union[int, str] = 1000, max_concurrency: int = 1):
+        """
+        Splits :rows into chunks of :chunk_size rows and sends them to the RDF-star store (see _submit_chunks). 
+        With chunk_size='auto' and sequential submission, the chunk size is adapted while the chunks are sent 
+        (see _submit_rows_adaptive). With chunk_size='auto' and :max_concurrency > 1, the best chunk size found 
+        so far for the update endpoint is used.
+        """
+
+        if rows is None:
+            return
+
+        if chunk_size == "auto":
+            if max_concurrency == 1:
+                self._submit_rows_adaptive(rows)
+                return
+            with _auto_chunk_sizes_lock:
+                chunk_size = _auto_chunk_sizes.get(self.update_endpoint, _AUTO_CHUNK_SIZE_START)
+        elif not isinstance(chunk_size, int) or chunk_size < 1:
+            raise WrongInputFormatException("The chunk size must be a positive integer or 'auto'.")
+
+        logger.info("Sending triples as chunks of {0} triples.".format(chunk_size))
+        self._submit_chunks(rows.chunks(chunk_size), max_concurrency)
+
+
+    def _submit_rows_adaptive(self, rows: Union[_UpdateRows, _DeltaRows]):
+        """
+        Sends the rows one chunk after another and adapts the chunk size to the RDF-star store. The first chunk has 
+        the best chunk size found so far for the update endpoint or _AUTO_CHUNK_SIZE_START rows. The chunk size is doubled 
+        as long as the latency per triple improves and falls back to the best chunk size afterwards. 
+        If a chunk is rejected with HTTP 413 (payload too large) or times out, it is split in half and sent again, 
+        and its size becomes the upper bound for the remaining chunks. The best chunk size is remembered 
+        for subsequent calls with the same update endpoint.
+
+        :raises HTTPError, TimeoutError: If a chunk of a single row is rejected or times out.
+        """
+
+        with _auto_chunk_sizes_lock:
+            chunk_size = _auto_chunk_sizes.get(self.update_endpoint, _AUTO_CHUNK_SIZE_START)
+        max_chunk_size = _AUTO_CHUNK_SIZE_MAX
+        best_chunk_size = chunk_size
+        best_latency = float("inf")
+        growing = True
+
+        logger.info("Sending triples as chunks of adaptive size, starting with {0} triples.".format(chunk_size))
+        chunk_index = 0
+        while rows.size(batch := rows.take(chunk_size)) > 0:
+            cnt_rows = rows.size(batch)
+            chunk = rows.chunk(batch)
+            begin = time.perf_counter()
+            try:
+                self._execute_update(chunk.statement, chunk_index, cnt_rows)
+                chunk_index += 1
+            except (HTTPError, TimeoutError) as e:
+                if (isinstance(e, HTTPError) and e.code != 413) or cnt_rows == 1:
+                    raise e
+                rows.push_back(batch)
+                max_chunk_size = chunk_size = cnt_rows // 2
+                best_chunk_size = min(best_chunk_size, max_chunk_size)
+                growing = False
+                logger.warning(f"A chunk of {cnt_rows} triples failed with an error of type {type(e).__name__}. "
+                               f"Retrying with chunks of {chunk_size} triples.")
+                continue
+            latency = (time.perf_counter() - begin) / cnt_rows
+
+            # The last chunk may be smaller and is not representative.
+            if cnt_rows < chunk_size:
+                continue
+            if latency < best_latency:
+                best_latency = latency
+                best_chunk_size = chunk_size
+                if growing:
+                    chunk_size = min(chunk_size * 2, max_chunk_size)
+            else:
+                growing = False
+                chunk_size = best_chunk_size
+
+        with _auto_chunk_sizes_lock:
+            _auto_chunk_sizes[self.update_endpoint] = best_chunk_size
+        logger.info("Best chunk size for {0}: {1} triples.".format(self.update_endpoint, best_chunk_size))
+
+
+    def version_all_triples(self, initial_timestamp: Optional[datetime] = None):
+        """
+        Versions all triples by wrapping every triple in the dataset with the execution timestamp as valid_from date 
+        and an end date that lies far in the future as valid_until date. 
+
+        :param initial_timestamp: A timestamp which should be used as the valid_from timestamp. If this parameter is None,
+        the current system timestamp will be used.
+        :return:
+        """
+
+        update_statement, version_timestamp = _version_all_triples_statement(self._templates_dir, self.mode, initial_timestamp)
+
+        with self._invalidates_result_cache(initial_timestamp):
+            self._execute_update(update_statement)
         logger.info("All rows have been annotated with start date {0} " \
                     "and an artificial end date 9999-12-31T00:00:00.000+02:00".format(version_timestamp))
 
 
-    def query(self, select_statement: str, timestamp: Optional[datetime] = None, yn_timestamp_query: bool = True, as_df: bool = True) -> Union[pd.DataFrame, Wrapper.QueryResult]:
+    def query(self, select_statement: str, timestamp: Optional[datetime] = None, yn_timestamp_query: bool = True, as_df: bool = True,
+              latest: bool = False, result_format: str = "json", return_query: bool = False, optimize: bool = False,
+              interval: Optional[tuple[datetime, datetime]] = None, semantics: str = "overlaps",
+              max_path_length: Optional[int] = None) -> Union[pd.DataFrame, Wrapper.QueryResult, tuple[Union[pd.DataFrame, Wrapper.QueryResult], str]]:
         """
         Executes the SPARQL select statement and returns a result set. If :timestamp is provided the result set
         will be a snapshot of the data as of :timestamp. Otherwise, the most recent version of the data will be returned.
@@ -372,82 +1607,305 @@ class TripleStoreEngine:
         Otherwise, the select statement is executed as it is against the RDF-star store. 
         Set this flag to 'False' and leave :timestamp blank if :select_statement is a timestamped query already.
         :param as_df: If true, the result set will be converted into a pandas dataframe.
+        :param latest: If true and no :timestamp is provided, the current version of the data is retrieved by matching 
+        the artificial end date of currently valid triples instead of filtering by the execution timestamp (see timestamp_query).
+        :param result_format: 'json' or 'arrow'. With 'arrow' the results are requested as TSV and parsed column-wise 
+        into a dataframe backed by Arrow strings (see to_df_columnar), which is considerably faster for large result sets. 
+        Unbound values are NA instead of None.
+        :param return_query: If true, a tuple of the result set and the query that was sent to the RDF-star store 
+        (i.e. the timestamped query) is returned.
+        :param optimize: If true, the timestamped query is built by the optimization stage of the rewrite (see timestamp_query).
+        :param interval: A tuple with the start and end of a time range. If provided, the result set contains the data 
+        that was valid between the start and the end instead of a snapshot (see timestamp_query_interval). 
+        :timestamp and :latest must not be provided.
+        :param semantics: 'overlaps' or 'during'. See timestamp_query_interval.
+        :param max_path_length: The maximum number of steps of the property paths p+ and p*, which are unrolled 
+        into unions of versioned triple statements. Matches that need more steps are NOT returned. 
+        Queries with p+ or p* raise ExpressionNotCoveredException if it is not provided (see timestamp_query).
+
+        If the engine has a result cache and :timestamp (or the end of :interval) lies in the past, the response is served from the cache 
+        if it is cached and cached otherwise. Queries at the current time are always sent to the RDF-star store.
         """
 
-        if yn_timestamp_query:
-            timestamped_query, version_timestamp = timestamp_query(query=select_statement, version_timestamp=timestamp)
+        if result_format not in ["json", "arrow"]:
+            raise WrongInputFormatException("The provided result format {0} is not supported. Use 'json' or 'arrow'.".format(result_format))
+
+        cache_key, cached = None, None
+        if yn_timestamp_query and interval is not None:
+            if timestamp is not None or latest:
+                raise WrongInputFormatException("An interval cannot be combined with a timestamp or the latest version of the data.")
+            with phase(self.instrument, "rewrite"):
+                timestamped_query, start, end = timestamp_query_interval(select_statement, interval[0], interval[1], self.mode, 
+                                                                         semantics, optimize=optimize, max_path_length=max_path_length)
+
+            logger.info("Timestamped query with interval {0} - {1} being executed:"
+                         " \n {2}".format(start, end, timestamped_query))
+            select_statement = timestamped_query
+            if self.result_cache is not None and is_historical(interval[1]):
+                cache_key = (self.query_endpoint, timestamped_query, interval[1], result_format)
+                cached = self.result_cache.get(*cache_key)
+        elif yn_timestamp_query:
+            timestamped_query, version_timestamp = timestamp_query(query=select_statement, version_timestamp=timestamp,
+                                                                   mode=self.mode, latest=latest, instrument=self.instrument,
+                                                                   optimize=optimize, max_path_length=max_path_length)
 
             logger.info("Timestamped query with timestamp {0} being executed:"
                          " \n {1}".format(version_timestamp, timestamped_query))
-            self.sparql_get_with_post.setQuery(timestamped_query)
-            self.timestamped_query = timestamped_query
+            select_statement = timestamped_query
+            if self.result_cache is not None and is_historical(timestamp):
+                cache_key = (self.query_endpoint, timestamped_query, timestamp, result_format)
+                cached = self.result_cache.get(*cache_key)
         else:
             logger.info("Query being executed: \n {0}".format(select_statement))
-            self.sparql_get_with_post.setQuery(select_statement)
+        self._last_query.query = select_statement
         
-        #self.sparql_get_with_post.queryType = 'SELECT'
-        logger.info("Retrieving results ...")
-        try:
-            result = self.sparql_get_with_post.query()
+        return_format = TSV if result_format == "arrow" else JSON
+        if cached is not None:
+            logger.info("Retrieving results from the result cache ...")
+            result = _buffered_result(*cached, return_format)
+        else:
+            logger.info("Retrieving results ...")
+            result = self._download(self._execute_query(select_statement, return_format))
             logger.info("Query executed successfully!")
-        except TimeoutError as e:
-            logger.error(f"A timeout error occurred during query execution. The timeout was {self.timeout}: {e}")
-            raise e
-        except Exception as e:
-            logger.error(f"An error of type {type(e).__name__} occurred during query execution: {e}")
-            raise e
+
+            if cache_key is not None:
+                content, content_type = result.response.read(), result.info()["content-type"]
+                result.response.close()
+                self.result_cache.put(*cache_key, content, content_type)
+                result = _buffered_result(content, content_type, return_format)
 
         logger.info(f"The result has the return type {result._get_responseFormat()}.")
 
         if not as_df:
             logger.info("Returning raw result ...")
-            return result
+        elif result_format == "arrow":
+            logger.info("Converting results to columnar pandas dataframe ...")
+            result = _result_to_df(result, result_format, self.instrument)
         else:
             logger.info("Converting results to pandas dataframe ...")
-            df = to_df(result)
-            return df
+            result = _result_to_df(result, instrument=self.instrument)
+        return (result, select_statement) if return_query else result
 
 
-    def retrieve_snapshot(self, timestamp: Optional[datetime] = None) -> str:
+    def iter_query(self, select_statement: str, timestamp: Optional[datetime] = None, yn_timestamp_query: bool = True,
+                   batch_size: Optional[int] = None, result_format: str = "json") -> Iterator[Union[dict[str, Optional[str]], pd.DataFrame]]:
         """
-        Executes a predefined SPARQL construct query and returns a result set as string in n3 syntax. If :timestamp is provided 
-        the result set will be a snapshot of the data as of :timestamp. Otherwise, the most recent version of the data 
-        will be returned.
+        Executes the SPARQL select statement like query() but parses the response incrementally while it is 
+        read from the socket instead of materializing the whole result set. The memory consumption is 
+        bounded by :batch_size rows.
 
-        :param timestamp: The version timestamp for which a snapshot of the data as of :timestamp should be retrieved.
+        :param select_statement: A SPARQL query that is a select statement.
+        :param timestamp: The version/snapshot timestamp for which a snapshot of the data as of :timestamp should be retrieved.
+        :param yn_timestamp_query: If true, the select statement will be transformed into a timestamped query. 
+        :param batch_size: If None, single rows are yielded as dictionaries that map the variable names to their values. 
+        Otherwise, pandas dataframes with at most :batch_size rows are yielded.
+        :param result_format: The format in which the results are requested: 'json' or 'tsv'. 
+        TSV values are returned in N-Triples syntax as they are sent by the RDF-star store.
+        :return: An iterator over rows or batches of rows.
         """
 
-        snapshot_construct_query = open(self._templates_dir + "/snapshot_construct_query.txt", "r").read()
-        if timestamp:
-            snapshot_construct_query = snapshot_construct_query.format('"' + versioning_timestamp_format(timestamp) + '"')
+        if result_format not in ["json", "tsv"]:
+            raise WrongInputFormatException("The provided result format {0} is not supported. Use 'json' or 'tsv'.".format(result_format))
+        if batch_size is not None and batch_size < 1:
+            raise WrongInputFormatException("The batch size must be greater than 0.")
+
+        if yn_timestamp_query:
+            timestamped_query, version_timestamp = timestamp_query(query=select_statement, version_timestamp=timestamp, mode=self.mode, 
+                                                                   instrument=self.instrument)
+
+            logger.info("Timestamped query with timestamp {0} being executed:"
+                         " \n {1}".format(version_timestamp, timestamped_query))
+            select_statement = timestamped_query
         else:
-            snapshot_construct_query = snapshot_construct_query.format("NOW()")
+            logger.info("Query being executed: \n {0}".format(select_statement))
+
+        logger.info("Retrieving results as stream ...")
+        result = self._execute_query(select_statement, TSV if result_format == "tsv" else JSON)
+        logger.info("Query executed successfully!")
 
-        logger.info("Snapshot construct query being executed: \n {1}".format(snapshot_construct_query))
-        self.sparql_get_with_post.setReturnFormat('n3') 
-        self.sparql_get_with_post.addCustomHttpHeader('Accept', 'application/n-triples')
-        self.sparql_get_with_post.setQuery(snapshot_construct_query)
+        rows = iter_results(result)
+        if batch_size is None:
+            yield from rows
+            return
+
+        batch: list[dict[str, Optional[str]]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield pd.DataFrame(batch)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch)
+
+
+    def query_at(self, select_statement: str, timestamps: list[datetime], as_df: bool = True, 
+                 return_query: bool = False) -> Union[pd.DataFrame, Wrapper.QueryResult, tuple[Union[pd.DataFrame, Wrapper.QueryResult], str]]:
+        """
+        Executes the SPARQL select statement at every timestamp in :timestamps with a single request. 
+        The select statement is rewritten once (see timestamp_query_at) and the result set contains the 
+        snapshot results of all timestamps. 
+
+        :param select_statement: A SPARQL query that is a select statement. It must not use the variable ?ts.
+        :param timestamps: The version/snapshot timestamps for which snapshots of the data should be retrieved.
+        :param as_df: If true, the result set will be converted into a pandas dataframe with the column 'ts' 
+        that holds the snapshot timestamp of each row as datetime.
+        :param return_query: If true, a tuple of the result set and the timestamped query is returned.
+        """
+
+        with phase(self.instrument, "rewrite"):
+            timestamped_query, version_timestamps = timestamp_query_at(select_statement, timestamps, self.mode)
+
+        logger.info("Timestamped query with {0} timestamps being executed:"
+                     " \n {1}".format(len(version_timestamps), timestamped_query))
+        self._last_query.query = timestamped_query
 
         logger.info("Retrieving results ...")
+        result = self._download(self._execute_query(timestamped_query))
+        logger.info("Query executed successfully!")
+
+        if not as_df:
+            logger.info("Returning raw result ...")
+        else:
+            logger.info("Converting results to pandas dataframe ...")
+            result = _result_to_df(result, instrument=self.instrument)
+            result["ts"] = result["ts"].map(lambda ts: datetime.fromisoformat(ts[1:ts.rindex('"')]))
+        return (result, timestamped_query) if return_query else result
+
+
+    def query_delta(self, select_statement: str, timestamp_1: datetime, timestamp_2: datetime, as_df: bool = True,
+                    return_query: bool = False) -> Union[pd.DataFrame, Wrapper.QueryResult, tuple[Union[pd.DataFrame, Wrapper.QueryResult], str]]:
+        """
+        Executes the SPARQL select statement such that only those solutions are returned which differ between 
+        the snapshots as of :timestamp_1 and :timestamp_2 (see timestamp_query_delta). The computation of the 
+        differences happens in the RDF-star store, so that unchanged solutions are not transferred.
+
+        :param select_statement: A SPARQL query that is a select statement. 
+        It must not use the variables ?change and ?delta_change.
+        :param timestamp_1: The timestamp of the first (earlier) snapshot.
+        :param timestamp_2: The timestamp of the second (later) snapshot.
+        :param as_df: If true, the result set will be converted into a pandas dataframe with the column 'change' 
+        that marks each solution as 'added' or 'removed'.
+        :param return_query: If true, a tuple of the result set and the delta query is returned.
+        """
+
+        with phase(self.instrument, "rewrite"):
+            delta_query, version_timestamp_1, version_timestamp_2 = timestamp_query_delta(select_statement, timestamp_1, timestamp_2, self.mode)
+
+        logger.info("Delta query between {0} and {1} being executed:"
+                     " \n {2}".format(version_timestamp_1, version_timestamp_2, delta_query))
+        self._last_query.query = delta_query
+
+        logger.info("Retrieving results ...")
+        result = self._download(self._execute_query(delta_query))
+        logger.info("Query executed successfully!")
+
+        if not as_df:
+            logger.info("Returning raw result ...")
+        else:
+            logger.info("Converting results to pandas dataframe ...")
+            result = _result_to_df(result, instrument=self.instrument)
+            result["change"] = result["change"].map(lambda change: change.strip('"'))
+        return (result, delta_query) if return_query else result
+
+
+    def _snapshot_response(self, timestamp: Optional[datetime] = None) -> Wrapper.QueryResult:
+        """
+        Executes the snapshot construct query and returns the result without reading the response, 
+        which is streamed from the socket.
+        """
+
+        snapshot_construct_query = _snapshot_construct_query(self._templates_dir, timestamp)
+
+        logger.info("Snapshot construct query being executed: \n {0}".format(snapshot_construct_query))
+        logger.info("Retrieving results ...")
+        return self._execute_query(snapshot_construct_query, 'n3', 'application/n-triples')
+
+
+    def construct(self, construct_statement: str) -> str:
+        """
+        Executes the SPARQL construct statement as it is against the RDF-star store.
+
+        :param construct_statement: A SPARQL query that is a construct statement.
+        :return: The constructed triples in N-Triples syntax.
+        """
+
+        logger.info("Construct query being executed: \n {0}".format(construct_statement))
+        return self._execute_query(construct_statement, 'n3', 'application/n-triples').convert().decode("utf-8")
+
+
+    def execute_update(self, update_statement: str, invalidate_results: bool = True):
+        """
+        Executes the SPARQL update statement as it is against the RDF-star store. 
+
+        :param update_statement: A SPARQL update statement.
+        :param invalidate_results: As the effect of the update on the versioned triples is unknown, all cached results 
+        of the query endpoint are invalidated. Pass False for updates that do not touch the versioned triples, 
+        e.g. of temporary named graphs.
+        """
+
+        logger.info("Update being executed: \n {0}".format(update_statement))
+        if not invalidate_results:
+            self._execute_update(update_statement)
+            return
+        with self._invalidates_result_cache(datetime.min.replace(tzinfo=ZoneInfo("UTC"))):
+            self._execute_update(update_statement)
+
+
+    def retrieve_snapshot(self, timestamp: Optional[datetime] = None, dest: Optional[Union[str, os.PathLike, BinaryIO]] = None, 
+                          compress: bool = False, chunk_size: int = 65536) -> Optional[str]:
+        """
+        Executes a predefined SPARQL construct query and returns a result set as string in n3 syntax. If :timestamp is provided 
+        the result set will be a snapshot of the data as of :timestamp. Otherwise, the most recent version of the data 
+        will be returned. If :dest is provided, the N-Triples are streamed from the socket into :dest instead, 
+        so that the snapshot is never held in memory as a whole.
+
+        :param timestamp: The version timestamp for which a snapshot of the data as of :timestamp should be retrieved.
+        :param dest: A file path or a binary file object into which the snapshot is written. A file object is not closed.
+        :param compress: If true, the snapshot is written gzip-compressed into :dest.
+        :param chunk_size: The number of bytes that are read from the socket and written into :dest at once.
+        :return: The snapshot in n3 syntax or None if :dest is provided.
+        """
+
+        result = self._snapshot_response(timestamp)
+        if dest is None:
+            return result.convert().decode("utf-8")
+
+        logger.info("Writing snapshot into {0} ...".format(dest))
         try:
-            result = self.sparql_get_with_post.query()
-        except TimeoutError as e:
-            logger.error(f"A timeout error occurred during query execution. The timeout was {self.timeout}: {e}")
-            raise e
-        except Exception as e:
-            logger.error("An error occurred during query execution: {0}".format(e))
-            raise e
+            if isinstance(dest, (str, os.PathLike)):
+                with (gzip.open(dest, "wb") if compress else open(dest, "wb")) as f:
+                    shutil.copyfileobj(result.response, f, chunk_size)
+            elif compress:
+                with gzip.GzipFile(fileobj=dest, mode="wb") as f:
+                    shutil.copyfileobj(result.response, f, chunk_size)
+            else:
+                shutil.copyfileobj(result.response, dest, chunk_size)
+        finally:
+            result.response.close()
+        return None
 
-        converted_result = result.convert().decode("utf-8")
-        
-        # return to default behaviour
-        self.sparql_get_with_post.setReturnFormat('json') 
-        self.sparql_get_with_post.clearCustomHttpHeader('Accept')
 
-        return converted_result
+    def iter_snapshot(self, timestamp: Optional[datetime] = None) -> Iterator[str]:
+        """
+        Executes the same construct query as retrieve_snapshot but yields the snapshot triple by triple 
+        while it is read from the socket. Only the current line is held in memory.
+
+        :param timestamp: The version timestamp for which a snapshot of the data as of :timestamp should be retrieved.
+        :return: An iterator over the triples of the snapshot in N-Triples syntax (including the dot).
+        """
+
+        result = self._snapshot_response(timestamp)
+        try:
+            for line in io.TextIOWrapper(result.response, encoding="utf-8", newline="\n"):
+                line = line.rstrip("\r\n")
+                if line:
+                    yield line
+        finally:
+            result.response.close()
 
 
-    def insert(self, triples: Union[list[str], str], prefixes: Optional[dict[str, str]] = None, timestamp: Optional[datetime] = None, chunk_size: int = 1000):
+    def insert(self, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str, str]] = None, timestamp: Optional[datetime] = None, chunk_size: Union[int, str] = 1000,
+               max_concurrency: int = 1):
         """
         Inserts a list of nested triples into the RDF-star store by wrapping the provided triples with a valid_from (NOW()) and 
         "artificial" valid_until timestamp using the RDF-star paradigm. Each inserted triple has the following form 
@@ -463,55 +1921,126 @@ class TripleStoreEngine:
         "(<http://example.com/Obama> <http://example.com/president_of> <http://example.com/UnitedStates) 
         (<http://example.com/Hamilton>' '<http://example.com/occupation>' '<http://example.com/Formel1Driver)"
 
-        :param triples: A list of list of triples in n3 syntax (including the dot) or a string in the SPARQL syntax for the VALUES block.
+        :param triples: A list or any other iterable of triples in n3 syntax (including the dot), the path of an N-Triples file 
+        as pathlib.Path or a string in the SPARQL syntax for the VALUES block. Iterables and files are read lazily chunk by chunk, 
+        so that only the current chunk is held in memory. The input is not modified.
         :param prefixes: Prefixes that are used within :param triples.
         :param timestamp: If a timestamp is given, the inserted triples will be annotated with this timestamp.
         :param chunk_size: The maximum number of triples that are inserted during each iteration. If the dataset is greater than :chunk_size 
         the SPARQL updates are split into chunks where one chunk has maximum :chunk_size triples. It can be useful to experiment 
-        with this parameter and find the optimal chunk size for the target triple store.
+        with this parameter and find the optimal chunk size for the target triple store. 
+        With 'auto' the chunk size is adapted to the triple store while the chunks are sent (see _submit_rows_adaptive). 
+        Chunks that time out are split and sent again, which may apply their triples twice if the triple store 
+        completed the update after the timeout.
+        :param max_concurrency: The maximum number of chunks that are sent to the RDF-star store in parallel. 
+        Chunks that share triples with a chunk in flight wait for it. If a chunk fails, the remaining chunks are still sent 
+        and a ChunkSubmissionError that lists every failed chunk is raised afterwards. 
         :return:
         """
 
-        if len(triples) == 0:
-            logger.info("List is empty. No triples will be outdated.")
-            return
-
-        if prefixes:
-            sparql_prefixes = add_versioning_prefixes(prefixes, self.mode)
-        else:
-            sparql_prefixes = add_versioning_prefixes("", self.mode)
+        with self._invalidates_result_cache(timestamp):
+            self._submit_rows(_insert_rows(self._templates_dir, self.mode, triples, prefixes, timestamp), chunk_size, max_concurrency)
+        logger.info("Triples inserted.")
 
-        logger.info("Creating insert statement.")
-        statement = open(self._templates_dir + "/insert_triples.txt", "r").read()
 
-        if isinstance(triples, list):
-            logger.info("Creating insert statement: Build insert block.")
-            for i, line in enumerate(triples):
-                triples[i] = line[:-2]
-            insert_list = list(map(list, zip(['('] * len(triples), triples, [')'] * len(triples))))
-            insert_block = list(map(' '.join, insert_list))
-        else:
-            logger.info("Creating insert statement: Build insert block.")
-            insert_block = triples.splitlines()
+    def bulk_insert(self, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str, str]] = None, timestamp: Optional[datetime] = None, 
+                    method: str = "auto", import_dir: Optional[str] = None, file_threshold: int = _BULK_INSERT_THRESHOLD,
+                    chunk_size: Union[int, str] = 1000, max_concurrency: int = 1, poll_interval: float = 1.0,
+                    import_timeout: Optional[float] = DEFAULT_IMPORT_TIMEOUT):
+        """
+        Inserts triples like insert() but, for large inputs, writes their versioned form into a Turtle-star file 
+        and loads it with GraphDB's server file import, which is considerably faster than SPARQL updates. 
+        Each triple is written in the same form as by insert(), e.g. in decorator mode:
+            << << {s} {p} {o} >> vers:valid_from "{valid_from}"^^xsd:dateTime >> vers:valid_until "9999-12-31T00:00:00.000+02:00"^^xsd:dateTime .
+        The file is written into :import_dir, which must be GraphDB's server import directory (graphdb.workbench.importDirectory) 
+        or a directory that is mounted there, and it is removed after the import. 
+
+        :param triples: The triples to insert. See insert().
+        :param prefixes: Prefixes that are used within :param triples.
+        :param timestamp: The valid_from timestamp of the inserted triples. Files cannot use NOW(), 
+        so the current system timestamp is used if this parameter is None.
+        :param method: 'file' for the server file import, 'sparql' for insert() or 'auto' to use the server file import 
+        if :import_dir is given and there are more than :file_threshold triples.
+        :param import_dir: GraphDB's server import directory as seen from this process.
+        :param file_threshold: The number of triples above which 'auto' switches to the server file import.
+        :param chunk_size: See insert(). Only used with the 'sparql' method.
+        :param max_concurrency: See insert(). Only used with the 'sparql' method.
+        :param poll_interval: The number of seconds between two requests for the status of the import.
+        :param import_timeout: The number of seconds after which the server file import is given up. 
+        None to wait until GraphDB reports the import as done or failed.
+        :raises BulkImportFailed: If GraphDB rejects the import, reports an error or does not finish it within :import_timeout seconds.
+        """
 
-        logger.info("Inserting triples as chunks of {0} triples.".format(chunk_size))
-        for i in range(0, len(insert_block), chunk_size):
-            insert_chunk = "\n".join(insert_block[i:min(i+chunk_size, len(insert_block))])
-            if timestamp:
-                version_timestamp = versioning_timestamp_format(timestamp)
-                insert_statement = statement.format(sparql_prefixes, insert_chunk, '"' + version_timestamp + '"')
+        if method not in ["auto", "file", "sparql"]:
+            raise WrongInputFormatException("The provided method {0} is not supported. Use 'auto', 'file' or 'sparql'.".format(method))
+        if method == "file" and import_dir is None:
+            raise InputMissing("The server file import requires the GraphDB import directory :import_dir.")
+
+        if method == "auto" and import_dir is not None:
+            if isinstance(triples, str):
+                cnt_triples = len(triples.splitlines())
+            elif isinstance(triples, os.PathLike):
+                cnt_triples = sum(1 for _ in _n3_triples(triples))
+            elif hasattr(triples, "__len__"):
+                cnt_triples = len(triples)
             else:
-                insert_statement = statement.format(sparql_prefixes, insert_chunk, "NOW()")
-            self.sparql_post.setQuery(insert_statement)
+                # Only the first :file_threshold + 1 triples of other iterables are read ahead.
+                triples = iter(triples)
+                head = list(islice(triples, file_threshold + 1))
+                cnt_triples = len(head)
+                triples = chain(head, triples)
+            method = "file" if cnt_triples > file_threshold else "sparql"
+
+        if method in ["auto", "sparql"]:
+            self.insert(triples, prefixes, timestamp, chunk_size, max_concurrency)
+            return
+
+        rest_url, repository = _graphdb_rest_url(self.query_endpoint)
+        file_name = "starvers_bulk_insert_{0}.ttls".format(uuid.uuid4().hex)
+        file_path = os.path.join(import_dir, file_name)
+        session = (self.transport or get_transport()).session
+        auth = HTTPDigestAuth(self.credentials.user_name, self.credentials.pw) if self.credentials else None
+
+        logger.info("Writing triples into the server file {0}.".format(file_path))
+        with open(file_path, "w", encoding="utf-8") as f:
+            for line in _bulk_insert_lines(self._templates_dir, self.mode, triples, prefixes, timestamp):
+                f.write(line + "\n")
+
+        with self._invalidates_result_cache(timestamp):
             try:
-                self.sparql_post.query()
-            except TimeoutError as e:
-                logger.error(f"A timeout error occurred during query execution. The timeout was {self.timeout}: {e}")
-                raise e
+                start_server_file_import(rest_url, repository, file_name, session=session, auth=auth, timeout=self.timeout)
+                await_server_file_import(rest_url, repository, file_name, session=session, auth=auth, timeout=self.timeout, 
+                                         poll_interval=poll_interval, import_timeout=import_timeout)
+            finally:
+                os.remove(file_path)
+
         logger.info("Triples inserted.")
 
 
-    def update(self, old_triples: list[list[str]], new_triples: list[list[str]], prefixes: Optional[dict[str,str]] = None, chunk_size: int = 1000):
+    def apply_delta(self, insertions: Union[Iterable[str], str, os.PathLike], deletions: Union[Iterable[str], str, os.PathLike], timestamp: Optional[datetime] = None, 
+                    prefixes: Optional[dict[str, str]] = None, chunk_size: Union[int, str] = 1000, max_concurrency: int = 1):
+        """
+        Outdates :deletions and inserts :insertions like outdate() and insert() but sends both as one multi-operation 
+        SPARQL update per chunk. Each chunk outdates up to :chunk_size deletions and inserts up to :chunk_size insertions 
+        in a single request, which halves the number of requests and applies both parts of the chunk atomically. 
+        The deletions are outdated before the insertions are inserted.
+
+        :param insertions: Triples to insert. See insert().
+        :param deletions: Triples to outdate. See outdate().
+        :param timestamp: If a timestamp is given, the triples will be inserted and outdated with this timestamp. 
+        Otherwise, each request uses the execution timestamp of the RDF-star store (NOW()).
+        :param prefixes: Prefixes that are used within :insertions and :deletions.
+        :param chunk_size: The maximum number of insertions and deletions per request or 'auto' (see insert).
+        :param max_concurrency: See insert().
+        """
+
+        with self._invalidates_result_cache(timestamp):
+            self._submit_rows(_delta_rows(self._templates_dir, self.mode, insertions, deletions, prefixes, timestamp), chunk_size, max_concurrency)
+        logger.info("Delta applied.")
+
+
+    def update(self, old_triples: list[list[str]], new_triples: list[list[str]], prefixes: Optional[dict[str,str]] = None, chunk_size: Union[int, str] = 1000,
+               max_concurrency: int = 1):
         """
         Updates a list of triples by another list of triples. Both lists need to have the same dimensions. The first list 
         should contain triples in n3 syntax that are also present in the triple store and currently valid. Each triple in the 
@@ -530,44 +2059,19 @@ class TripleStoreEngine:
         :param old_triples: A list of valid triples in n3 syntax that should be updated.
         :param new_triples: A list of new values for the list :old_triples. Values which should not be updated must be None.
         :param prefixes: Prefixes that are used within :old_triples and :new_triples.
+        :param chunk_size: The maximum number of triples that are updated during each iteration or 'auto' (see insert).
+        :param max_concurrency: The maximum number of chunks that are sent to the RDF-star store in parallel. 
+        Chunks that share triples with a chunk in flight wait for it. If a chunk fails, the remaining chunks are still sent 
+        and a ChunkSubmissionError that lists every failed chunk is raised afterwards. 
         """
 
-        if len(old_triples) == 0:
-            logger.info("List is empty. No triples will be outdated.")
-            return
-
-        if len(old_triples) != len(new_triples):
-            raise WrongInputFormatException("Both lists old_triples and new_triples must have the same dimensions.")
-
-        if prefixes:
-            sparql_prefixes = add_versioning_prefixes(prefixes, self.mode)
-        else:
-            sparql_prefixes = add_versioning_prefixes("", self.mode)
-
-        logger.info("Create update statement")
-        template = open(self._templates_dir + "/update_triples.txt", "r").read()
-
-        update_block: list[str] = []
-        for old_triple, new_triple in zip(old_triples, new_triples):
-            if not (len(old_triple) == 3 and len(new_triple) == 3):
-                raise WrongInputFormatException("The old or new triple's length is not 3.")
-            newS, newP, newO = ["UNDEF" if v is None else v for v in new_triple]
-            update_block.append(f"({old_triple[0]} {old_triple[1]} {old_triple[2]} {newS} {newP} {newO})")
-        
-        logger.info("Updating triples as chunks of {0} triples.".format(chunk_size))
-        for i in range(0, len(update_block), chunk_size):
-            update_chunk = "\n".join(update_block[i:min(i+chunk_size, len(update_block))])
-            update_statement = template.format(sparql_prefixes, update_chunk)
-            self.sparql_post.setQuery(update_statement)
-            try:
-                self.sparql_post.query()
-            except TimeoutError as e:
-                logger.error(f"A timeout error occurred during query execution. The timeout was {self.timeout}: {e}")
-                raise e
+        with self._invalidates_result_cache():
+            self._submit_rows(_update_rows(self._templates_dir, self.mode, old_triples, new_triples, prefixes), chunk_size, max_concurrency)
         logger.info("Triples updated.")
         
 
-    def outdate(self, triples: Union[list[str], str], prefixes: Optional[dict[str,str]] = None, timestamp: Optional[datetime] = None, chunk_size: int = 1000):
+    def outdate(self, triples: Union[Iterable[str], str, os.PathLike], prefixes: Optional[dict[str,str]] = None, timestamp: Optional[datetime] = None, chunk_size: Union[int, str] = 1000,
+                max_concurrency: int = 1):
         """
         Outdates a list of triples. The provided triples are matched against the latest snapshot of the RDF-star dataset 
         and their valid_until timestamps get replaced by the query execution timestamp (SPARQL NOW() function) or the given :timestamp.
@@ -582,53 +2086,23 @@ class TripleStoreEngine:
         "(<http://example.com/Obama> <http://example.com/president_of> <http://example.com/UnitedStates) 
         (<http://example.com/Hamilton>' '<http://example.com/occupation>' '<http://example.com/Formel1Driver)"
 
-        :param triples: A list of list of triples in n3 syntax (including the dot) or a string in the SPARQL syntax for the VALUES block.
+        :param triples: A list or any other iterable of triples in n3 syntax (including the dot), the path of an N-Triples file 
+        as pathlib.Path or a string in the SPARQL syntax for the VALUES block. Iterables and files are read lazily chunk by chunk, 
+        so that only the current chunk is held in memory. The input is not modified.
         :param prefixes: Prefixes that are used within :param triples.
         :param timestamp: If a timestamp is given, the outdated triples will be annotated with this timestamp.
         :param chunk_size: The maximum number of triples that are outdated during each iteration. If the dataset is greater than :chunk_size 
         the SPARQL updates are split into chunks where one chunk has maximum :chunk_size triples. It can be useful to experiment 
-        with this parameter and find the optimal chunk size for the target triple store.
+        with this parameter and find the optimal chunk size for the target triple store. 
+        With 'auto' the chunk size is adapted to the triple store (see insert).
+        :param max_concurrency: The maximum number of chunks that are sent to the RDF-star store in parallel. 
+        Chunks that share triples with a chunk in flight wait for it. If a chunk fails, the remaining chunks are still sent 
+        and a ChunkSubmissionError that lists every failed chunk is raised afterwards. 
         :return:
         """
 
-        if len(triples) == 0:
-            logger.info("List is empty. No triples will be outdated.")
-            return
-
-        if prefixes:
-            sparql_prefixes = add_versioning_prefixes(prefixes, self.mode)
-        else:
-            sparql_prefixes = add_versioning_prefixes("", self.mode)
-
-        logger.info("Creating outdate statement.")
-        statement = open(self._templates_dir + "/outdate_triples.txt", "r").read()
-
-        if isinstance(triples, list):
-            logger.info("Creating outdate statement:Build outdate block.")
-            for i, line in enumerate(triples):
-                triples[i] = line[:-2]
-            outdate_list = list(map(list, zip(['('] * len(triples), triples, [')'] * len(triples))))
-            outdate_block = list(map(' '.join, outdate_list))
-        else:
-            logger.info("Creating outdate statement: Build outdate block.")
-            outdate_block = triples.splitlines()
-
-        
-        logger.info("Outdating triples as chunks of {0} triples.".format(chunk_size))
-        for i in range(0, len(outdate_block), chunk_size):
-            outdate_chunk = "\n".join(outdate_block[i:min(i+chunk_size, len(outdate_block))])
-            if timestamp:
-                version_timestamp = versioning_timestamp_format(timestamp)
-                outdate_statement = statement.format(sparql_prefixes, outdate_chunk, '"' + version_timestamp + '"')
-            else:
-                outdate_statement = statement.format(sparql_prefixes, outdate_chunk, "NOW()")
-            self.sparql_post.setQuery(outdate_statement)
-            
-            try:
-                self.sparql_post.query()
-            except TimeoutError as e:
-                logger.error(f"A timeout error occurred during query execution. The timeout was {self.timeout}: {e}")
-                raise e
+        with self._invalidates_result_cache(timestamp):
+            self._submit_rows(_outdate_rows(self._templates_dir, self.mode, triples, prefixes, timestamp), chunk_size, max_concurrency)
         logger.info("Triples outdated.")
 
     
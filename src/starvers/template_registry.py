@@ -0,0 +1,162 @@
+import os
+import re
+import string
+import threading
+from functools import lru_cache
+from typing import Optional, Union
+
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+# Placeholders of the templates in starvers/templates, e.g. {0}, and of the .sparql queries of the starvers server, e.g. {:graph}.
+FORMAT_SYNTAX = "format"
+NAMED_SYNTAX = "named"
+_NAMED_PLACEHOLDER = re.compile(r"\{:(\w+)\}")
+
+
+class Template:
+    """
+    A template that is split into its literal fragments and placeholders once, so that filling it
+    only copies the fragment list, puts the values into the slots of the placeholders and joins the list.
+
+    With :syntax 'format', the template uses the placeholders of str.format, e.g. {0} and {{ for a literal brace.
+    Format specs and conversions are not supported. With :syntax 'named', it uses placeholders like {:graph}
+    and all other braces are literal.
+    """
+
+    def __init__(self, text: str, syntax: str = FORMAT_SYNTAX):
+        if syntax not in (FORMAT_SYNTAX, NAMED_SYNTAX):
+            raise ValueError("The template syntax {0} is not supported. Use '{1}' or '{2}'.".format(syntax, FORMAT_SYNTAX, NAMED_SYNTAX))
+
+        self.text = text
+        self.syntax = syntax
+        self._fragments: list[Optional[str]] = []
+        self._slots: list[tuple[int, Union[int, str]]] = []
+        # Statements that are sent as they are, e.g. the ones of the connection test, contain braces 
+        # that are no placeholders. They can still be used via text but not be filled.
+        self._error: Optional[str] = None
+
+        if syntax == FORMAT_SYNTAX:
+            try:
+                parsed = list(string.Formatter().parse(text))
+            except ValueError as e:
+                parsed = []
+                self._error = str(e)
+            for literal, field, spec, conversion in parsed:
+                if literal:
+                    self._fragments.append(literal)
+                if field is None:
+                    continue
+                if spec or conversion or not (field.isdigit() or field.isidentifier()):
+                    self._error = "Format specs, conversions, automatic field numbering and " \
+                                  "attribute or index lookups are not supported."
+                    break
+                self._slots.append((len(self._fragments), int(field) if field.isdigit() else field))
+                self._fragments.append(None)
+        else:
+            for i, part in enumerate(_NAMED_PLACEHOLDER.split(text)):
+                if i % 2 == 1:
+                    self._slots.append((len(self._fragments), part))
+                    self._fragments.append(None)
+                elif part:
+                    self._fragments.append(part)
+
+        self.fields = frozenset(field for _, field in self._slots)
+
+
+    def format(self, *args: object, **kwargs: object) -> str:
+        """
+        Fills the template. Positional placeholders are taken from :args and named placeholders from :kwargs.
+        Values that are not strings are converted with str(), as with str.format.
+        """
+
+        if self._error is not None:
+            raise ValueError("The template cannot be filled: {0}".format(self._error))
+
+        fragments = self._fragments.copy()
+        for slot, field in self._slots:
+            value = args[field] if type(field) is int else kwargs[field]
+            fragments[slot] = value if type(value) is str else str(value)
+        return "".join(fragments)
+
+
+    def __str__(self):
+        return self.text
+
+
+class TemplateRegistry:
+    """
+    The templates of a directory and its subdirectories, keyed by their path relative to the directory
+    without the file extension, e.g. 'insert_triples' or 'test_connection/test_connection_select'.
+    All templates are read and split once on the first access.
+    """
+
+    def __init__(self, directory: str, extension: str = ".txt", syntax: str = FORMAT_SYNTAX):
+        """
+        :param directory: The directory of the templates.
+        :param extension: The file extension of the templates. Other files are ignored.
+        :param syntax: The placeholder syntax of the templates (see Template).
+        """
+
+        self.directory = directory
+        self.extension = extension
+        self.syntax = syntax
+        self._templates: Optional[dict[str, Template]] = None
+        self._lock = threading.Lock()
+
+
+    def _load(self) -> dict[str, Template]:
+        templates = {}
+        for root, _, files in os.walk(self.directory):
+            for file in files:
+                if not file.endswith(self.extension):
+                    continue
+                path = os.path.join(root, file)
+                name = os.path.relpath(path, self.directory)[:-len(self.extension)].replace(os.sep, "/")
+                with open(path, "r") as f:
+                    templates[name] = Template(f.read(), self.syntax)
+        return templates
+
+
+    def _all(self) -> dict[str, Template]:
+        templates = self._templates
+        if templates is None:
+            with self._lock:
+                if self._templates is None:
+                    self._templates = self._load()
+                templates = self._templates
+        return templates
+
+
+    def __getitem__(self, name: str) -> Template:
+        try:
+            return self._all()[name]
+        except KeyError:
+            raise KeyError("There is no template {0}{1} in {2}.".format(name, self.extension, self.directory)) from None
+
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._all()
+
+
+    def names(self) -> list[str]:
+        return sorted(self._all())
+
+
+    def reload(self):
+        """
+        Reads the templates from the directory again on the next access.
+        """
+
+        with self._lock:
+            self._templates = None
+
+
+@lru_cache(maxsize=None)
+def get_templates(templates_dir: str) -> TemplateRegistry:
+    """
+    :param templates_dir: A directory with templates in the str.format syntax, e.g. starvers/templates/decorator.
+    :return: The process-wide registry of the templates in :templates_dir.
+    """
+
+    return TemplateRegistry(os.path.normpath(templates_dir))
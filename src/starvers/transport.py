@@ -0,0 +1,174 @@
+import io
+import threading
+import logging
+import urllib.error
+from typing import Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth, HTTPDigestAuth
+from urllib3.util.retry import Retry
+from SPARQLWrapper import SPARQLWrapper, DIGEST
+from SPARQLWrapper.SPARQLExceptions import QueryBadFormed, EndPointNotFound, Unauthorized, URITooLong, \
+    EndPointInternalError
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+
+class HTTPTransport:
+    """
+    A requests session with keep-alive connection pools that is shared by all SPARQL and REST calls
+    against the RDF-star store. Connections are reused across requests instead of opening a new TCP
+    connection for every query or update chunk.
+
+    Failed connection attempts are retried with exponential backoff for every method. Responses with the
+    status codes 502, 503 and 504 and broken reads are only retried for idempotent methods (GET, PUT, DELETE, ...),
+    because a SPARQL update sent via POST might have been applied already.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR):
+        """
+        :param pool_size: The number of connections that are kept alive per host.
+        :param retries: The maximum number of retries per request.
+        :param backoff_factor: The sleep time between two retries is :backoff_factor * 2 ** (retry - 1) seconds.
+        """
+
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+        retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=[502, 503, 504],
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """
+    :return: The shared transport. It is created with the default settings on first use.
+    """
+
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HTTPTransport()
+    return _transport
+
+
+def configure_transport(pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES,
+                        backoff_factor: float = DEFAULT_BACKOFF_FACTOR) -> HTTPTransport:
+    """
+    Replaces the shared transport by one with the given settings. The connections of the previous
+    transport are closed.
+
+    :param pool_size: The number of connections that are kept alive per host.
+    :param retries: The maximum number of retries per request.
+    :param backoff_factor: The sleep time between two retries is :backoff_factor * 2 ** (retry - 1) seconds.
+    :return: The new shared transport.
+    """
+
+    global _transport
+    with _transport_lock:
+        previous = _transport
+        _transport = HTTPTransport(pool_size, retries, backoff_factor)
+    if previous is not None:
+        previous.close()
+    logger.info(f"HTTP transport configured with pool size {pool_size}, {retries} retries "
+                f"and backoff factor {backoff_factor}.")
+    return _transport
+
+
+def raise_for_status(url: str, status_code: int, reason: str, headers, content: bytes):
+    """
+    Raises the exception that SPARQLWrapper raises for the HTTP status code :status_code, i.e. SPARQLWrapper's 
+    exceptions for the status codes 400, 401, 404, 414 and 500 and urllib.error.HTTPError for other error codes.
+    """
+
+    if status_code == 400:
+        raise QueryBadFormed(content)
+    elif status_code == 404:
+        raise EndPointNotFound(content)
+    elif status_code == 401:
+        raise Unauthorized(content)
+    elif status_code == 414:
+        raise URITooLong(content)
+    elif status_code == 500:
+        raise EndPointInternalError(content)
+    elif status_code >= 400:
+        raise urllib.error.HTTPError(url, status_code, reason, headers, io.BytesIO(content))
+
+
+class BufferedResponse(io.BytesIO):
+    """
+    A fully read response body with the interface of urllib's response that SPARQLWrapper's QueryResult expects.
+    """
+    def __init__(self, content: bytes, headers):
+        super().__init__(content)
+        self.headers = headers
+
+    def info(self):
+        return self.headers
+
+
+class PooledSPARQLWrapper(SPARQLWrapper):
+    """
+    A SPARQLWrapper that sends its requests over the shared HTTPTransport instead of urllib.
+    The request itself is built by SPARQLWrapper, errors are raised as the same exceptions as by SPARQLWrapper,
+    i.e. SPARQLWrapper's exceptions for the status codes 400, 401, 404, 414 and 500, urllib.error.HTTPError for other
+    status codes, URLError for connection errors and TimeoutError for timeouts.
+
+    Select results are streamed from the socket. The responses of updates are read right away
+    so that the connection is returned to the pool.
+    """
+
+    def __init__(self, endpoint: str, updateEndpoint: Optional[str] = None,
+                 transport: Optional[HTTPTransport] = None, **kwargs):
+        super().__init__(endpoint, updateEndpoint, **kwargs)
+        self.transport = transport
+
+    def _query(self) -> Tuple[io.IOBase, str]:
+        request = self._createRequest()
+        transport = self.transport or get_transport()
+
+        auth = None
+        if self.user and self.passwd:
+            auth = HTTPDigestAuth(self.user, self.passwd) if self.http_auth == DIGEST \
+                else HTTPBasicAuth(self.user, self.passwd)
+            # SPARQLWrapper adds the basic authorization header itself.
+            request.remove_header("Authorization")
+
+        try:
+            response = transport.session.request(request.get_method(), request.full_url, data=request.data,
+                                                 headers=dict(request.header_items()), auth=auth,
+                                                 timeout=self.timeout, stream=True)
+        except requests.exceptions.Timeout as e:
+            raise TimeoutError(str(e)) from e
+        except requests.exceptions.ConnectionError as e:
+            raise urllib.error.URLError(e) from e
+
+        if response.status_code >= 400:
+            raise_for_status(request.full_url, response.status_code, response.reason, response.headers, response.content)
+
+        if self.isSparqlUpdateRequest():
+            return BufferedResponse(response.content, response.headers), self.returnFormat
+
+        response.raw.decode_content = True
+        # Otherwise the response reports itself as closed once the body is read, which breaks io wrappers
+        # such as TextIOWrapper that check it before every read.
+        response.raw.auto_close = False
+        return response.raw, self.returnFormat
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
+from typing import Optional
 
 class Settings(BaseSettings):
     environment: str = Field(alias='ENVIRONMENT')
@@ -10,6 +11,16 @@ class Settings(BaseSettings):
     graph_db_url_post_endpoint: str = Field(alias='GRAPH_DB_URL_POST')
     evaluation_mode: bool = Field(alias="EVALUATION_MODE", default=False)
     timeout: int = Field(alias="TIMEOUT", default=115)
+    http_pool_size: int = Field(alias="HTTP_POOL_SIZE", default=10)
+    http_retries: int = Field(alias="HTTP_RETRIES", default=3)
+    http_backoff_factor: float = Field(alias="HTTP_BACKOFF_FACTOR", default=0.5)
+    graph_db_import_dir: str = Field(alias="GRAPH_DB_IMPORT_DIR", default="/graphdb-import")
+    graph_db_import_timeout: float = Field(alias="GRAPH_DB_IMPORT_TIMEOUT", default=3600)
+    bulk_insert_threshold: int = Field(alias="BULK_INSERT_THRESHOLD", default=100000)
+    result_cache_size_mb: int = Field(alias="RESULT_CACHE_SIZE_MB", default=0)
+    result_cache_dir: Optional[str] = Field(alias="RESULT_CACHE_DIR", default=None)
+    dataset_metadata_ttl: float = Field(alias="DATASET_METADATA_TTL", default=60)
+    query_instrumentation: bool = Field(alias="QUERY_INSTRUMENTATION", default=False)
 
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8')
 
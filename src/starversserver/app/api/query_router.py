@@ -5,18 +5,18 @@ REST endpoints for executing SPARQL queries against versioned RDF datasets.
 Supports querying the latest version or any past snapshot via an optional timestamp.
 """
 
-from asyncio.log import logger
 from datetime import datetime
-from io import BytesIO
-from turtle import pd
 from typing import Annotated
-from uuid import UUID
-from flask import send_file
 
+import pandas as pd
 from fastapi import APIRouter, Body, Query
+from fastapi.responses import Response
 
-from app.utils.starvers.starvers import TripleStoreEngine
-from app.AppConfig import Settings
+from app.services.engine_registry import get_async_engine
+from app.services.query_metrics import get_query_collector
+from app.LoggingConfig import get_logger
+
+logger = get_logger(__name__)
 
 tag = "query"
 
@@ -28,6 +28,18 @@ tag_metadata = {
 }
 
 
+@router.get("/metrics/phases")
+async def get_query_phases():
+    """
+    Return the count, total, mean and percentiles (in seconds) of the durations of each query and update phase
+    since the server started. Empty unless QUERY_INSTRUMENTATION is enabled.
+    """
+    collector = get_query_collector()
+    if collector is None:
+        return []
+    return collector.summary().astype(object).where(lambda df: df.notna(), None).to_dict(orient="records")
+
+
 @router.get("/{repo_name}")
 async def query_dataset(
     repo_name: str,
@@ -43,9 +55,7 @@ async def query_dataset(
     - **timestamp**: if provided, the query is evaluated against the snapshot at that point in time.
     - **query_as_timestamped**: when False the query runs without time-bounding (returns the raw graph).
     """
-    graph_db_get_endpoint = Settings().graph_db_url_get_endpoint.replace('{:repo_name}', repo_name)
-    graph_db_post_endpoint = Settings().graph_db_url_post_endpoint.replace('{:repo_name}', repo_name)
-    starvers_engine = TripleStoreEngine(graph_db_get_endpoint, graph_db_post_endpoint)
+    starvers_engine = get_async_engine(repo_name)
 
     if timestamp is not None and query_as_timestamped:
         logger.info(f"Execute timestamped query with timestamp={timestamp}")
@@ -53,9 +63,8 @@ async def query_dataset(
         logger.info("Execute query without timestamp")
     
     result_set_df = pd.DataFrame()
-    timestamped_query = ""
     try:
-        result_set_df = starvers_engine.query(query, timestamp, query_as_timestamped)
+        result_set_df = await starvers_engine.query(query, timestamp, query_as_timestamped)
     except TimeoutError as e:
         # Does only catch timeout from the http request, not the database query itself, 
         # which can have a different timeout.
@@ -68,10 +77,7 @@ async def query_dataset(
 
     csv_string = result_set_df.to_csv(index=False)
 
-    # Encode the string into bytes and wrap it with BytesIO
-    csv_buffer = BytesIO(csv_string.encode("utf-8"))
-    csv_buffer.seek(0)
-
-    return send_file(csv_buffer, mimetype="text/csv", as_attachment=True, download_name="query_result.csv"), timestamped_query
+    return Response(content=csv_string.encode("utf-8"), media_type="text/csv",
+                    headers={"Content-Disposition": 'attachment; filename="query_result.csv"'})
     
 
@@ -5,14 +5,13 @@ import plotly.graph_objects as go
 import networkx as nx
 from typing import List, Dict, Any, Optional, Tuple
 
-# Triple Store API
-from app.utils.starvers.starvers import TripleStoreEngine
+# Triple Store API and Dataset Metadata cache
+from app.services.engine_registry import get_engine, get_dataset_metadata
 # Dataset Metadata manager
-from app.services.dataset_repository import get_dataset_metadata_by_repo_name, get_snapshot_stats
+from app.services.dataset_repository import get_snapshot_stats
 # Database manager
 from app.persistance.Database import get_session
 from app.enums.TimeAggregationEnum import TimeAggregation
-from app.AppConfig import Settings
 from app.LoggingConfig import get_logger
 
 logger: Logger = get_logger(__name__)
@@ -20,20 +19,15 @@ logger: Logger = get_logger(__name__)
 class GuiContr:
     def __init__(self, repo_name: str = "orkg_v2"):
         self.repo_name = repo_name
-        self.__graph_db_get_endpoint = Settings().graph_db_url_get_endpoint.replace('{:repo_name}', repo_name)
-        self.__graph_db_post_endpoint = Settings().graph_db_url_post_endpoint.replace('{:repo_name}', repo_name)
-        self.__starvers_engine = TripleStoreEngine(self.__graph_db_get_endpoint, self.__graph_db_post_endpoint,
-        skip_connection_test=True, timeout=Settings().timeout)
+        self.__starvers_engine = get_engine(repo_name)
         
         try:
-            session = next(get_session())
-            self.dataset_infos = get_dataset_metadata_by_repo_name(repo_name, session)
+            self.dataset_infos = get_dataset_metadata(repo_name)
         except (Exception, RuntimeError) as e:
             logger.error(f"Values could not be retrieved from the Postgres database. Original message: {str(e)}")
             raise RuntimeError(f"Failed to fetch dataset metadata: {e}")
         
-        session.close()
-        logger.info(f"GET endpoint: {self.__graph_db_get_endpoint}\nPOST endpoint: {self.__graph_db_post_endpoint}")
+        logger.info(f"GET endpoint: {self.__starvers_engine.query_endpoint}\nPOST endpoint: {self.__starvers_engine.update_endpoint}")
 
 
     def query(self, query: str, timestamp: datetime = None, query_as_timestamped: bool = True) -> pd.DataFrame:
@@ -45,8 +39,8 @@ class GuiContr:
         result_set_df = pd.DataFrame()
         timestamped_query = ""
         try:
-            result_set_df = self.__starvers_engine.query(query, timestamp, query_as_timestamped)
-            timestamped_query = self.__starvers_engine.timestamped_query
+            result_set_df, timestamped_query = self.__starvers_engine.query(query, timestamp, query_as_timestamped,
+                                                                            return_query=True)
         except TimeoutError as e:
             # Does only catch timeout from the http request, not the database query itself, 
             # which can have a different timeout.
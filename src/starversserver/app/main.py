@@ -9,7 +9,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 # API and Access
+from app.AppConfig import Settings
 from app.LoggingConfig import get_logger, setup_logging
+from app.utils.starvers.transport import configure_transport
+from app.utils.starvers.async_engine import configure_async_transport, get_async_transport
 from app.persistance.Database import Session, engine, create_db_and_tables
 from app.api import mock_router, management_router, query_router
 # Models
@@ -31,6 +34,10 @@ LOG = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
+    LOG.info("Configuring HTTP connection pool for GraphDB...")
+    configure_transport(Settings().http_pool_size, Settings().http_retries, Settings().http_backoff_factor)
+    await configure_async_transport(Settings().http_pool_size, Settings().http_retries)
+
     LOG.info("Creating database tables...")
     create_db_and_tables()
 
@@ -44,6 +51,7 @@ async def lifespan(app: FastAPI):
     yield
 
     mock_router.tl.stop()
+    await get_async_transport().aclose()
 
 
 # ---------------------------------------------------------------------------
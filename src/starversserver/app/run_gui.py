@@ -1,5 +1,8 @@
 from app.gui.routes import routes
+from app.AppConfig import Settings
 from app.LoggingConfig import get_logger, setup_logging
+from app.utils.starvers.transport import configure_transport
+from app.services.result_cache import disable_result_cache
 import os
 
 from flask import Flask
@@ -27,6 +30,10 @@ app.secret_key = os.environ['FLASK_SECRET_KEY']
 
 app.register_blueprint(routes)
 
+configure_transport(Settings().http_pool_size, Settings().http_retries, Settings().http_backoff_factor)
+# The versioning pipeline runs in the API process, so its writes would never invalidate a cache in this process
+disable_result_cache()
+
 if __name__ == "__main__":
     setup_logging()
     logger.info("Starting Flask application...")
@@ -69,15 +69,7 @@ class IterativeDeltaCalculator(DeltaCalculator):
 
         # Query the current version from the triple store via CONSTRUCT
         self.LOG.info(f"[{self.repository_name}] Iterative: querying current version from triple store.")
-        self.sparql_engine.sparql_get_with_post.setReturnFormat("n3")
-        self.sparql_engine.sparql_get_with_post.addCustomHttpHeader("Accept", "application/n-triples")
-        self.sparql_engine.sparql_get_with_post.setQuery(get_construct_all_versioned_template(version_timestamp))
-        stored_n3_str = self.sparql_engine.sparql_get_with_post.query().convert().decode("utf-8")
-
-        # Restore default headers
-        self.sparql_engine.sparql_get_with_post.setReturnFormat("json")
-        self.sparql_engine.sparql_get_with_post.clearCustomHttpHeader("Accept")
-
+        stored_n3_str = self.sparql_engine.construct(get_construct_all_versioned_template(version_timestamp))
         stored_triples = set(to_list(stored_n3_str))
 
         # Set difference gives us the delta
@@ -102,26 +94,17 @@ class SparqlDeltaCalculator(DeltaCalculator):
     """
 
     def calculate_delta(self, version_timestamp: datetime.datetime) -> Tuple[List[str], List[str]]:
-        self.sparql_engine.sparql_get_with_post.setReturnFormat("n3")
-        self.sparql_engine.sparql_get_with_post.addCustomHttpHeader("Accept", "application/n-triples")
-
         # Query insertions (triples in the new graph but not in the versioned store)
         self.LOG.info(f"[{self.repository_name}] SPARQL: querying delta insertions between the last version at {version_timestamp} and the new graph.")
-        self.sparql_engine.sparql_get_with_post.setQuery(
+        insertions = to_list(self.sparql_engine.construct(
             get_delta_query_insertions_template(version_timestamp, self.tracking_task.name_temp())
-        )
-        insertions = to_list(self.sparql_engine.sparql_get_with_post.query().convert().decode("utf-8"))
+        ))
 
         # Query deletions (triples in the versioned store but not in the new graph)
         self.LOG.info(f"[{self.repository_name}] SPARQL: querying delta deletions between the last version at {version_timestamp} and the new graph.")
-        self.sparql_engine.sparql_get_with_post.setQuery(
+        deletions = to_list(self.sparql_engine.construct(
             get_delta_query_deletions_template(version_timestamp, self.tracking_task.name_temp())
-        )
-        deletions = to_list(self.sparql_engine.sparql_get_with_post.query().convert().decode("utf-8"))
-
-        # Restore default headers
-        self.sparql_engine.sparql_get_with_post.setReturnFormat("json")
-        self.sparql_engine.sparql_get_with_post.clearCustomHttpHeader("Accept")
+        ))
 
         self.LOG.info(f"[{self.repository_name}] SPARQL delta: +{len(insertions)} / -{len(deletions)}")
         return insertions, deletions
@@ -130,6 +113,5 @@ class SparqlDeltaCalculator(DeltaCalculator):
         """Drop the temporary named graph from the triple store."""
         temp_graph = self.tracking_task.name_temp()
         self.LOG.info(f"[{self.repository_name}] SPARQL: dropping temp graph '{temp_graph}'.")
-        self.sparql_engine.sparql_post.setQuery(get_drop_graph_template(temp_graph))
-        self.sparql_engine.sparql_post.query()
+        self.sparql_engine.execute_update(get_drop_graph_template(temp_graph), invalidate_results=False)
         self.LOG.info(f"[{self.repository_name}] SPARQL: temp graph '{temp_graph}' dropped.")
@@ -0,0 +1,153 @@
+"""
+engine_registry.py
+
+Process-wide registry of the engines that talk to the GraphDB repositories of the tracked datasets,
+and a cache for the dataset metadata shown by the GUI.
+
+Engines are created once per repository and reused by the routers, the GUI controller, the versioning
+pipeline and the metrics service, so that a request does not set up a new engine.
+The routers and the GUI use engines with the request TIMEOUT. The versioning pipeline uses its own engine
+without a timeout, because loading and versioning a large snapshot can take much longer.
+All engines send their requests over the shared connection pool of the starvers transport.
+
+TripleStoreEngine and AsyncTripleStoreEngine keep no per-request state and are shared by all threads.
+The SPARQLWrapper of the metrics service keeps the query of the current request in its own state
+and is therefore handed out per thread.
+
+The metadata cache is invalidated by tracking_service and the polling task whenever they change a
+dataset. Other processes (e.g. the GUI) do not see these invalidations and re-read the metadata after
+DATASET_METADATA_TTL seconds.
+"""
+
+import threading
+import time
+from typing import Optional, Tuple
+
+from SPARQLWrapper import SPARQLWrapper
+
+from app.utils.starvers.starvers import TripleStoreEngine
+from app.utils.starvers.async_engine import AsyncTripleStoreEngine
+from app.persistance.graphdb.GraphDatabaseUtils import create_engine
+from app.persistance.Database import Session, engine as db_engine
+from app.services.dataset_repository import get_dataset_metadata_by_repo_name
+from app.services.result_cache import get_result_cache
+from app.services.query_metrics import get_query_collector
+from app.AppConfig import Settings
+from app.LoggingConfig import get_logger
+
+LOG = get_logger(__name__)
+
+_lock = threading.Lock()
+_local = threading.local()
+_engines: dict[Tuple[str, Optional[float]], TripleStoreEngine] = {}
+_async_engines: dict[str, AsyncTripleStoreEngine] = {}
+_metadata: dict[str, Tuple[float, Tuple]] = {}
+
+# Default of get_engine's timeout argument, which stands for Settings().timeout.
+_REQUEST_TIMEOUT = object()
+
+
+def _endpoints(repo_name: str) -> Tuple[str, str]:
+    get_endpoint = Settings().graph_db_url_get_endpoint.replace('{:repo_name}', repo_name)
+    post_endpoint = Settings().graph_db_url_post_endpoint.replace('{:repo_name}', repo_name)
+    return get_endpoint, post_endpoint
+
+
+def _thread_local(name: str) -> dict:
+    registry = getattr(_local, name, None)
+    if registry is None:
+        registry = {}
+        setattr(_local, name, registry)
+    return registry
+
+
+# ---------------------------------------------------------------------------
+# Engines
+# ---------------------------------------------------------------------------
+
+def get_engine(repo_name: str, timeout=_REQUEST_TIMEOUT) -> TripleStoreEngine:
+    """
+    Return the TripleStoreEngine for the given repository.
+
+    :param repo_name: The name of the GraphDB repository.
+    :param timeout: The timeout of the engine in seconds. None for no timeout. Defaults to TIMEOUT from the settings.
+    Engines with different timeouts are created and cached separately.
+    """
+    if timeout is _REQUEST_TIMEOUT:
+        timeout = Settings().timeout
+    key = (repo_name, timeout)
+    engine = _engines.get(key)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(key)
+            if engine is None:
+                get_endpoint, post_endpoint = _endpoints(repo_name)
+                LOG.info(f"[{repo_name}] Creating TripleStoreEngine for {get_endpoint} with timeout {timeout}.")
+                engine = TripleStoreEngine(get_endpoint, post_endpoint, skip_connection_test=True,
+                                           timeout=timeout, result_cache=get_result_cache(),
+                                           instrument=get_query_collector())
+                _engines[key] = engine
+    return engine
+
+
+def get_async_engine(repo_name: str) -> AsyncTripleStoreEngine:
+    """
+    Return the AsyncTripleStoreEngine for the given repository.
+    """
+    engine = _async_engines.get(repo_name)
+    if engine is None:
+        with _lock:
+            engine = _async_engines.get(repo_name)
+            if engine is None:
+                get_endpoint, post_endpoint = _endpoints(repo_name)
+                LOG.info(f"[{repo_name}] Creating AsyncTripleStoreEngine for {get_endpoint}.")
+                engine = AsyncTripleStoreEngine(get_endpoint, post_endpoint, timeout=Settings().timeout,
+                                                result_cache=get_result_cache(), instrument=get_query_collector())
+                _async_engines[repo_name] = engine
+    return engine
+
+
+def get_metrics_engine(repo_name: str) -> SPARQLWrapper:
+    """
+    Return the calling thread's CSV SPARQLWrapper (see create_engine) for the given repository.
+    """
+    engines = _thread_local("metrics_engines")
+    engine = engines.get(repo_name)
+    if engine is None:
+        engine = create_engine(repo_name)
+        engines[repo_name] = engine
+    return engine
+
+
+# ---------------------------------------------------------------------------
+# Dataset metadata
+# ---------------------------------------------------------------------------
+
+def get_dataset_metadata(repo_name: str) -> Optional[Tuple]:
+    """
+    Return the metadata tuple of get_dataset_metadata_by_repo_name, cached for DATASET_METADATA_TTL seconds.
+    Unknown repositories are not cached.
+    """
+    now = time.monotonic()
+    cached = _metadata.get(repo_name)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    with Session(db_engine) as session:
+        metadata = get_dataset_metadata_by_repo_name(repo_name, session)
+
+    if metadata is not None:
+        with _lock:
+            _metadata[repo_name] = (now + Settings().dataset_metadata_ttl, metadata)
+    return metadata
+
+
+def invalidate_dataset_metadata(repo_name: Optional[str] = None):
+    """
+    Drop the cached metadata of the given repository or of all repositories if None.
+    """
+    with _lock:
+        if repo_name is None:
+            _metadata.clear()
+        else:
+            _metadata.pop(repo_name, None)
@@ -22,7 +22,7 @@ from uuid import UUID
 
 # Persistence
 from app.persistance.Database import Session, engine
-from app.persistance.graphdb.GraphDatabaseUtils import create_engine
+from app.services.engine_registry import get_metrics_engine, invalidate_dataset_metadata
 # Models
 from app.models.DatasetModel import Dataset
 from app.models.TrackingTaskModel import TrackingTaskDto
@@ -185,12 +185,13 @@ class PollingTask:
         session.refresh(dataset)
 
         # Compute class and property metrics via SPARQL
-        sparql_engine = create_engine(dataset.repository_name)
+        sparql_engine = get_metrics_engine(dataset.repository_name)
         metrics = MetricsService(sparql_engine, session)
         metrics.update_static_core_triples(dataset, self.repository_name)
         metrics.update_version_oblivious_triples(dataset, self.repository_name)
         metrics.update_class_statistics(self.dataset_id, self.repository_name, version_timestamp, self.latest_timestamp)
         metrics.update_property_statistics(self.dataset_id, self.repository_name, version_timestamp, self.latest_timestamp)
+        invalidate_dataset_metadata(dataset.repository_name)
 
         self.latest_timestamp = version_timestamp
         return next_delay
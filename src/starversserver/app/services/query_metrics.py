@@ -0,0 +1,30 @@
+"""
+query_metrics.py
+
+Process-wide collector for the durations of the phases of SPARQL queries and updates
+(rewrite, HTTP wait, download, decode, dataframe formatting, update chunks) that are sent
+through the engines of engine_registry.
+
+It is disabled unless QUERY_INSTRUMENTATION is set, in which case the engines report every phase to it.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from app.utils.starvers.instrumentation import PercentileCollector
+from app.AppConfig import Settings
+from app.LoggingConfig import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_query_collector() -> Optional[PercentileCollector]:
+    """
+    Return the process-wide phase collector or None if the instrumentation is disabled.
+    """
+    if not Settings().query_instrumentation:
+        return None
+
+    logger.info("Collecting the durations of the query and update phases.")
+    return PercentileCollector()
@@ -0,0 +1,42 @@
+"""
+result_cache.py
+
+Shared cache for the results of timestamped queries at past timestamps.
+
+The cache is shared by the query API and the versioning pipeline, which run in the same process,
+so that every versioning cycle invalidates the results it might have changed.
+It is disabled unless RESULT_CACHE_SIZE_MB is set, and in processes that call disable_result_cache()
+because they would never see these invalidations (e.g. the GUI).
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from app.utils.starvers.cache import ResultCache
+from app.AppConfig import Settings
+from app.LoggingConfig import get_logger
+
+logger = get_logger(__name__)
+
+_disabled = False
+
+
+def disable_result_cache():
+    """
+    Disable the result cache in this process. Must be called before the first engine is created.
+    """
+    global _disabled
+    _disabled = True
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Return the process-wide result cache or None if caching is disabled.
+    """
+    settings = Settings()
+    if _disabled or settings.result_cache_size_mb <= 0:
+        return None
+
+    logger.info(f"Caching results of historical queries in up to {settings.result_cache_size_mb} MB of memory.")
+    return ResultCache(max_bytes=settings.result_cache_size_mb * 2**20, spill_dir=settings.result_cache_dir)
@@ -16,6 +16,7 @@ from app.models.DatasetModel import Dataset, DatasetCreate
 # Services
 from app.services import dataset_repository
 from app.services.task_scheduler import scheduler
+from app.services.engine_registry import invalidate_dataset_metadata
 # Persistance
 from app.persistance.graphdb.GraphDatabaseUtils import create_repository
 # Logging
@@ -33,6 +34,7 @@ def register_dataset(dataset_create: DatasetCreate, session: Session) -> Dataset
     Persist a new dataset and kick off its first tracking run immediately.
     """
     dataset = dataset_repository.create_dataset(dataset_create, session)
+    invalidate_dataset_metadata(dataset.repository_name)
     LOG.info(f"[{dataset.repository_name}] Dataset registered. Starting initial tracking.")
     _initialize_and_schedule(dataset, session, initial_run=True)
     return dataset
@@ -43,6 +45,7 @@ def deactivate_dataset(dataset_id: UUID, session: Session) -> Dataset:
     Mark a single dataset as inactive. The running PollingTask will notice and stop itself.
     """
     dataset = dataset_repository.mark_dataset_inactive(dataset_id, session)
+    invalidate_dataset_metadata(dataset.repository_name)
     LOG.info(f"[{dataset.repository_name}] Dataset marked inactive.")
     return dataset
 
@@ -52,6 +55,7 @@ def deactivate_all_datasets(session: Session) -> list[Dataset]:
     Mark all active datasets as inactive (e.g. on a clean shutdown request).
     """
     datasets = dataset_repository.mark_all_datasets_inactive(session)
+    invalidate_dataset_metadata()
     LOG.info(f"Deactivated {len(datasets)} dataset(s).")
     return datasets
 
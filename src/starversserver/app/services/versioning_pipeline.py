@@ -21,9 +21,9 @@ from typing import Optional
 import zipfile
 import re
 
-from app.utils.starvers.starvers import TripleStoreEngine
 from app.AppConfig import Settings
 from app.LoggingConfig import get_logger
+from app.services.engine_registry import get_engine
 # Models
 from app.models.DeltaEventModel import DeltaEvent
 from app.models.TrackingTaskModel import TrackingTaskDto
@@ -53,9 +53,8 @@ class VersioningPipeline:
         self.LOG = get_logger(__name__)
         self.local_file = False # Set to True to skip downloading and use a local file instead (for evaluation)
 
-        graph_db_get  = Settings().graph_db_url_get_endpoint.replace("{:repo_name}", tracking_task.name)
-        graph_db_post = Settings().graph_db_url_post_endpoint.replace("{:repo_name}", tracking_task.name)
-        self._sparql_engine = TripleStoreEngine(graph_db_get, graph_db_post, skip_connection_test=True)
+        # Without a timeout: loading and versioning a large snapshot takes longer than a router request
+        self._sparql_engine = get_engine(tracking_task.name, timeout=None)
 
         self._iterative_calculator = IterativeDeltaCalculator(self._sparql_engine, tracking_task, repository_name)
         self._sparql_calculator    = SparqlDeltaCalculator(self._sparql_engine, tracking_task, repository_name)
@@ -148,8 +147,15 @@ class VersioningPipeline:
 
             # --- Apply the iterative delta to the triple store ---
             t_versioning_start = time.time_ns()
-            self._sparql_engine.insert(insertions_iterative, timestamp=version_timestamp)
-            self._sparql_engine.outdate(deletions_iterative, timestamp=version_timestamp)
+            if len(insertions_iterative) > Settings().bulk_insert_threshold:
+                # Large insertions are loaded as a Turtle-star file through GraphDB's server file import
+                self._sparql_engine.outdate(deletions_iterative, timestamp=version_timestamp)
+                self._sparql_engine.bulk_insert(insertions_iterative, timestamp=version_timestamp, method="file",
+                                                import_dir=Settings().graph_db_import_dir,
+                                                import_timeout=Settings().graph_db_import_timeout)
+            else:
+                # Insertions and deletions are applied together, chunk by chunk
+                self._sparql_engine.apply_delta(insertions_iterative, deletions_iterative, timestamp=version_timestamp)
             t_versioning = time.time_ns() - t_versioning_start
 
             # --- Persist timing rows and delta files ---
@@ -0,0 +1,10 @@
+import pytest
+from fake_sparql_endpoint import start_sparql_server
+
+
+@pytest.fixture
+def sparql_server():
+    server = start_sparql_server()
+    yield server
+    server.shutdown()
+    server.server_close()
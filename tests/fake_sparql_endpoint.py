@@ -0,0 +1,105 @@
+"""
+A local SPARQL endpoint for the tests of the engines. It answers every query with a single row, 
+every update with 204 (or ThreadingHTTPServer.update_status) and imports server files like GraphDB's REST API. 
+The state of the server records the requests that it received.
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from starvers.starvers import TripleStoreEngine
+from starvers.transport import HTTPTransport
+
+
+select_response = json.dumps({
+    "head": {"vars": ["s"]},
+    "results": {"bindings": [{"s": {"type": "uri", "value": "http://example.com/s1"}}]}
+}).encode("utf-8")
+
+
+class SPARQLHandler(BaseHTTPRequestHandler):
+    """
+    Answers every query with a single row and every update with 204. Records the client address of each request.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status: int, body: bytes = b"", content_type: str = "application/sparql-results+json"):
+        self.server.clients.append(self.client_address)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.endswith("/import/server"):
+            self._respond(200, json.dumps([{"name": name, "status": self.server.import_status} for name in self.server.imports]).encode("utf-8"),
+                          "application/json")
+        elif self.server.unavailable > 0:
+            self.server.unavailable -= 1
+            self._respond(503)
+        else:
+            self._respond(200, select_response)
+
+    def do_POST(self):
+        if self.path.endswith("/import/server"):
+            file_name = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["fileNames"][0]
+            with open(os.path.join(self.server.import_dir, file_name), "r") as f:
+                self.server.imports[file_name] = f.read()
+            self._respond(202, b"", "application/json")
+            return
+        body = urllib.parse.parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+        if self.path.endswith("/statements"):
+            update = body["update"][0]
+            if self.server.max_rows is not None and update.count("<http://example.com/p>") > self.server.max_rows:
+                self._respond(413, b"", "text/plain")
+                return
+            with self.server.lock:
+                self.server.active += 1
+                self.server.max_active = max(self.server.max_active, self.server.active)
+                start = len(self.server.events)
+                self.server.events.append(("start", update))
+            time.sleep(self.server.delay)
+            with self.server.lock:
+                self.server.active -= 1
+                self.server.events.append(("end", update))
+            self._respond(500 if "fail" in update else self.server.update_status, b"", "text/plain")
+        elif "construct" in body["query"][0].lower():
+            self._respond(200, self.server.snapshot, "application/n-triples")
+        else:
+            self._respond(200, select_response)
+
+
+def start_sparql_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SPARQLHandler)
+    server.clients = []
+    server.unavailable = 0
+    server.update_status = 204
+    server.lock = threading.Lock()
+    server.events = []
+    server.active = 0
+    server.max_active = 0
+    server.delay = 0
+    server.max_rows = None
+    server.import_dir = None
+    server.imports = {}
+    server.import_status = "DONE"
+    server.snapshot = b""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def sparql_engine(server, transport: HTTPTransport, mode: str = "decorator") -> TripleStoreEngine:
+    endpoint = "http://127.0.0.1:{0}/repositories/test".format(server.server_address[1])
+    return TripleStoreEngine(endpoint, endpoint + "/statements", mode=mode, skip_connection_test=True, transport=transport)
+
+
+def example_triples(*names: str) -> list[str]:
+    return ["<http://example.com/{0}> <http://example.com/p> <http://example.com/o> .".format(name) for name in names]
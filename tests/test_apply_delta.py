@@ -0,0 +1,21 @@
+import pytest
+import logging
+from starvers.transport import HTTPTransport
+from fake_sparql_endpoint import sparql_engine, example_triples
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_apply_delta__one_request_per_chunk(sparql_server):
+    engine = sparql_engine(sparql_server, HTTPTransport())
+
+    engine.apply_delta(example_triples("a", "b", "c"), example_triples("x", "y"), chunk_size=2)
+
+    updates = [update for kind, update in sparql_server.events if kind == "end"]
+    assert len(updates) == 2
+    outdate, insert = updates[0].split("} ;\n")
+    assert "<http://example.com/x>" in outdate and "<http://example.com/y>" in outdate
+    assert "<http://example.com/a>" in insert and "<http://example.com/b>" in insert
+    assert outdate.index("delete") < outdate.index("insert")
+    assert "<http://example.com/c>" in updates[1] and ";\n" not in updates[1]
@@ -0,0 +1,65 @@
+import pytest
+import os
+import logging
+from datetime import datetime, timezone
+from starvers.transport import HTTPTransport
+from starvers.exceptions import BulkImportFailed
+from fake_sparql_endpoint import sparql_engine, example_triples
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_bulk_insert__server_file(sparql_server, tmp_path):
+    sparql_server.import_dir = str(tmp_path)
+    engine = sparql_engine(sparql_server, HTTPTransport())
+    timestamp = datetime(2023, 1, 1, 12, 0, 0, 0, timezone.utc)
+
+    engine.bulk_insert(example_triples("a", "b"), timestamp=timestamp, method="file", import_dir=str(tmp_path))
+
+    assert len(sparql_server.events) == 0
+    (file_name, content), = sparql_server.imports.items()
+    assert file_name.endswith(".ttls")
+    assert "PREFIX vers: <https://github.com/GreenfishK/DataCitation/versioning/>" in content
+    assert '<< << <http://example.com/a> <http://example.com/p> <http://example.com/o> >> ' \
+           'vers:valid_from "2023-01-01T12:00:00.000+00:00"^^xsd:dateTime >> ' \
+           'vers:valid_until "9999-12-31T00:00:00.000+02:00"^^xsd:dateTime .' in content.splitlines()
+    assert os.listdir(tmp_path) == []
+
+
+def test_bulk_insert__auto_threshold(sparql_server, tmp_path):
+    sparql_server.import_dir = str(tmp_path)
+    engine = sparql_engine(sparql_server, HTTPTransport())
+
+    engine.bulk_insert(example_triples("a", "b"), import_dir=str(tmp_path), file_threshold=2)
+    assert len(sparql_server.imports) == 0
+    assert len(sparql_server.events) == 2
+
+    engine.bulk_insert(example_triples("a", "b", "c"), import_dir=str(tmp_path), file_threshold=2)
+    assert len(sparql_server.imports) == 1
+
+
+def test_bulk_insert__reification(sparql_server, tmp_path):
+    sparql_server.import_dir = str(tmp_path)
+    engine = sparql_engine(sparql_server, HTTPTransport(), mode="reification")
+    timestamp = datetime(2023, 1, 1, 12, 0, 0, 0, timezone.utc)
+
+    engine.bulk_insert(example_triples("a", "b"), timestamp=timestamp, method="file", import_dir=str(tmp_path))
+
+    (file_name, content), = sparql_server.imports.items()
+    lines = content.splitlines()
+    assert "PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>" in lines
+    assert '_:b1 rdf:reifies << <http://example.com/b> <http://example.com/p> <http://example.com/o> >> ; ' \
+           'vers:valid_from "2023-01-01T12:00:00.000+00:00"^^xsd:dateTime ; ' \
+           'vers:valid_until "9999-12-31T00:00:00.000+02:00"^^xsd:dateTime .' in lines
+
+
+def test_bulk_insert__import_timeout(sparql_server, tmp_path):
+    sparql_server.import_dir = str(tmp_path)
+    sparql_server.import_status = "IMPORTING"
+    engine = sparql_engine(sparql_server, HTTPTransport())
+
+    with pytest.raises(BulkImportFailed, match="IMPORTING"):
+        engine.bulk_insert(example_triples("a"), method="file", import_dir=str(tmp_path), poll_interval=0.05, import_timeout=0.2)
+    assert len(sparql_server.imports) == 1
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,125 @@
+import pytest
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from starvers.cache import ResultCache, is_historical
+from starvers.transport import HTTPTransport
+from fake_sparql_endpoint import sparql_engine, example_triples
+
+
+LOGGER = logging.getLogger(__name__)
+
+endpoint = "http://localhost:7200/repositories/test"
+timestamp = datetime(2022, 10, 1, 12, 0, 0, 0, timezone.utc)
+
+
+def test_cache__get_put():
+    cache = ResultCache()
+
+    assert cache.get(endpoint, "q", timestamp, "json") is None
+    cache.put(endpoint, "q", timestamp, "json", b"result", "application/sparql-results+json")
+
+    assert cache.get(endpoint, "q", timestamp, "json") == (b"result", "application/sparql-results+json")
+    assert cache.get(endpoint, "q", timestamp, "arrow") is None
+    assert cache.get(endpoint, "q", timestamp + timedelta(seconds=1), "json") is None
+    assert cache.get(endpoint + "2", "q", timestamp, "json") is None
+    info = cache.info()
+    assert (info.hits, info.misses, info.entries, info.bytes) == (1, 4, 1, 6)
+
+
+def test_cache__lru_eviction():
+    cache = ResultCache(max_bytes=10)
+
+    cache.put(endpoint, "q1", timestamp, "json", b"aaaa", "text/plain")
+    cache.put(endpoint, "q2", timestamp, "json", b"bbbb", "text/plain")
+    cache.get(endpoint, "q1", timestamp, "json")
+    cache.put(endpoint, "q3", timestamp, "json", b"cccc", "text/plain")
+    cache.put(endpoint, "q4", timestamp, "json", b"d" * 11, "text/plain")
+
+    assert cache.get(endpoint, "q1", timestamp, "json") is not None
+    assert cache.get(endpoint, "q2", timestamp, "json") is None
+    assert cache.get(endpoint, "q3", timestamp, "json") is not None
+    assert cache.get(endpoint, "q4", timestamp, "json") is None
+    assert cache.info().bytes == 8
+
+
+def test_cache__spill(tmp_path):
+    cache = ResultCache(max_bytes=4, spill_dir=str(tmp_path), max_spill_bytes=8)
+
+    for i in range(4):
+        cache.put(endpoint, "q{0}".format(i), timestamp, "json", str(i).encode("utf-8") * 4, "text/plain")
+    info = cache.info()
+    assert (info.entries, info.spilled_entries, info.spilled_bytes) == (1, 2, 8)
+    assert len(list(tmp_path.iterdir())) == 2
+
+    assert cache.get(endpoint, "q0", timestamp, "json") is None
+    assert cache.get(endpoint, "q1", timestamp, "json") == (b"1111", "text/plain")
+    # The spilled entry moved back into memory and the entry in memory was spilled instead.
+    assert cache.info().entries == 1
+    assert cache.get(endpoint, "q3", timestamp, "json") == (b"3333", "text/plain")
+
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache__invalidate(tmp_path):
+    cache = ResultCache(max_bytes=4, spill_dir=str(tmp_path))
+    cache.put(endpoint, "q", timestamp - timedelta(days=1), "json", b"aaaa", "text/plain")
+    cache.put(endpoint, "q", timestamp, "json", b"bbbb", "text/plain")
+    cache.put(endpoint, "q", timestamp + timedelta(days=1), "json", b"cccc", "text/plain")
+    cache.put(endpoint + "2", "q", timestamp, "json", b"dddd", "text/plain")
+
+    cache.invalidate(endpoint, timestamp)
+
+    assert cache.get(endpoint, "q", timestamp - timedelta(days=1), "json") is not None
+    assert cache.get(endpoint, "q", timestamp, "json") is None
+    assert cache.get(endpoint, "q", timestamp + timedelta(days=1), "json") is None
+    assert cache.get(endpoint + "2", "q", timestamp, "json") is not None
+
+
+def test_is_historical():
+    assert is_historical(timestamp)
+    assert is_historical(datetime(2022, 10, 1, 12, 0, 0))
+    assert not is_historical(None)
+    assert not is_historical(datetime.now(timezone.utc) + timedelta(minutes=1))
+
+
+def test_result_cache__historical_queries(sparql_server):
+    engine = sparql_engine(sparql_server, HTTPTransport())
+    engine.result_cache = ResultCache()
+    query = "SELECT ?s WHERE { ?s ?p ?o }"
+
+    for _ in range(3):
+        assert engine.query(query, timestamp=timestamp)["s"].tolist() == ["<http://example.com/s1>"]
+    assert len(sparql_server.clients) == 1
+    # Queries at the current time are not cached.
+    engine.query(query)
+    engine.query(query)
+    assert len(sparql_server.clients) == 3
+
+    engine.insert(example_triples("a"), timestamp=timestamp + timedelta(days=1))
+    engine.query(query, timestamp=timestamp)
+    assert len(sparql_server.clients) == 4
+    engine.insert(example_triples("b"), timestamp=timestamp)
+    engine.query(query, timestamp=timestamp)
+    assert len(sparql_server.clients) == 6
+
+
+def test_result_cache__async_engine(sparql_server):
+    from starvers.async_engine import AsyncTripleStoreEngine, AsyncHTTPTransport
+
+    async def run():
+        transport = AsyncHTTPTransport()
+        endpoint = "http://127.0.0.1:{0}/repositories/test".format(sparql_server.server_address[1])
+        engine = AsyncTripleStoreEngine(endpoint, endpoint + "/statements", transport=transport,
+                                        result_cache=ResultCache())
+        results = [await engine.query("SELECT ?s WHERE { ?s ?p ?o }", timestamp=timestamp) for _ in range(2)]
+        await engine.outdate(example_triples("a"), timestamp=timestamp)
+        results.append(await engine.query("SELECT ?s WHERE { ?s ?p ?o }", timestamp=timestamp))
+        await transport.aclose()
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(df["s"].tolist() == ["<http://example.com/s1>"] for df in results)
+    assert len(sparql_server.clients) == 3
@@ -0,0 +1,41 @@
+import pytest
+import logging
+from starvers.starvers import _auto_chunk_sizes
+from starvers.transport import HTTPTransport
+from fake_sparql_endpoint import sparql_engine, example_triples
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _sent_chunk_sizes(server) -> list[int]:
+    return [update.count("<http://example.com/p>") for kind, update in server.events if kind == "end"]
+
+
+def test_auto_chunk_size__grows(sparql_server):
+    sparql_server.delay = 0.05
+    engine = sparql_engine(sparql_server, HTTPTransport())
+
+    engine.insert(example_triples(*map(str, range(1000))), chunk_size="auto")
+
+    sizes = _sent_chunk_sizes(sparql_server)
+    assert sum(sizes) == 1000
+    assert sizes[:3] == [100, 200, 400]
+    assert _auto_chunk_sizes[engine.update_endpoint] == 400
+
+
+def test_auto_chunk_size__shrinks_on_413(sparql_server):
+    sparql_server.max_rows = 150
+    engine = sparql_engine(sparql_server, HTTPTransport(retries=0))
+
+    engine.outdate(example_triples(*map(str, range(1000))), chunk_size="auto")
+
+    sizes = _sent_chunk_sizes(sparql_server)
+    assert sum(sizes) == 1000
+    assert max(sizes) <= 150
+    assert _auto_chunk_sizes[engine.update_endpoint] <= 150
+
+    # The next call starts with the remembered chunk size.
+    sparql_server.events.clear()
+    engine.insert(example_triples(*map(str, range(300))), chunk_size="auto")
+    assert _sent_chunk_sizes(sparql_server)[0] == _auto_chunk_sizes[engine.update_endpoint]
@@ -0,0 +1,46 @@
+import pytest
+import logging
+from starvers.transport import HTTPTransport
+from starvers.exceptions import ChunkSubmissionError
+from fake_sparql_endpoint import sparql_engine, example_triples
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _event(server, kind: str, row_prefix: str) -> int:
+    return next(i for i, (k, update) in enumerate(server.events) if k == kind and row_prefix in update)
+
+
+def test_concurrent_chunks__parallel(sparql_server):
+    sparql_server.delay = 0.2
+    engine = sparql_engine(sparql_server, HTTPTransport(pool_size=3))
+
+    engine.insert(example_triples("a", "b", "c", "d", "e", "f"), chunk_size=1, max_concurrency=3)
+
+    assert len(sparql_server.events) == 12
+    assert sparql_server.max_active == 3
+
+
+def test_concurrent_chunks__dependent_chunks_in_order(sparql_server):
+    sparql_server.delay = 0.2
+    engine = sparql_engine(sparql_server, HTTPTransport(pool_size=3))
+    a, b, c = ["<http://example.com/{0}>".format(name) for name in ["a", "b", "c"]]
+    p, o = "<http://example.com/p>", "<http://example.com/o>"
+
+    engine.update([[a, p, o], [c, p, o], [b, p, o]], [[b, None, None], [None, None, a], [None, None, c]],
+                  chunk_size=1, max_concurrency=3)
+
+    # Chunk 2 matches the triple that chunk 0 writes. Chunk 1 is independent.
+    assert _event(sparql_server, "end", "({0} ".format(a)) < _event(sparql_server, "start", "({0} ".format(b))
+    assert sparql_server.max_active == 2
+
+
+def test_concurrent_chunks__failures_reported(sparql_server):
+    engine = sparql_engine(sparql_server, HTTPTransport(pool_size=2, retries=0))
+
+    with pytest.raises(ChunkSubmissionError) as e:
+        engine.outdate(example_triples("a", "fail", "b", "fail", "c"), chunk_size=1, max_concurrency=2)
+
+    assert sorted(e.value.failed_chunks) == [1, 3]
+    assert len([kind for kind, _ in sparql_server.events if kind == "end"]) == 4
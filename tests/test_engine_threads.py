@@ -0,0 +1,36 @@
+import pytest
+import logging
+from datetime import datetime, timezone
+from starvers.transport import HTTPTransport
+from fake_sparql_endpoint import sparql_engine, example_triples
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_engine__concurrent_requests(sparql_server):
+    from concurrent.futures import ThreadPoolExecutor
+    triples = example_triples("a", "b")
+    sparql_server.snapshot = ("\n".join(triples) + "\n").encode("utf-8")
+    sparql_server.delay = 0.01
+    engine = sparql_engine(sparql_server, HTTPTransport(pool_size=8))
+    timestamps = [datetime(2022, 10, 1, 12, 0, i, 0, timezone.utc) for i in range(16)]
+
+    def run(i: int):
+        if i % 2:
+            return list(engine.iter_snapshot())
+        df, query = engine.query("SELECT ?s WHERE { ?s ?p ?o }", timestamp=timestamps[i], return_query=True)
+        engine.insert(example_triples(str(i)))
+        return df["s"].tolist(), query, engine.timestamped_query
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run, range(16)))
+
+    for i, result in enumerate(results):
+        if i % 2:
+            assert result == triples
+        else:
+            rows, query, last_query = result
+            assert rows == ["<http://example.com/s1>"]
+            assert timestamps[i].isoformat(timespec="milliseconds") in query
+            assert last_query == query
@@ -1,3 +1,23 @@
-# import pytest
-from starvers.starvers import TripleStoreEngine
+import pytest
+import logging
+from starvers.transport import HTTPTransport
+from fake_sparql_endpoint import sparql_engine, example_triples
 
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_insert__iterables_and_files(sparql_server, tmp_path):
+    engine = sparql_engine(sparql_server, HTTPTransport())
+    triples = example_triples("a", "b", "c")
+    nt_file = tmp_path / "triples.nt"
+    nt_file.write_text("# comment\n" + "\n".join(example_triples("d", "e")) + "\n\n")
+
+    engine.insert(triples, chunk_size=2)
+    engine.insert((triple for triple in example_triples("x", "y")), chunk_size=2)
+    engine.outdate(nt_file, chunk_size=2)
+
+    assert triples == example_triples("a", "b", "c")
+    updates = [update for kind, update in sparql_server.events if kind == "end"]
+    assert [update.count("<http://example.com/p>") for update in updates] == [2, 1, 2, 2]
+    assert "( <http://example.com/d> <http://example.com/p> <http://example.com/o> )" in updates[3]
@@ -0,0 +1,81 @@
+import pytest
+import logging
+from datetime import datetime, timezone
+from starvers.instrumentation import PhaseEvent, PercentileCollector, phase
+from starvers.starvers import timestamp_query
+from starvers.transport import HTTPTransport
+from fake_sparql_endpoint import sparql_engine, example_triples, select_response
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_phase__reports_fields():
+    events = []
+
+    with phase(events.append, "download", request_bytes=3) as event:
+        event["response_bytes"] = 5
+
+    assert len(events) == 1
+    assert events[0].phase == "download" and events[0].duration >= 0
+    assert (events[0].request_bytes, events[0].response_bytes, events[0].rows) == (3, 5, None)
+
+
+def test_phase__without_instrument():
+    with phase(None, "download") as event:
+        event["response_bytes"] = 5
+
+
+def test_timestamp_query__rewrite_phase():
+    collector = PercentileCollector()
+
+    timestamp_query("SELECT ?s WHERE { ?s ?p ?o }", instrument=collector)
+
+    assert [event.phase for event in collector.events()] == ["rewrite"]
+
+
+def test_timestamp_query__no_phase_without_instrument(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("phase() must not be entered without an instrument.")
+    monkeypatch.setattr("starvers.starvers.phase", fail)
+
+    timestamped_query, timestamp = timestamp_query("SELECT ?s WHERE { ?s ?p ?o }")
+    assert timestamp in timestamped_query
+
+
+def test_percentile_collector__summary():
+    collector = PercentileCollector()
+    for i in range(1, 101):
+        collector(PhaseEvent("http_wait", i / 100, request_bytes=10))
+    collector(PhaseEvent("to_df", 0.5, rows=7))
+    collector(PhaseEvent("to_df", 1.5, rows=3))
+
+    summary = collector.summary(percentiles=[50, 99]).set_index("phase")
+
+    assert summary.loc["http_wait", "count"] == 100
+    assert summary.loc["http_wait", "total"] == pytest.approx(50.5)
+    assert summary.loc["http_wait", "p50"] == pytest.approx(0.505)
+    assert summary.loc["http_wait", "p99"] == pytest.approx(0.9901)
+    assert summary.loc["http_wait", "request_bytes"] == 1000
+    assert summary.loc["to_df", "mean"] == pytest.approx(1.0)
+    assert summary.loc["to_df", "rows"] == 10
+
+    collector.reset()
+    assert collector.summary().empty
+
+
+def test_instrumentation__query_and_update_phases(sparql_server):
+    collector = PercentileCollector()
+    engine = sparql_engine(sparql_server, HTTPTransport())
+    engine.instrument = collector
+
+    df = engine.query("SELECT ?s WHERE { ?s ?p ?o }", timestamp=datetime(2022, 10, 1, 12, 0, 0, 0, timezone.utc))
+    engine.insert(example_triples("a", "b", "c"), chunk_size=2)
+
+    events = collector.events()
+    assert df["s"].tolist() == ["<http://example.com/s1>"]
+    assert [event.phase for event in events] == ["rewrite", "http_wait", "download", "decode", "to_df", "update", "update"]
+    assert events[2].response_bytes == len(select_response)
+    assert events[4].rows == 1
+    assert [(event.chunk_index, event.rows) for event in events[5:]] == [(0, 2), (1, 1)]
+    assert all(event.request_bytes > 0 for event in [events[1]] + events[5:])
@@ -0,0 +1,43 @@
+import pytest
+import logging
+from starvers.starvers import TripleStoreEngine, _probed_endpoints, configure_probe_cache, clear_probe_cache
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def probe_cache():
+    clear_probe_cache()
+    yield
+    clear_probe_cache()
+    configure_probe_cache()
+
+
+def test_probe_cache__once_per_endpoint(sparql_server, probe_cache):
+    endpoint = "http://127.0.0.1:{0}/repositories/test".format(sparql_server.server_address[1])
+
+    TripleStoreEngine(endpoint, endpoint + "/statements")
+    cnt_probe_requests = len(sparql_server.clients)
+    assert cnt_probe_requests > 0
+    TripleStoreEngine(endpoint, endpoint + "/statements")
+    assert len(sparql_server.clients) == cnt_probe_requests
+    TripleStoreEngine(endpoint, endpoint + "/statements", mode="reification")
+    assert len(sparql_server.clients) == 2 * cnt_probe_requests
+
+
+def test_probe_cache__file(sparql_server, probe_cache, tmp_path):
+    endpoint = "http://127.0.0.1:{0}/repositories/test".format(sparql_server.server_address[1])
+    configure_probe_cache(str(tmp_path / "probes.json"))
+
+    TripleStoreEngine(endpoint, endpoint + "/statements")
+    cnt_probe_requests = len(sparql_server.clients)
+    # Another process only sees the file.
+    _probed_endpoints.clear()
+    TripleStoreEngine(endpoint, endpoint + "/statements")
+    assert len(sparql_server.clients) == cnt_probe_requests
+
+    configure_probe_cache(str(tmp_path / "probes.json"), ttl=-1)
+    _probed_endpoints.clear()
+    TripleStoreEngine(endpoint, endpoint + "/statements")
+    assert len(sparql_server.clients) == 2 * cnt_probe_requests
@@ -2,6 +2,7 @@ from tkinter import E
 import pytest
 import logging
 import SPARQLWrapper
+from datetime import datetime, timezone
 from starvers.starvers import TripleStoreEngine
 
 
@@ -60,6 +61,41 @@ def test_complex_query_4():
         "Select clause in an invalid way.")
   
 
+def test_query_at():
+    with open(sparql_specs_queries_path + "graph_patterns__join.txt", "r") as file:
+        query = file.read()
+    file.close()
+
+    timestamps = [datetime(2022, 1, 1, tzinfo=timezone.utc), datetime.now(timezone.utc).replace(microsecond=0)]
+    df = engine.query_at(query, timestamps)
+    assert len(df[df['ts'] == timestamps[1]].index) == 672
+    assert len(df.columns) == 5
+
+
+def test_query_delta():
+    with open(sparql_specs_queries_path + "graph_patterns__join.txt", "r") as file:
+        query = file.read()
+    file.close()
+
+    timestamp = datetime.now(timezone.utc)
+    df = engine.query_delta(query, timestamp, timestamp)
+    assert len(df.index) == 0
+    assert 'change' in df.columns
+
+
+def test_query_interval():
+    with open(sparql_specs_queries_path + "graph_patterns__join.txt", "r") as file:
+        query = file.read()
+    file.close()
+
+    timestamp = datetime.now(timezone.utc)
+    df_snapshot = engine.query(query, timestamp)
+    df_overlaps = engine.query(query, interval=(timestamp, timestamp))
+    df_during = engine.query(query, interval=(datetime(2022, 1, 1, tzinfo=timezone.utc), timestamp), semantics="during")
+    assert len(df_overlaps.index) == len(df_snapshot.index)
+    assert len(df_during.index) <= len(df_overlaps.index)
+
+
 def test_functions__functional_forms_not_exists():
     with open(sparql_specs_queries_path + "functions__functional_forms_not_exists.txt", "r") as file:
         query = file.read()
@@ -358,7 +394,6 @@ def test_property_path__alternative_path():
     df = engine.query(query)
     assert len(df.index) == 31
     assert len(df.columns) == 4
-    # TODO: implement functionality in starvers.starvers.timestamp_query
 
 
 def test_property_path__sequence_path():
@@ -396,9 +431,8 @@ def test_property_path__one_or_more():
         query = file.read()
     file.close()
 
-    df = engine.query(query)
+    df = engine.query(query, max_path_length=6)
     assert 1 == 1
-    # TODO: implement functionality in starvers.starvers.timestamp_query
     # TODO: implement test
 
 
@@ -407,9 +441,8 @@ def test_property_path__zero_or_more():
         query = file.read()
     file.close()
 
-    df = engine.query(query)
+    df = engine.query(query, max_path_length=6)
     assert 1 == 1
-    # TODO: implement functionality in starvers.starvers.timestamp_query
     # TODO: implement test
 
 
@@ -420,7 +453,6 @@ def test_property_path__zero_or_one():
 
     df = engine.query(query)
     assert 1 == 1
-    # TODO: implement functionality in starvers.starvers.timestamp_query
     # TODO: implement test
 
 
@@ -0,0 +1,114 @@
+import pytest
+import io
+import json
+import logging
+import pandas as pd
+from starvers._helper import iter_results, to_df, to_df_columnar
+
+
+LOGGER = logging.getLogger(__name__)
+
+json_response = {
+    "head": {"vars": ["s", "o"]},
+    "results": {"bindings": [
+        {"s": {"type": "uri", "value": "http://example.com/s1"},
+         "o": {"type": "literal", "value": "a, ]} b", "xml:lang": "en"}},
+        {"s": {"type": "uri", "value": "http://example.com/s2"}},
+        {"s": {"type": "uri", "value": "http://example.com/s3"},
+         "o": {"type": "literal", "value": "5", "datatype": "http://www.w3.org/2001/XMLSchema#integer"}},
+    ]}
+}
+
+tsv_response = "?s\t?o\n" \
+               "<http://example.com/s1>\t\"a, ]} b\"@en\n" \
+               "<http://example.com/s2>\t\n" \
+               "<http://example.com/s3>\t\"5\"^^<http://www.w3.org/2001/XMLSchema#integer>\n"
+
+expected_rows = [
+    {"s": "<http://example.com/s1>", "o": "\"a, ]} b\"@en"},
+    {"s": "<http://example.com/s2>", "o": None},
+    {"s": "<http://example.com/s3>", "o": "\"5\"^^<http://www.w3.org/2001/XMLSchema#integer>"},
+]
+
+
+class StreamedResult:
+    """
+    Stands in for SPARQLWrapper's QueryResult whose response is read from a socket.
+    """
+    def __init__(self, body: str, response_format: str):
+        self.response = io.BufferedReader(io.BytesIO(body.encode("utf-8")))
+        self.response_format = response_format
+
+    def _get_responseFormat(self):
+        return self.response_format
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_iter_results__json(chunk_size: int):
+    result = StreamedResult(json.dumps(json_response, indent=2), "json")
+
+    assert list(iter_results(result, chunk_size)) == expected_rows
+    assert result.response.closed
+
+
+def test_iter_results__json_empty():
+    result = StreamedResult(json.dumps({"head": {"vars": ["s"]}, "results": {"bindings": []}}), "json")
+
+    assert list(iter_results(result)) == []
+
+
+def test_iter_results__json_truncated():
+    result = StreamedResult(json.dumps(json_response)[:-20], "json")
+
+    with pytest.raises(ValueError):
+        list(iter_results(result, 7))
+
+
+def test_iter_results__tsv():
+    result = StreamedResult(tsv_response, "tsv")
+
+    assert list(iter_results(result)) == expected_rows
+
+
+class ConvertedResult(StreamedResult):
+    """
+    Stands in for SPARQLWrapper's QueryResult as it is consumed by to_df.
+    """
+    def convert(self):
+        return json.loads(self.response.read())
+
+
+def test_to_df_columnar__same_values_as_to_df():
+    bindings = [
+        {"o": {"type": "literal", "value": "plain"}},
+        {"o": {"type": "literal", "value": "say \"hi\""}},
+        {"o": {"type": "literal", "value": "it's \"both\""}},
+        {"o": {"type": "literal", "value": "two\nlines"}},
+        {"o": {"type": "literal", "value": "x", "xml:lang": "en-GB"}},
+        {"o": {"type": "literal", "value": "5", "datatype": "http://www.w3.org/2001/XMLSchema#integer"}},
+        {"o": {"type": "literal", "value": "-1.5", "datatype": "http://www.w3.org/2001/XMLSchema#decimal"}},
+        {"o": {"type": "literal", "value": "1.0E3", "datatype": "http://www.w3.org/2001/XMLSchema#double"}},
+        {"o": {"type": "literal", "value": "true", "datatype": "http://www.w3.org/2001/XMLSchema#boolean"}},
+        {"o": {"type": "literal", "value": "2022-10-10T09:54:57.161+00:00",
+               "datatype": "http://www.w3.org/2001/XMLSchema#dateTime"}},
+        {"o": {"type": "uri", "value": "http://example.com/o"}},
+        {},
+    ]
+    tsv_values = ['"plain"', '"say \\"hi\\""', '"it\'s \\"both\\""', '"two\\nlines"', '"x"@en-GB',
+                  '5', '-1.5', '1.0E3', 'true',
+                  '"2022-10-10T09:54:57.161+00:00"^^<http://www.w3.org/2001/XMLSchema#dateTime>',
+                  '<http://example.com/o>', '']
+    json_result = ConvertedResult(json.dumps({"head": {"vars": ["o"]}, "results": {"bindings": bindings}}), "json")
+    tsv_result = StreamedResult("?o\n" + "\n".join(tsv_values) + "\n", "tsv")
+
+    expected = to_df(json_result)
+    df = to_df_columnar(tsv_result)
+
+    assert list(df.columns) == ["o"]
+    assert df["o"].iloc[:-1].tolist() == expected["o"].iloc[:-1].tolist()
+    assert pd.isna(df["o"].iloc[-1]) and expected["o"].iloc[-1] is None
+
+
+def test_to_df_columnar__json_not_supported():
+    with pytest.raises(ValueError):
+        to_df_columnar(StreamedResult(json.dumps(json_response), "json"))
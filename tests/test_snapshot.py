@@ -0,0 +1,28 @@
+import pytest
+import io
+import gzip
+import logging
+from starvers.transport import HTTPTransport
+from fake_sparql_endpoint import sparql_engine, example_triples
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_snapshot__streamed(sparql_server, tmp_path):
+    triples = example_triples(*map(str, range(1000)))
+    sparql_server.snapshot = ("\n".join(triples) + "\n").encode("utf-8")
+    engine = sparql_engine(sparql_server, HTTPTransport())
+
+    assert list(engine.iter_snapshot()) == triples
+
+    engine.retrieve_snapshot(dest=tmp_path / "snapshot.nt.gz", compress=True, chunk_size=1024)
+    with gzip.open(tmp_path / "snapshot.nt.gz", "rb") as f:
+        assert f.read() == sparql_server.snapshot
+
+    buffer = io.BytesIO()
+    assert engine.retrieve_snapshot(dest=buffer) is None
+    assert buffer.getvalue() == sparql_server.snapshot
+    assert engine.retrieve_snapshot() == sparql_server.snapshot.decode("utf-8")
+    # The streamed responses release their connection to the pool.
+    assert len(set(sparql_server.clients)) == 1
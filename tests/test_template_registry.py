@@ -0,0 +1,66 @@
+import os
+import pytest
+from starvers.template_registry import Template, TemplateRegistry, get_templates, TEMPLATES_DIR, NAMED_SYNTAX
+
+
+def test_template__format_syntax():
+    text = "insert {{ {0} }} where {{ bind({1} as ?ts{2}) {1} }}"
+    template = Template(text)
+
+    assert template.fields == {0, 1, 2}
+    assert template.format("a", "b", "c") == text.format("a", "b", "c")
+    assert str(template) == text
+
+
+def test_template__named_syntax():
+    template = Template("select * { graph <{:graph}> { ?s ?p ?o } filter(?ts = \"{:timestamp}\") } # {:graph}", NAMED_SYNTAX)
+
+    assert template.fields == {"graph", "timestamp"}
+    assert template.format(graph="http://example.org/g", timestamp="2022") \
+        == "select * { graph <http://example.org/g> { ?s ?p ?o } filter(?ts = \"2022\") } # http://example.org/g"
+
+
+def test_template__non_string_values():
+    text = "_:b{2} rdf:reifies << {0} >> ; vers:valid_from {1} ."
+
+    assert Template(text).format("<a:s> <a:p> <a:o>", 1.5, 3) == text.format("<a:s> <a:p> <a:o>", 1.5, 3)
+    assert Template("LIMIT {:limit}", NAMED_SYNTAX).format(limit=10) == "LIMIT 10"
+
+
+def test_template__braces_without_placeholders():
+    # Statements like the ones of the connection test are used as they are.
+    template = Template("select * { ?s ?p ?o . }")
+
+    assert template.text == "select * { ?s ?p ?o . }"
+    with pytest.raises(ValueError):
+        template.format()
+
+
+@pytest.mark.parametrize("mode", ["decorator", "reification"])
+def test_template_registry__starvers_templates(mode):
+    templates_dir = os.path.join(TEMPLATES_DIR, mode)
+    registry = get_templates(templates_dir)
+
+    assert get_templates(templates_dir) is registry
+    assert "test_connection/test_connection_select" in registry
+    for name in ["insert_triples", "outdate_triples", "update_triples", "version_all_triples", "snapshot_construct_query",
+                 "bulk_insert_triple", "versioning_query_extensions", "versioning_query_extensions_latest"]:
+        with open(os.path.join(templates_dir, name + ".txt"), "r") as f:
+            text = f.read()
+        args = ["arg{0}".format(i) for i in range(5)]
+        assert registry[name].format(*args) == text.format(*args)
+
+
+def test_template_registry__load_once(tmp_path):
+    (tmp_path / "count.sparql").write_text("select (count(*) as ?cnt) { graph <{:graph}> { ?s ?p ?o } }")
+    (tmp_path / "readme.txt").write_text("not a query")
+    registry = TemplateRegistry(str(tmp_path), extension=".sparql", syntax=NAMED_SYNTAX)
+
+    assert registry.names() == ["count"]
+    (tmp_path / "count.sparql").write_text("changed")
+    assert registry["count"].format(graph="g") == "select (count(*) as ?cnt) { graph <g> { ?s ?p ?o } }"
+
+    registry.reload()
+    assert registry["count"].text == "changed"
+    with pytest.raises(KeyError):
+        registry["readme"]
@@ -0,0 +1,400 @@
+import pytest
+import logging
+import re
+from datetime import datetime, timezone
+from starvers.starvers import timestamp_query, timestamp_query_at, timestamp_query_delta, timestamp_query_many, timestamp_query_interval, \
+    rewrite_cache_info, clear_rewrite_cache, _projection_variables
+from starvers.exceptions import ExpressionNotCoveredException, WrongInputFormatException
+from starvers._bgp_parser import parse_bgp_select
+
+
+# Paths
+sparql_specs_queries_path = "tests/queries/SPARQL_specs/"
+
+LOGGER = logging.getLogger(__name__)
+
+ts_1 = datetime(2022, 10, 10, 9, 54, 57, 161000, tzinfo=timezone.utc)
+ts_2 = datetime(2023, 1, 1, 0, 0, 0, 0, tzinfo=timezone.utc)
+
+
+def test_rewrite_cache__hit_substitutes_timestamp():
+    with open(sparql_specs_queries_path + "graph_patterns__bgp.txt", "r") as file:
+        query = file.read()
+    file.close()
+
+    clear_rewrite_cache()
+    query_1, timestamp_1 = timestamp_query(query, ts_1)
+    query_2, timestamp_2 = timestamp_query(query, ts_2)
+
+    assert rewrite_cache_info().hits == 1
+    assert rewrite_cache_info().misses == 1
+    assert timestamp_1 in query_1 and timestamp_1 not in query_2
+    assert query_1.replace(timestamp_1, timestamp_2) == query_2
+
+
+def test_rewrite_cache__formatting_is_normalized():
+    query = 'SELECT *\nWHERE {\n?s ?p "a  b" .\n}'
+    reformatted_query = 'SELECT *  \n\nWHERE {\n    ?s   ?p "a  b" .\n}\n'
+
+    clear_rewrite_cache()
+    timestamp_query(query, ts_1)
+    timestamped_query, _ = timestamp_query(reformatted_query, ts_1)
+
+    assert rewrite_cache_info().hits == 1
+    assert '"a  b"' in timestamped_query
+
+
+def test_rewrite_cache__keyed_by_mode():
+    query = "SELECT * WHERE { ?s ?p ?o . }"
+
+    clear_rewrite_cache()
+    decorator_query, _ = timestamp_query(query, ts_1, mode="decorator")
+    reification_query, _ = timestamp_query(query, ts_1, mode="reification")
+
+    assert rewrite_cache_info().misses == 2
+    assert decorator_query != reification_query
+
+
+def test_rewrite_cache__clear():
+    timestamp_query("SELECT * WHERE { ?s ?p ?o . }", ts_1)
+    clear_rewrite_cache()
+
+    cache_info = rewrite_cache_info()
+    assert cache_info.hits == 0
+    assert cache_info.misses == 0
+    assert cache_info.currsize == 0
+
+
+# Differential tests between the basic graph pattern fast path and the query algebra path
+bgp_queries = [
+    "SELECT * WHERE { ?s ?p ?o . }",
+    "Select * {\n    ?s <http://example.com/p> <http://example.com/o> .\n}\n",
+    "PREFIX ex: <http://example.com/>\n# version 3\nSelect DISTINCT ?s ?o { ?s ex:p \"x\"@en ; a ?o , ex:C . "
+    "?s <http://example.com/q> 5 . ?s ex:r \"1.5\"^^<http://www.w3.org/2001/XMLSchema#decimal> . ?s ex:t true }",
+    "PREFIX ex: <http://example.com/>\nSELECT REDUCED $s WHERE { $s ex:p 'single quoted' ; ex:q 1.5, -2.5e3 ; } LIMIT 10 OFFSET 5",
+    "SELECT ?s WHERE { ?s ?p ?o } OFFSET 3",
+    "SELECT ?x ?z4 WHERE { ?x ?y ?z. ?z ?y2 ?z2 . ?z2 ?y3 ?z3 . ?z3 ?y4 ?z4 . } LIMIT 3",
+]
+
+non_bgp_queries = [
+    "graph_patterns__filter.txt",
+    "graph_patterns__union.txt",
+    "functions__functional_forms_not_exists.txt",
+    "property_path__sequence_path.txt",
+    "complex_query_1.txt",
+    "solution_modifiers__order_by.txt",
+]
+
+
+def _canonical_form(timestamped_query: str) -> tuple:
+    """
+    Projection order and the form of the solution modifiers LIMIT and OFFSET are the only 
+    allowed differences between the two rewriting paths.
+    """
+    head, rest = timestamped_query.split("{", 1)
+    body, solution_modifiers = rest.rsplit("}", 1)
+    prologue, select_clause = head.split("SELECT ")
+    projection = select_clause.split()
+    modifier = projection.pop(0) if projection and projection[0] in ["DISTINCT", "REDUCED"] else ""
+
+    limit = re.search(r"LIMIT (\d+)", solution_modifiers)
+    offset = re.search(r"OFFSET (\d+)", solution_modifiers)
+    return (prologue, modifier, sorted(projection), body,
+            limit.group(1) if limit else None,
+            offset.group(1) if offset and offset.group(1) != "0" else None)
+
+
+@pytest.mark.parametrize("mode", ["decorator", "reification"])
+@pytest.mark.parametrize("query", bgp_queries)
+def test_fast_path__same_as_algebra_path(query: str, mode: str):
+    assert parse_bgp_select(query) is not None
+
+    fast_path_query, _ = timestamp_query(query, ts_1, mode=mode)
+    algebra_path_query, _ = timestamp_query(query, ts_1, mode=mode, fast_path=False)
+    assert _canonical_form(fast_path_query) == _canonical_form(algebra_path_query)
+
+
+@pytest.mark.parametrize("mode", ["decorator", "reification"])
+@pytest.mark.parametrize("query", bgp_queries)
+def test_fast_path__same_as_algebra_path__optimized(query: str, mode: str):
+    fast_path_query, _ = timestamp_query(query, ts_1, mode=mode, optimize=True)
+    algebra_path_query, _ = timestamp_query(query, ts_1, mode=mode, fast_path=False, optimize=True)
+    assert _canonical_form(fast_path_query) == _canonical_form(algebra_path_query)
+
+
+@pytest.mark.parametrize("mode", ["decorator", "reification"])
+def test_optimize__grouped_filters_and_no_bind(mode: str):
+    query = "PREFIX ex: <http://ex.org/> SELECT ?s ?l WHERE { ?s ex:label ?l . ?s ex:type ?t . OPTIONAL { ?s ex:x ?y } }"
+
+    timestamped_query, timestamp = timestamp_query(query, ts_1, mode=mode, optimize=True)
+
+    assert "bind(" not in timestamped_query and "?tsBGP_" not in timestamped_query
+    # One filter per basic graph pattern, after its triple statements
+    filters = re.findall(r"filter\((.*)\)", timestamped_query)
+    assert len(filters) == 2
+    assert filters[0].count('"{0}"^^xsd:dateTime'.format(timestamp)) == 4
+    assert timestamped_query.index("?valid_until_2") < timestamped_query.index("filter(")
+
+
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_optimize__duplicate_triples_versioned_once(fast_path: bool):
+    query = "SELECT ?s WHERE { ?s <http://ex.org/p> ?o . ?o <http://ex.org/q> ?x . ?s <http://ex.org/p> ?o . }"
+
+    timestamped_query, _ = timestamp_query(query, ts_1, mode="reification", fast_path=fast_path, optimize=True)
+    assert timestamped_query.count("rdf:reifies") == 2
+    assert timestamp_query(query, ts_1, mode="reification", fast_path=fast_path)[0].count("rdf:reifies") == 3
+
+
+@pytest.mark.parametrize("query_file", non_bgp_queries)
+def test_optimize__every_triple_statement_filtered(query_file: str):
+    with open(sparql_specs_queries_path + query_file, "r") as file:
+        query = file.read()
+
+    timestamped_query, timestamp = timestamp_query(query, ts_1, optimize=True)
+
+    assert "?tsBGP_" not in timestamped_query
+    versioned = re.findall(r"vers:valid_from (\?valid_from_\d+) >>", timestamped_query)
+    filtered = re.findall(r"(\?valid_from_\d+) <= \"{0}\"\^\^xsd:dateTime".format(re.escape(timestamp)), timestamped_query)
+    assert len(versioned) > 0 and sorted(versioned) == sorted(filtered)
+
+
+@pytest.mark.parametrize("query_file", non_bgp_queries)
+def test_fast_path__falls_back_to_algebra_path(query_file: str):
+    with open(sparql_specs_queries_path + query_file, "r") as file:
+        query = file.read()
+    file.close()
+
+    assert parse_bgp_select(query) is None
+    assert timestamp_query(query, ts_1)[0] == timestamp_query(query, ts_1, fast_path=False)[0]
+
+
+path_queries = [
+    "property_path__alternative_path.txt",
+    "property_path__zero_or_one.txt",
+    "property_path__one_or_more.txt",
+    "property_path__zero_or_more.txt",
+]
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("mode", ["decorator", "reification"])
+@pytest.mark.parametrize("query_file", path_queries)
+def test_property_path__every_triple_statement_versioned(query_file: str, mode: str, optimize: bool):
+    with open(sparql_specs_queries_path + query_file, "r") as file:
+        query = file.read()
+
+    timestamped_query, timestamp = timestamp_query(query, ts_1, mode=mode, optimize=optimize, max_path_length=6)
+
+    assert re.search(r"[>)][*+?]\s|\|", timestamped_query) is None
+    versioned = re.findall(r"vers:valid_from (\?valid_from_\d+)", timestamped_query)
+    filtered = re.findall(r"(\?valid_from_\d+) <= ", timestamped_query)
+    assert len(versioned) > 0 and sorted(versioned) == sorted(filtered)
+    assert timestamped_query.count("UNION") > 0
+
+
+@pytest.mark.parametrize("max_path_length", [1, 3, 6])
+def test_property_path__one_or_more_unrolled(max_path_length: int):
+    query = "SELECT ?s ?o WHERE { ?s <http://ex.org/p>+ ?o . }"
+
+    timestamped_query, _ = timestamp_query(query, ts_1, max_path_length=max_path_length)
+
+    assert timestamped_query.count("SELECT DISTINCT ?s ?o WHERE") == 1
+    assert timestamped_query.count("UNION") == max_path_length - 1
+    assert timestamped_query.count("<http://ex.org/p>") == max_path_length * (max_path_length + 1) // 2
+
+
+@pytest.mark.parametrize("query_file", ["property_path__one_or_more.txt", "property_path__zero_or_more.txt"])
+def test_property_path__max_path_length_required(query_file: str):
+    with open(sparql_specs_queries_path + query_file, "r") as file:
+        query = file.read()
+
+    with pytest.raises(ExpressionNotCoveredException, match="max_path_length"):
+        timestamp_query(query, ts_1)
+    with pytest.raises(WrongInputFormatException):
+        timestamp_query(query, ts_1, max_path_length=0)
+
+
+def test_property_path__longer_chains_truncated():
+    # With <a> p <b> p <c> p <d>, ?x = <d> needs three steps and is not found with max_path_length=2.
+    query = "SELECT ?x WHERE { <http://ex.org/a> <http://ex.org/p>+ ?x . }"
+
+    def branch_lengths(max_path_length: int) -> list[int]:
+        timestamped_query, _ = timestamp_query(query, ts_1, max_path_length=max_path_length)
+        union = timestamped_query[timestamped_query.index("SELECT DISTINCT ?x WHERE"):]
+        return [branch.count("vers:valid_from") for branch in union.split("UNION")]
+
+    assert branch_lengths(2) == [1, 2]
+    assert branch_lengths(3) == [1, 2, 3]
+
+
+def test_property_path__zero_or_more_constants():
+    query = "SELECT ?x WHERE { ?x <http://ex.org/q> ?y . <http://ex.org/a> <http://ex.org/p>* <http://ex.org/b> }"
+
+    timestamped_query, _ = timestamp_query(query, ts_1, max_path_length=2)
+
+    assert "FILTER EXISTS" in timestamped_query
+    assert "FILTER(sameTerm(<http://ex.org/a>, <http://ex.org/b>))" in timestamped_query
+    assert timestamped_query.count("UNION") == 2
+
+
+def test_property_path__negated_property_set():
+    query = "SELECT * WHERE { ?s !(<http://ex.org/p>|<http://ex.org/q>) ?o . ?o ^!<http://ex.org/r> ?x }"
+
+    timestamped_query, _ = timestamp_query(query, ts_1)
+
+    assert re.search(r"<< <<\?s (\?_path\d+) \?o>>.*FILTER\(\1 != <http://ex.org/p> && \1 != <http://ex.org/q>\)",
+                     timestamped_query, re.DOTALL)
+    # ^!p is the negated property set of the inverse triples
+    assert re.search(r"<< <<\?x (\?_path\d+) \?o>>.*FILTER\(\1 != <http://ex.org/r>\)", timestamped_query, re.DOTALL)
+
+
+def test_property_path__negated_inverse_not_covered():
+    # rdflib loses the IRI of ^p inside a negated property set
+    with open(sparql_specs_queries_path + "property_path__negated_property_set.txt", "r") as file:
+        query = file.read()
+
+    with pytest.raises(ExpressionNotCoveredException):
+        timestamp_query(query, ts_1)
+
+
+def test_timestamp_query_at__values_binding():
+    query = "SELECT DISTINCT ?s WHERE { ?s ?p ?o . OPTIONAL { ?o ?p2 ?x } }"
+
+    timestamped_query, timestamps = timestamp_query_at(query, [ts_1, ts_2])
+
+    assert "SELECT DISTINCT ?ts ?s" in timestamped_query
+    assert "?tsBGP_" not in timestamped_query and "bind(" not in timestamped_query
+    assert timestamped_query.count('values ?ts {{ "{0}"^^xsd:dateTime "{1}"^^xsd:dateTime }}'.format(*timestamps)) == 2
+
+
+@pytest.mark.parametrize("query", ["SELECT (count(?s) as ?cnt) WHERE { ?s ?p ?o }",
+                                   "SELECT ?s WHERE { { SELECT ?s WHERE { ?s ?p ?o } } }",
+                                   "SELECT ?s ?o WHERE { ?s <http://ex.org/p>? ?o }",
+                                   "SELECT ?s WHERE { ?s ?p ?o } LIMIT 10",
+                                   "SELECT ?s WHERE { ?s ?p ?o } ORDER BY ?s OFFSET 5",
+                                   "SELECT ?s WHERE { ?s ?p ?o } ORDER BY ?s LIMIT 10 OFFSET 5"])
+def test_timestamp_query_at__not_covered(query: str):
+    with pytest.raises(ExpressionNotCoveredException):
+        timestamp_query_at(query, [ts_1, ts_2])
+
+
+def test_timestamp_query_at__order_by():
+    query = 'SELECT ?s WHERE { ?s ?p "LIMIT 10" } ORDER BY ?s'
+
+    timestamped_query, _ = timestamp_query_at(query, [ts_1, ts_2])
+
+    assert timestamped_query.rstrip().endswith("ORDER BY ?s")
+
+
+def test_timestamp_query_at__reserved_variable():
+    with pytest.raises(WrongInputFormatException):
+        timestamp_query_at("SELECT ?ts WHERE { ?ts ?p ?o }", [ts_1])
+
+
+@pytest.mark.parametrize("mode", ["decorator", "reification"])
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_latest__sentinel_instead_of_range_filter(mode: str, fast_path: bool):
+    query = "SELECT ?s ?o WHERE { ?s ?p ?o . ?o ?p2 ?x . }"
+
+    timestamped_query, _ = timestamp_query(query, mode=mode, fast_path=fast_path, latest=True)
+
+    assert timestamped_query.count('vers:valid_until "9999-12-31T00:00:00.000+02:00"^^xsd:dateTime') == 2
+    assert "filter(" not in timestamped_query and "bind(" not in timestamped_query
+
+
+def test_latest__no_timestamp_allowed():
+    with pytest.raises(WrongInputFormatException):
+        timestamp_query("SELECT * WHERE { ?s ?p ?o }", ts_1, latest=True)
+
+
+def test_timestamp_query_delta__both_snapshots_as_subqueries():
+    query = "SELECT DISTINCT ?s WHERE { ?s ?p ?o . ?o ?p2 ?x }"
+
+    delta_query, timestamp_1, timestamp_2 = timestamp_query_delta(query, ts_1, ts_2, mode="reification")
+
+    assert delta_query.count("SELECT DISTINCT ?s{") == 2
+    assert delta_query.count(timestamp_1) == 1 and delta_query.count(timestamp_2) == 1
+    assert "_:b1 " in delta_query and "_:b1_2 " in delta_query
+    assert "SELECT ?s (SAMPLE(?delta_change) AS ?change)" in delta_query
+    assert delta_query.endswith("GROUP BY ?s\nHAVING (COUNT(DISTINCT ?delta_change) = 1)")
+
+
+def test_timestamp_query_delta__reserved_variable():
+    with pytest.raises(WrongInputFormatException):
+        timestamp_query_delta("SELECT ?change WHERE { ?s ?p ?change }", ts_1, ts_2)
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("mode", ["decorator", "reification"])
+@pytest.mark.parametrize("semantics, condition", [
+    ("overlaps", r"(\?valid_from_\d+) <= \"{1}\"\^\^xsd:dateTime && \"{0}\"\^\^xsd:dateTime < (\?valid_until_\d+)"),
+    ("during", r"\"{0}\"\^\^xsd:dateTime <= (\?valid_from_\d+) && (\?valid_until_\d+) <= \"{1}\"\^\^xsd:dateTime"),
+])
+def test_timestamp_query_interval__interval_filters(semantics: str, condition: str, mode: str, optimize: bool):
+    query = "SELECT ?s WHERE { ?s ?p ?o . OPTIONAL { ?o <http://ex.org/p>/<http://ex.org/q> ?x } }"
+
+    interval_query, start, end = timestamp_query_interval(query, ts_1, ts_2, mode, semantics, optimize=optimize)
+
+    assert "?tsBGP_" not in interval_query and "bind(" not in interval_query
+    versioned = re.findall(r"vers:valid_from (\?valid_from_\d+)", interval_query)
+    filtered = re.findall(condition.format(re.escape(start), re.escape(end)), interval_query)
+    assert len(versioned) == 3
+    assert [valid_from for valid_from, _ in filtered] == versioned
+    assert [valid_until.replace("until", "from") for _, valid_until in filtered] == versioned
+
+
+@pytest.mark.parametrize("semantics", ["overlaps", "during"])
+def test_timestamp_query_interval__point_interval(semantics: str):
+    query = "SELECT ?s WHERE { ?s ?p ?o }"
+
+    interval_query, start, end = timestamp_query_interval(query, ts_1, ts_1, semantics=semantics)
+
+    assert start == end
+    assert interval_query.count(start) == 2
+
+
+def test_timestamp_query_interval__wrong_input():
+    query = "SELECT ?s WHERE { ?s ?p ?o }"
+
+    with pytest.raises(WrongInputFormatException):
+        timestamp_query_interval(query, ts_2, ts_1)
+    with pytest.raises(WrongInputFormatException):
+        timestamp_query_interval(query, ts_1, ts_2, semantics="contains")
+
+
+@pytest.mark.parametrize("query, projection", [
+    ("SELECT ?a ?b{?a ?p ?b}", ["?a", "?b"]),
+    ("SELECT DISTINCT ?a (COUNT(?b) as ?c){?a ?p ?b}", ["?a", "?c"]),
+    ("SELECT ?x (COALESCE(IF(?y > 1, \"a\", 1/0), \"b\") as ?z){?x ?p ?y}", ["?x", "?z"]),
+])
+def test_projection_variables(query: str, projection: list):
+    assert _projection_variables(query) == projection
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_timestamp_query_many__same_as_timestamp_query(workers: int):
+    queries = []
+    for query_file in ["graph_patterns__bgp.txt", "graph_patterns__left_join.txt", "graph_patterns__union.txt"]:
+        with open(sparql_specs_queries_path + query_file, "r") as file:
+            queries.append(file.read())
+    queries = queries + [queries[0]]
+    timestamps = [ts_1, ts_2, ts_1, ts_2]
+
+    clear_rewrite_cache()
+    results = timestamp_query_many(queries, timestamps, mode="reification", workers=workers)
+
+    assert [result.query for result in results] \
+        == [timestamp_query(query, ts, mode="reification")[0] for query, ts in zip(queries, timestamps)]
+    assert [result.reused for result in results] == [False, False, False, True]
+    assert all(result.rewriting_time >= 0 for result in results)
+
+
+def test_timestamp_query_many__single_timestamp():
+    query = "SELECT ?s WHERE { ?s ?p ?o . }"
+    results = timestamp_query_many([query, query.replace(" ", "  ")], ts_1, workers=1)
+
+    assert results[0].query == results[1].query == timestamp_query(query, ts_1)[0]
+    assert results[1].reused
+    with pytest.raises(WrongInputFormatException):
+        timestamp_query_many([query, query], [ts_1])
+
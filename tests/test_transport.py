@@ -0,0 +1,110 @@
+import pytest
+import asyncio
+import logging
+import urllib.error
+from starvers.transport import HTTPTransport
+from fake_sparql_endpoint import sparql_engine
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_transport__connection_reused(sparql_server):
+    engine = sparql_engine(sparql_server, HTTPTransport(pool_size=1))
+
+    for _ in range(3):
+        df = engine.query("SELECT ?s WHERE { ?s ?p ?o }")
+        assert df["s"].tolist() == ["<http://example.com/s1>"]
+    engine.insert(["<http://example.com/s{0}> <http://example.com/p> <http://example.com/o> .".format(i)
+                   for i in range(5)], chunk_size=1)
+
+    assert len(sparql_server.clients) == 8
+    assert len(set(sparql_server.clients)) == 1
+
+
+def test_transport__retry_unavailable(sparql_server):
+    sparql_server.unavailable = 2
+    engine = sparql_engine(sparql_server, HTTPTransport(retries=2, backoff_factor=0))
+    engine.sparql_get.setQuery("SELECT ?s WHERE { ?s ?p ?o }")
+
+    assert engine.sparql_get.query().convert()["results"]["bindings"][0]["s"]["value"] == "http://example.com/s1"
+    assert len(sparql_server.clients) == 3
+
+
+def test_transport__http_error(sparql_server):
+    sparql_server.update_status = 413
+    engine = sparql_engine(sparql_server, HTTPTransport(retries=0))
+
+    with pytest.raises(urllib.error.HTTPError) as e:
+        engine.insert(["<http://example.com/s> <http://example.com/p> <http://example.com/o> ."])
+    assert e.value.code == 413
+
+
+def test_async_engine__concurrent_queries(sparql_server):
+    from starvers.async_engine import AsyncTripleStoreEngine, AsyncHTTPTransport
+
+    async def run():
+        transport = AsyncHTTPTransport(pool_size=2)
+        endpoint = "http://127.0.0.1:{0}/repositories/test".format(sparql_server.server_address[1])
+        engine = AsyncTripleStoreEngine(endpoint, endpoint + "/statements", transport=transport)
+        results = await asyncio.gather(*[engine.query("SELECT ?s WHERE { ?s ?p ?o }") for _ in range(6)])
+        await engine.insert(["<http://example.com/s{0}> <http://example.com/p> <http://example.com/o> .".format(i)
+                             for i in range(3)], chunk_size=1)
+        await transport.aclose()
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(df["s"].tolist() == ["<http://example.com/s1>"] for df in results)
+    assert len(sparql_server.clients) == 9
+    assert len(set(sparql_server.clients)) <= 2
+
+
+def test_async_engine__http_error(sparql_server):
+    from starvers.async_engine import AsyncTripleStoreEngine, AsyncHTTPTransport
+    sparql_server.update_status = 413
+
+    async def run():
+        transport = AsyncHTTPTransport()
+        endpoint = "http://127.0.0.1:{0}/repositories/test".format(sparql_server.server_address[1])
+        engine = AsyncTripleStoreEngine(endpoint, endpoint + "/statements", transport=transport)
+        try:
+            await engine.insert(["<http://example.com/s> <http://example.com/p> <http://example.com/o> ."])
+        finally:
+            await transport.aclose()
+
+    with pytest.raises(urllib.error.HTTPError) as e:
+        asyncio.run(run())
+    assert e.value.code == 413
+
+
+def test_async_engine__rewrite_in_worker_thread(sparql_server, monkeypatch):
+    import threading
+    from datetime import datetime, timezone
+    import starvers.async_engine as async_engine
+    from starvers.async_engine import AsyncTripleStoreEngine, AsyncHTTPTransport
+    rewrite_threads = []
+
+    def recording(rewrite):
+        def wrapper(*args, **kwargs):
+            rewrite_threads.append(threading.get_ident())
+            return rewrite(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(async_engine, "timestamp_query", recording(async_engine.timestamp_query))
+    monkeypatch.setattr(async_engine, "timestamp_query_interval", recording(async_engine.timestamp_query_interval))
+
+    async def run():
+        transport = AsyncHTTPTransport()
+        endpoint = "http://127.0.0.1:{0}/repositories/test".format(sparql_server.server_address[1])
+        engine = AsyncTripleStoreEngine(endpoint, endpoint + "/statements", transport=transport)
+        await engine.query("SELECT ?s WHERE { ?s ?p ?o }", timestamp=datetime(2023, 1, 1, tzinfo=timezone.utc))
+        await engine.query("SELECT ?s WHERE { ?s ?p ?o }", interval=(datetime(2022, 1, 1, tzinfo=timezone.utc),
+                                                                     datetime(2023, 1, 1, tzinfo=timezone.utc)))
+        await transport.aclose()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert len(rewrite_threads) == 2
+    assert loop_thread not in rewrite_threads